@@ -0,0 +1,173 @@
+"""
+Admission Control
+Concurrency limits with bounded wait queues, per endpoint and per upstream service
+Work over capacity is rejected fast (HTTP 429 / degraded service result) instead of queueing without bound
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Optional
+
+from metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTIONS
+from deadline import stage_timeout
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "5"))  # max wait for an endpoint slot (s)
+UPSTREAM_QUEUE_TIMEOUT = float(os.getenv("UPSTREAM_QUEUE_TIMEOUT", "2"))  # max wait for an upstream slot (s)
+ADMISSION_RETRY_AFTER = int(os.getenv("ADMISSION_RETRY_AFTER", "2"))  # Retry-After header on 429 (s)
+
+
+class OverloadedError(Exception):
+    """Raised when a limiter is at capacity and its wait queue is full (or the wait timed out)"""
+    
+    def __init__(self, scope: str, name: str, retry_after: int = ADMISSION_RETRY_AFTER):
+        super().__init__(f"{name} is over capacity, retry in {retry_after}s")
+        self.scope = scope
+        self.name = name
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """Semaphore with a bounded number of waiters and a wait timeout"""
+    
+    def __init__(self, scope: str, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        """
+        Initialize the limiter
+        
+        Args:
+            scope: "endpoint" or "upstream" (metrics label)
+            name: Endpoint or service name
+            max_concurrency: Requests/calls running at once
+            max_queue: Requests/calls allowed to wait for a slot (0 = reject as soon as all slots are busy)
+            queue_timeout: Seconds a waiter may wait before it is rejected
+        """
+        self.scope = scope
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+    
+    async def acquire(self) -> None:
+        """Take a slot, waiting in the bounded queue if needed (raises OverloadedError)."""
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self._reject("queue full")
+            
+            # Never wait past the request's deadline
+            timeout = max(0.0, stage_timeout(self.queue_timeout))
+            self.waiting += 1
+            self._publish()
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._reject(f"waited {timeout:.1f}s")
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+        
+        self.active += 1
+        self.admitted += 1
+        self._publish()
+    
+    def release(self) -> None:
+        """Give a slot back."""
+        self.active -= 1
+        self._semaphore.release()
+        self._publish()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+    
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        ADMISSION_REJECTIONS.inc(scope=self.scope, name=self.name)
+        self._publish()
+        logger.warning(f"🚦 {self.scope} '{self.name}' over capacity ({reason})")
+        raise OverloadedError(self.scope, self.name)
+    
+    def _publish(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.active, scope=self.scope, name=self.name)
+        ADMISSION_QUEUE_DEPTH.set(self.waiting, scope=self.scope, name=self.name)
+    
+    def stats(self) -> Dict:
+        """Current load and counters."""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected
+        }
+
+
+def _limiter(scope: str, name: str, concurrency: int, queue: int, timeout: float) -> AdmissionLimiter:
+    """Limiter with ADMIT_<NAME>_CONCURRENCY / ADMIT_<NAME>_QUEUE env overrides."""
+    prefix = f"ADMIT_{name.upper()}"
+    return AdmissionLimiter(
+        scope,
+        name,
+        int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        int(os.getenv(f"{prefix}_QUEUE", str(queue))),
+        timeout
+    )
+
+
+# Endpoint limits (streaming endpoints share the limit of their non-streaming counterpart)
+endpoint_limiters = {
+    "text": _limiter("endpoint", "text", 32, 64, ADMISSION_QUEUE_TIMEOUT),     # text + URL
+    "image": _limiter("endpoint", "image", 4, 8, ADMISSION_QUEUE_TIMEOUT),     # OCR executor has 1 thread
+    "voice": _limiter("endpoint", "voice", 4, 8, ADMISSION_QUEUE_TIMEOUT),
+    "batch": _limiter("endpoint", "batch", 2, 2, ADMISSION_QUEUE_TIMEOUT)
+}
+
+# Upstream service limits (sized to the thread pools / API quotas behind them)
+upstream_limiters = {
+    "gemini": _limiter("upstream", "gemini", 16, 32, UPSTREAM_QUEUE_TIMEOUT),
+    "factcheck": _limiter("upstream", "factcheck", 8, 16, UPSTREAM_QUEUE_TIMEOUT),
+    "newsapi": _limiter("upstream", "newsapi", 8, 16, UPSTREAM_QUEUE_TIMEOUT),
+    "twitter": _limiter("upstream", "twitter", 4, 8, UPSTREAM_QUEUE_TIMEOUT),
+    "tavily": _limiter("upstream", "tavily", 4, 8, UPSTREAM_QUEUE_TIMEOUT),     # Twitter fallback / hedge backup
+    "reddit": _limiter("upstream", "reddit", 4, 8, UPSTREAM_QUEUE_TIMEOUT),
+    "ocr": _limiter("upstream", "ocr", 1, 8, UPSTREAM_QUEUE_TIMEOUT),
+    "stt": _limiter("upstream", "stt", 2, 8, UPSTREAM_QUEUE_TIMEOUT),
+    "tts": _limiter("upstream", "tts", 2, 8, UPSTREAM_QUEUE_TIMEOUT),
+    "scrape": _limiter("upstream", "scrape", 4, 16, UPSTREAM_QUEUE_TIMEOUT)
+}
+
+# Input type -> limiters guarding its endpoint and its input-stage upstream
+_INPUT_ENDPOINTS = {"text": "text", "url": "text", "image": "image", "voice": "voice"}
+_INPUT_UPSTREAMS = {"url": "scrape", "image": "ocr", "voice": "stt"}
+
+
+def endpoint_limiter(input_type: str) -> AdmissionLimiter:
+    """Limiter for the endpoint handling an input type."""
+    return endpoint_limiters[_INPUT_ENDPOINTS.get(input_type, "text")]
+
+
+def input_limiter(input_type: str) -> Optional[AdmissionLimiter]:
+    """Limiter for the upstream used to extract text (scraper, OCR, STT), if any."""
+    name = _INPUT_UPSTREAMS.get(input_type)
+    return upstream_limiters[name] if name else None
+
+
+def admission_stats() -> Dict:
+    """Load and counters of every limiter."""
+    return {
+        "endpoints": {name: limiter.stats() for name, limiter in endpoint_limiters.items()},
+        "upstreams": {name: limiter.stats() for name, limiter in upstream_limiters.items()}
+    }
@@ -0,0 +1,169 @@
+"""
+Compact Model Loader
+Maps the flat model file written by backend/model/compact_format.py (news_simple_model.bin) read-only
+Vocabulary, idf and coefficients stay in the page cache, shared by every worker process, instead of an unpickled vectorizer each
+"""
+
+import re
+import json
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+# Must match backend/model/compact_format.py
+MAGIC = b"SACHAIM\0"
+FORMAT_VERSION = 2
+
+
+class CompactFormatError(Exception):
+    """Raised for a file that is not a compact model of a supported version"""
+
+
+class CompactVectorizer:
+    """TfidfVectorizer.transform() over a sorted, memory-mapped vocabulary"""
+    
+    def __init__(self, vocab: np.ndarray, idf: np.ndarray, settings: Dict, ids: Optional[np.ndarray] = None):
+        self.vocab = vocab
+        self.idf = idf
+        self.ids = ids  # original sklearn feature index per term (absent in older exports)
+        self.width = vocab.dtype.itemsize
+        self.lowercase = settings['lowercase']
+        self.sublinear_tf = settings['sublinear_tf']
+        self.use_idf = settings['use_idf']
+        self.binary = settings['binary']
+        self.norm = settings['norm']
+        self.min_n, self.max_n = settings['ngram_range']
+        self.token_pattern = settings['token_pattern']
+        self._token_pattern = re.compile(self.token_pattern)
+        if settings.get('strip_accents'):
+            raise CompactFormatError("strip_accents is not supported")
+    
+    def analyze(self, text: str) -> List[str]:
+        """Word n-grams, built exactly like sklearn's word analyzer."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_pattern.findall(text)
+        if self.max_n == 1:
+            return tokens
+        
+        grams = list(tokens) if self.min_n == 1 else []
+        for n in range(max(self.min_n, 2), self.max_n + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+    
+    def positions(self, grams: List[str]) -> np.ndarray:
+        """Vocabulary index of each n-gram (-1 when it is not in the vocabulary)."""
+        result = np.full(len(grams), -1, dtype=np.intp)
+        encoded = [gram.encode('utf-8') for gram in grams]
+        # Longer terms cannot be in the vocabulary (and would be truncated by the |S cast)
+        fits = np.array([len(gram) <= self.width for gram in encoded], dtype=bool)
+        if not fits.any():
+            return result
+        keys = np.array([gram for gram, ok in zip(encoded, fits) if ok], dtype=self.vocab.dtype)
+        found = np.searchsorted(self.vocab, keys)
+        found[found == len(self.vocab)] = 0
+        result[fits] = np.where(self.vocab[found] == keys, found, -1)
+        return result
+    
+    def term_ids(self, grams: List[str]) -> np.ndarray:
+        """Vocabulary index of every n-gram in the vocabulary (others are dropped)."""
+        positions = self.positions(grams)
+        return positions[positions >= 0]
+    
+    def transform(self, texts: List[str]) -> csr_matrix:
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            ids, counts = np.unique(self.term_ids(self.analyze(text)), return_counts=True)
+            values = counts.astype(np.float64)
+            if self.binary:
+                values[:] = 1.0
+            elif self.sublinear_tf:
+                values = np.log(values) + 1
+            if self.use_idf:
+                values = values * self.idf[ids]
+            if self.norm == 'l2' and len(values):
+                values = values / np.sqrt(np.dot(values, values))
+            elif self.norm == 'l1' and len(values):
+                values = values / np.abs(values).sum()
+            indices.append(ids)
+            data.append(values)
+            indptr.append(indptr[-1] + len(ids))
+        
+        return csr_matrix(
+            (np.concatenate(data) if data else np.empty(0), np.concatenate(indices) if indices else np.empty(0, dtype=np.intp), indptr),
+            shape=(len(texts), len(self.vocab))
+        )
+
+
+class CompactLinearModel:
+    """Binary LogisticRegression.predict_proba() from a memory-mapped coefficient vector"""
+    
+    def __init__(self, coef: np.ndarray, intercept: float, classes: List[int]):
+        self.coef = coef
+        self.intercept = intercept
+        self.classes_ = np.array(classes)
+    
+    def predict_proba(self, X: csr_matrix) -> np.ndarray:
+        scores = X @ self.coef + self.intercept
+        positive = 1.0 / (1.0 + np.exp(-scores))
+        return np.column_stack([1.0 - positive, positive])
+    
+    def predict(self, X: csr_matrix) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+
+
+def load_compact_model(path: Path) -> Dict:
+    """
+    Map a compact model file.
+    
+    Args:
+        path: File written by compact_format.export_compact
+    
+    Returns:
+        Model package shaped like the pickle (vectorizer, model, test_accuracy,
+        model_type, features) with "format": "compact"
+    
+    Raises:
+        CompactFormatError: bad magic or unsupported format version
+    
+    Note:
+        float16 / int8 weight sections are widened to float64 here (a private copy of
+        two small arrays); the vocabulary, the bulk of the file, stays mapped
+    """
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    
+    if bytes(mapped[:8]) != MAGIC:
+        raise CompactFormatError(f"{path} is not a compact model file")
+    version, header_len = struct.unpack('<II', bytes(mapped[8:16]))
+    if not 1 <= version <= FORMAT_VERSION:
+        raise CompactFormatError(f"{path} has format version {version}, expected {FORMAT_VERSION} or older")
+    header = json.loads(bytes(mapped[16:16 + header_len]).decode('utf-8'))
+    
+    def _section(name: str) -> np.ndarray:
+        spec = header['sections'][name]
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape']))
+        return np.frombuffer(mapped, dtype=dtype, count=count, offset=spec['offset']).reshape(spec['shape'])
+    
+    def _weights(name: str) -> np.ndarray:
+        section = _section(name)
+        if section.dtype == np.float64:
+            return section
+        # Same arithmetic as compact_format.dequantize, so the pruned pickle scores identically
+        return section.astype(np.float64) * header.get('scales', {}).get(name, 1.0)
+    
+    return {
+        'vectorizer': CompactVectorizer(
+            _section('vocab'), _weights('idf'), header['vectorizer'],
+            ids=_section('ids') if 'ids' in header['sections'] else None
+        ),
+        'model': CompactLinearModel(_weights('coef'), header['intercept'], header['classes']),
+        'test_accuracy': header.get('test_accuracy'),
+        'model_type': header.get('model_type', 'LogisticRegression'),
+        'features': header.get('features'),
+        'format': 'compact',
+        'format_version': version
+    }
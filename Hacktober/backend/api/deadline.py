@@ -0,0 +1,87 @@
+"""
+Request Deadlines
+One end-to-end time budget per request (or job), carried in a context variable
+Every stage sizes its timeout from what is left and is skipped or degraded when the budget is nearly spent
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Configuration
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "25"))  # default budget per request (s)
+MIN_REQUEST_TIMEOUT = float(os.getenv("MIN_REQUEST_TIMEOUT", "2"))  # client-set budgets are clamped to this range
+MAX_REQUEST_TIMEOUT = float(os.getenv("MAX_REQUEST_TIMEOUT", "120"))
+MIN_STAGE_BUDGET = float(os.getenv("MIN_STAGE_BUDGET", "0.5"))  # a stage with less than this left is skipped
+
+# Time kept back for the stages still to come (s)
+VERIFICATION_RESERVE = 4.0  # while extracting/summarizing: verification + aggregation
+AGGREGATE_RESERVE = 1.5  # while verifying: aggregation + response
+RESPONSE_RESERVE = 0.2  # while aggregating: building the response
+
+# Error reported by a stage skipped for lack of time
+DEADLINE_ERROR = "deadline exceeded"
+
+# Header a client sends to set its own budget (seconds)
+DEADLINE_HEADER = "x-request-timeout"
+
+
+class DeadlineExceededError(Exception):
+    """Raised when a stage the request cannot do without (input extraction) has no time left"""
+    
+    def __init__(self, stage: str):
+        super().__init__(f"Request {DEADLINE_ERROR} before {stage}")
+        self.stage = stage
+
+
+class Deadline:
+    """Absolute point in time by which a request must be answered"""
+    
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+    
+    def remaining(self) -> float:
+        """Seconds left (0 once expired)."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+    
+    def budget(self, cap: float, reserve: float = 0.0) -> float:
+        """A stage's timeout: `cap`, cut to what is left after keeping `reserve` for later stages."""
+        return min(cap, self.remaining() - reserve)
+
+
+# Deadline of the request (or job) being handled - set by the HTTP middleware / job workers
+deadline_var: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def new_deadline(timeout=None) -> Deadline:
+    """Deadline from a client-supplied timeout in seconds (clamped; missing or invalid -> REQUEST_TIMEOUT)."""
+    try:
+        seconds = float(timeout) if timeout else REQUEST_TIMEOUT
+    except ValueError:
+        seconds = REQUEST_TIMEOUT
+    return Deadline(min(max(seconds, MIN_REQUEST_TIMEOUT), MAX_REQUEST_TIMEOUT))
+
+
+def stage_timeout(default: float, reserve: float = 0.0) -> float:
+    """Timeout for a stage of the current request (its default when no deadline is set)."""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return default
+    return deadline.budget(default, reserve)
+
+
+def has_budget(timeout: float) -> bool:
+    """Whether a stage given `timeout` is worth starting at all."""
+    return timeout >= MIN_STAGE_BUDGET
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left for the current request (None when no deadline is set)."""
+    deadline = deadline_var.get()
+    return deadline.remaining() if deadline is not None else None
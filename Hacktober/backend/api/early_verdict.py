@@ -0,0 +1,168 @@
+"""
+Early Verdicts
+Rules checked as verifier results arrive: once the evidence agrees strongly enough, the remaining
+verifiers are cancelled and Gemini aggregation is skipped in favour of a locally templated verdict
+"""
+
+import os
+import re
+import logging
+from typing import Dict, Optional, Tuple
+
+from gemini_service import collect_references
+from metrics import EARLY_VERDICTS
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EARLY_VERDICT_ENABLED = os.getenv("EARLY_VERDICT_ENABLED", "true").lower() == "true"
+# Fact Check rule: an authoritative rating, with the ML model on the same side at least this sure (%)
+EARLY_FACTCHECK_MODEL_CONFIDENCE = float(os.getenv("EARLY_FACTCHECK_MODEL_CONFIDENCE", "70"))
+# Model rule: the ML model at least this sure (%) that a claim is real, corroborated by News API
+EARLY_MODEL_CONFIDENCE = float(os.getenv("EARLY_MODEL_CONFIDENCE", "97"))
+EARLY_NEWSAPI_CONFIDENCE = float(os.getenv("EARLY_NEWSAPI_CONFIDENCE", "0.8"))  # 0-1
+EARLY_NEWSAPI_MIN_ARTICLES = int(os.getenv("EARLY_NEWSAPI_MIN_ARTICLES", "3"))
+
+# Error reported by the verifiers cancelled after an early verdict
+EARLY_SKIPPED = "skipped (early verdict)"
+
+# Fact Check textual ratings (lowercase whole words/phrases); mixed ratings never end a request early
+FALSE_RATINGS = ("fake", "pants on fire", "incorrect", "inaccurate", "untrue", "not true", "not accurate",
+                 "not correct", "fabricated", "hoax", "misleading", "scam", "pinocchios")
+FALSE_PREFIXES = ("fals",)  # false, falsely, falsified, falso...
+TRUE_RATINGS = ("true", "correct", "accurate", "confirmed")
+MIXED_RATINGS = ("half", "partly", "partially", "mixed", "mixture", "unproven", "not proven", "unverified",
+                 "not confirmed", "missing context", "needs context")
+NEGATIONS = ("not", "no", "isn't", "isnt", "never")  # directly before a TRUE_RATINGS word: false
+
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+
+
+def _model_side(model_result: Dict) -> Tuple[Optional[str], float]:
+    """("Fake" | "Real", confidence %) of the ML model, or (None, 0) when it has no prediction."""
+    confidence = model_result.get('confidence')
+    if model_result.get('error') or not confidence:
+        return None, 0.0
+    fake, real = confidence.get('fake', 0), confidence.get('real', 0)
+    return ("Fake", fake) if fake > real else ("Real", real)
+
+
+def rating_side(rating: str) -> Optional[str]:
+    """
+    "Fake" | "Real" for a Fact Check textual rating (None when mixed or unrecognised).
+    
+    Matches whole words, so "Inaccurate" is not read as "accurate", and a negated true word
+    ("Not accurate", "Isn't correct") counts as false.
+    """
+    words = _WORD.findall((rating or "").lower())
+    text = f" {' '.join(words)} "
+    if not words or any(f" {phrase} " in text for phrase in MIXED_RATINGS):
+        return None
+    if any(f" {phrase} " in text for phrase in FALSE_RATINGS) or any(word.startswith(FALSE_PREFIXES) for word in words):
+        return "Fake"
+    for previous, word in zip([None] + words, words):
+        if word in TRUE_RATINGS:
+            return "Fake" if previous in NEGATIONS else "Real"
+    return None
+
+
+def _factcheck_side(factcheck_result: Dict) -> Optional[str]:
+    """Side every rated Fact Check source agrees on (None when there is none, or they disagree)."""
+    sides = {rating_side(source.get('rating', '')) for source in factcheck_result.get('results', [])}
+    sides.discard(None)
+    return sides.pop() if len(sides) == 1 else None
+
+
+def _factcheck_rule(results: Dict[str, Dict]) -> Optional[Tuple[str, str, list]]:
+    factcheck = results.get('factcheck')
+    if not factcheck or 'model' not in results:
+        return None
+    side = _factcheck_side(factcheck)
+    model_side, model_confidence = _model_side(results['model'])
+    if side is None or side != model_side or model_confidence < EARLY_FACTCHECK_MODEL_CONFIDENCE:
+        return None
+    
+    rated = [source for source in factcheck.get('results', []) if rating_side(source.get('rating', ''))]
+    publishers = ", ".join(sorted({source.get('publisher', 'Unknown') for source in rated}))
+    rating = rated[0].get('rating', '')
+    description = (
+        f"Independent fact-checkers ({publishers}) rated this claim \"{rating}\", and the ML model "
+        f"also classifies it as {side.lower()} with {model_confidence:.0f}% confidence."
+    )
+    key_factors = [
+        f"Google Fact Check: rated \"{rating}\" by {publishers}",
+        f"ML Model: {results['model'].get('prediction', 'N/A')} ({model_confidence:.0f}%)",
+        "Remaining sources skipped - evidence already conclusive"
+    ]
+    return side, description, key_factors
+
+
+def _model_newsapi_rule(results: Dict[str, Dict]) -> Optional[Tuple[str, str, list]]:
+    """
+    Real side only: News API label 0 is no evidence of "fake" - articles that are merely
+    off-topic vote 0 too - so fake claims always wait for fact-checks and aggregation.
+    """
+    newsapi = results.get('newsapi')
+    if not newsapi or 'model' not in results or newsapi.get('error'):
+        return None
+    model_side, model_confidence = _model_side(results['model'])
+    articles = len(newsapi.get('relevant_links', []))
+    if (
+        model_side != "Real"
+        or model_confidence < EARLY_MODEL_CONFIDENCE
+        or newsapi.get('label') != 1
+        or newsapi.get('confidence', 0) < EARLY_NEWSAPI_CONFIDENCE
+        or articles < EARLY_NEWSAPI_MIN_ARTICLES
+    ):
+        return None
+    
+    description = (
+        f"The ML model classifies this claim as real with {model_confidence:.0f}% confidence, "
+        f"and {newsapi.get('confidence', 0):.0%} of the {articles} matching news articles confirm it."
+    )
+    key_factors = [
+        f"ML Model: {results['model'].get('prediction', 'N/A')} ({model_confidence:.0f}%)",
+        f"News API: {articles} articles, {newsapi.get('confidence', 0):.0%} agreement",
+        "Remaining sources skipped - evidence already conclusive"
+    ]
+    return model_side, description, key_factors
+
+
+# Rule name -> rule, in priority order (the name labels the early verdict counter)
+RULES = {
+    "factcheck_model": _factcheck_rule,
+    "model_newsapi": _model_newsapi_rule
+}
+
+
+def check_early_verdict(results: Dict[str, Dict]) -> Optional[Dict]:
+    """
+    Verdict from the verifier results received so far, if a rule finds them conclusive.
+    
+    Args:
+        results: Service name -> result for the verifiers that have finished
+    
+    Returns:
+        Verdict dict (same shape as aggregate_verdict, with "early_verdict" set to the
+        rule name), or None to keep waiting for the other verifiers
+    """
+    if not EARLY_VERDICT_ENABLED:
+        return None
+    
+    for name, rule in RULES.items():
+        outcome = rule(results)
+        if outcome is None:
+            continue
+        
+        verdict, description, key_factors = outcome
+        EARLY_VERDICTS.inc(rule=name)
+        logger.info(f"⚡ Early verdict ({name}): {verdict} - skipping remaining verifiers and Gemini aggregation")
+        return {
+            "verdict": verdict,
+            "confidence": results['model'].get('confidence', {"fake": 50, "real": 50}),
+            "description": description,
+            "key_factors": key_factors,
+            "references": collect_references(results),
+            "early_verdict": name
+        }
+    return None
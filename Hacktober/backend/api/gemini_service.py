@@ -6,31 +6,53 @@ Uses Google GenAI SDK with gemini-2.5-flash model
 
 import os
 import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 from dotenv import load_dotenv
-from google import genai
+
+from admission import upstream_limiters
+from modules import hedged, run_blocking
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")  # e.g. a local stub server (loadtest.py)
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+# Secondary model raced against a slow primary call (empty disables hedging)
+GEMINI_HEDGE_MODEL = os.getenv("GEMINI_HEDGE_MODEL", "gemini-2.0-flash-lite")
+GEMINI_HEDGE_DELAY = 2.0  # until the primary's own p90 is known
+
+# Gemini calls block a thread each; room for every "gemini" upstream slot (primary and backup take one each)
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="gemini")
+
+logger = logging.getLogger(__name__)
+
+# Gemini client (the SDK is imported and the client built on first use, then reused)
+_gemini_client = None
+
 
-# Initialize Gemini client
 def get_gemini_client():
     """Get Gemini client instance."""
+    global _gemini_client
     if not GEMINI_API_KEY:
         return None
-    os.environ["GOOGLE_API_KEY"] = GEMINI_API_KEY
-    return genai.Client(api_key=GEMINI_API_KEY)
+    if _gemini_client is None:
+        from google import genai
+        os.environ["GOOGLE_API_KEY"] = GEMINI_API_KEY
+        http_options = {"base_url": GEMINI_BASE_URL} if GEMINI_BASE_URL else None
+        _gemini_client = genai.Client(api_key=GEMINI_API_KEY, http_options=http_options)
+    return _gemini_client
 
 
-async def summarize_news(text: str, timeout: int = 3) -> Dict:
+async def summarize_news(text: str, timeout: float = 3) -> Dict:
     """
     Summarize news text into 3-5 lines using Gemini.
     
     Args:
         text: Original news text
         timeout: Request timeout in seconds
-        
+    
     Returns:
         Dict with 'summary' and 'success' keys
     """
@@ -49,38 +71,25 @@ News Article:
 {text}
 
 Summary:"""
-    
+
     try:
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        
-        def _generate():
-            response = client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=prompt
-            )
-            return response.text
-        
-        # Wait for response with timeout
-        summary = await asyncio.wait_for(
-            loop.run_in_executor(None, _generate),
-            timeout=timeout
-        )
+        # Wait for response with timeout (over capacity falls back like any other error)
+        summary = await _generate_hedged("gemini_summarize", client, prompt, timeout)
         
         return {
             "success": True,
             "summary": summary.strip()
         }
-                    
+    
     except asyncio.TimeoutError:
-        print(f"⚠️ Gemini summarization timeout after {timeout}s")
+        logger.warning(f"⚠️ Gemini summarization timeout after {timeout}s")
         return {
             "success": False,
             "summary": text[:500],
             "error": "Timeout"
         }
     except Exception as e:
-        print(f"⚠️ Gemini summarization error: {e}")
+        logger.warning(f"⚠️ Gemini summarization error: {e}")
         return {
             "success": False,
             "summary": text[:500],
@@ -93,7 +102,7 @@ async def aggregate_verdict(
     gemini_summary: str,
     model_result: Dict,
     verification_results: Dict,
-    timeout: int = 3
+    timeout: float = 3
 ) -> Dict:
     """
     Aggregate all verification results into final verdict using Gemini.
@@ -104,7 +113,7 @@ async def aggregate_verdict(
         model_result: ML model prediction
         verification_results: Dict with results from all APIs
         timeout: Request timeout in seconds
-        
+    
     Returns:
         Dict with final verdict, confidence, description, and references
     """
@@ -147,7 +156,7 @@ VERIFICATION RESULTS:
    - Sources checked: {verification_results.get('webscrape', {}).get('count', 0)}
    - Results: {_format_results(verification_results.get('webscrape', {}))}
 """
-    
+
     prompt = f"""You are a fact-checking expert analyzing news authenticity.
 
 ORIGINAL CLAIM:
@@ -172,27 +181,14 @@ IMPORTANT:
 - Be objective and cite which sources support the verdict
 
 Return ONLY the JSON, no other text."""
-    
+
     try:
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        
-        def _generate():
-            client = get_gemini_client()
-            if not client:
-                raise Exception("Gemini client not available")
-            
-            response = client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=prompt
-            )
-            return response.text
+        client = get_gemini_client()
+        if not client:
+            raise Exception("Gemini client not available")
         
-        # Wait for response with timeout
-        response_text = await asyncio.wait_for(
-            loop.run_in_executor(None, _generate),
-            timeout=timeout
-        )
+        # Wait for response with timeout (over capacity falls back like any other error)
+        response_text = await _generate_hedged("gemini_aggregate", client, prompt, timeout)
         
         # Extract JSON from response
         import json
@@ -204,31 +200,72 @@ Return ONLY the JSON, no other text."""
             verdict_data = json.loads(json_match.group())
             
             # Add references from all sources
-            references = _collect_references(verification_results)
+            references = collect_references(verification_results)
             verdict_data['references'] = references
             
             return verdict_data
         else:
             raise ValueError("No JSON found in Gemini response")
-                    
+    
     except Exception as e:
-        print(f"⚠️ Gemini verdict aggregation error: {e}")
-        # Fallback to model-based decision
-        model_conf = model_result.get('confidence', {"fake": 50, "real": 50})
-        is_fake = model_conf.get('fake', 50) > model_conf.get('real', 50)
-        
-        return {
-            "verdict": "Fake" if is_fake else "Real",
-            "confidence": model_conf,
-            "description": f"Analysis based primarily on ML model prediction. {model_result.get('prediction', '')}",
-            "key_factors": [
-                f"ML Model: {model_result.get('prediction', 'N/A')}",
-                f"Model confidence: {max(model_conf.values())}%",
-                "Other verification sources had issues"
-            ],
-            "references": _collect_references(verification_results),
-            "fallback": True
-        }
+        logger.warning(f"⚠️ Gemini verdict aggregation error: {e}")
+        return fallback_verdict(model_result, verification_results)
+
+
+async def _generate_hedged(name: str, client, prompt: str, timeout: float) -> str:
+    """
+    Generate text with GEMINI_MODEL, racing GEMINI_HEDGE_MODEL against it once the call
+    is slower than its recent p90 (or right away when it fails); the first non-empty answer wins.
+    
+    Each call holds its own "gemini" upstream slot until its thread returns - a losing call
+    cannot be stopped mid-request, so it keeps counting against the limit until it finishes.
+    
+    Raises:
+        asyncio.TimeoutError: no answer within the timeout
+        OverloadedError: no upstream slot free
+    """
+    def _call(model: str):
+        def _generate():
+            response = client.models.generate_content(model=model, contents=prompt)
+            return response.text
+        # Run in thread pool to avoid blocking
+        return lambda: run_blocking(_executor, _generate, slot=upstream_limiters["gemini"])
+    
+    if not GEMINI_HEDGE_MODEL:
+        return await asyncio.wait_for(_call(GEMINI_MODEL)(), timeout=timeout)
+    return await hedged(
+        name, _call(GEMINI_MODEL), _call(GEMINI_HEDGE_MODEL), timeout,
+        default_delay=GEMINI_HEDGE_DELAY
+    )
+
+
+def fallback_verdict(model_result: Dict, verification_results: Dict, reason: str = "Other verification sources had issues") -> Dict:
+    """
+    Model-based verdict used when Gemini aggregation fails or is skipped.
+    
+    Args:
+        model_result: ML model prediction
+        verification_results: Dict with results from all APIs (for references)
+        reason: Key factor explaining why Gemini was not used
+    
+    Returns:
+        Verdict dict (same shape as aggregate_verdict) with "fallback": True, so it is never cached
+    """
+    model_conf = model_result.get('confidence', {"fake": 50, "real": 50})
+    is_fake = model_conf.get('fake', 50) > model_conf.get('real', 50)
+    
+    return {
+        "verdict": "Fake" if is_fake else "Real",
+        "confidence": model_conf,
+        "description": f"Analysis based primarily on ML model prediction. {model_result.get('prediction', '')}",
+        "key_factors": [
+            f"ML Model: {model_result.get('prediction', 'N/A')}",
+            f"Model confidence: {max(model_conf.values())}%",
+            reason
+        ],
+        "references": collect_references(verification_results),
+        "fallback": True
+    }
 
 
 def _format_results(result: Dict) -> str:
@@ -240,7 +277,7 @@ def _format_results(result: Dict) -> str:
     return f"{count} result(s) found"
 
 
-def _collect_references(verification_results: Dict) -> List[Dict]:
+def collect_references(verification_results: Dict) -> List[Dict]:
     """Collect all reference links from verification results."""
     references = []
     
@@ -0,0 +1,73 @@
+"""
+Gunicorn Configuration
+Production server: one master preloads the app (ML model + service singletons), then forks workers
+Workers share the preloaded memory copy-on-write and run uvicorn (uvloop + httptools) event loops
+"""
+
+import os
+import gc
+import multiprocessing
+
+# Run from the API directory so "main:app" and its sibling modules import
+chdir = os.path.dirname(os.path.abspath(__file__))
+
+# Server socket
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
+backlog = int(os.getenv("BACKLOG", "2048"))
+
+# Workers - uvicorn's worker picks uvloop/httptools when installed (uvicorn[standard])
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+# Load main.py (and the model it pulls in - the compact file is mapped, so pages stay shared) once in the master, before forking
+preload_app = True
+
+# Recycle workers after N requests (jitter so they don't all restart together)
+max_requests = int(os.getenv("MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "200"))
+
+# Silent workers are killed after `timeout`; on restart/shutdown in-flight requests get `graceful_timeout`
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+
+# Application logs are JSON lines from structured_logging; gunicorn's own go to stderr
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = None
+
+
+def when_ready(server):
+    """
+    Master: load the model and every service client before the first fork so workers share them.
+    Whatever fails to load here is logged and left for the workers to load on demand.
+    """
+    import model_wrapper
+    import modules
+    try:
+        model_wrapper.load_model()
+    except Exception as e:
+        server.log.warning(f"Could not preload model: {e}")
+    modules.preload()
+
+
+def pre_fork(server, worker):
+    """
+    Move everything allocated so far (model, singletons) out of the GC's reach before forking.
+    
+    Without this, the first collection in each worker writes to the GC headers of every
+    preloaded object and the copy-on-write pages get copied anyway.
+    """
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Per-worker setup: the log writer thread does not survive fork."""
+    from structured_logging import setup_logging
+    setup_logging()
+    server.log.info(f"Worker spawned (pid: {worker.pid})")
+
+
+def worker_exit(server, worker):
+    """Flush queued log records before the worker goes away."""
+    from structured_logging import shutdown_logging
+    shutdown_logging()
@@ -0,0 +1,137 @@
+"""
+Suspicious Text Highlighter
+Builds highlightedQuery from the ML model's own evidence: each n-gram's tf-idf weight x coefficient, summed per token,
+marks the words pushing the text towards "fake"; a compiled phrase matcher stands in while no model is loaded
+"""
+
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from sparse_scorer import SparseScorer
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+HIGHLIGHT_MAX_SPANS = int(os.getenv("HIGHLIGHT_MAX_SPANS", "5"))
+# A token is highlighted when its pull towards "fake" is at least this share of the strongest token's
+HIGHLIGHT_MIN_SHARE = float(os.getenv("HIGHLIGHT_MIN_SHARE", "0.25"))
+
+# Model label for fake news (model_wrapper: 0 = fake, 1 = real)
+FAKE_LABEL = 0
+
+# Fallback: clickbait phrases (case-insensitive, any word ending - "shocking" also matches "shockingly")
+SUSPICIOUS_PHRASES = (
+    "shocking", "breaking", "miracle", "secret", "doctors hate", "you won't believe", "click here",
+    "amazing", "unbelievable", "exclusive", "leaked", "banned", "hidden truth",
+    "they don't want you to know", "mainstream media", "share before", "wake up"
+)
+
+
+def _phrase_pattern(phrases) -> re.Pattern:
+    """One alternation over all phrases, longest first, flexible about whitespace and apostrophes."""
+    alternatives = []
+    for phrase in sorted(phrases, key=len, reverse=True):
+        words = [re.escape(word).replace("'", "['’]") for word in phrase.split()]
+        alternatives.append(r"\s+".join(words))
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\w*", re.IGNORECASE)
+
+
+_PHRASE_PATTERN = _phrase_pattern(SUSPICIOUS_PHRASES)
+
+
+def _phrase_spans(text: str) -> List[Tuple[int, int, float]]:
+    """(start, end, weight) of every suspicious phrase, in one regex pass."""
+    return [(match.start(), match.end(), 1.0) for match in _PHRASE_PATTERN.finditer(text)]
+
+
+def _model_spans(text: str, scorer: SparseScorer) -> List[Tuple[int, int, float]]:
+    """(start, end, weight) of the runs of tokens the model weighs most towards "fake"."""
+    tokens = scorer.tokens(text)
+    attributions = scorer.attributions(text)
+    if not tokens or not attributions:
+        return []
+    
+    starts = np.array([start for _, start, _ in tokens])
+    ends = np.array([end for _, _, end in tokens])
+    gram_start = np.array([start for start, _, _ in attributions])
+    gram_end = np.array([end for _, end, _ in attributions])
+    contribution = np.array([value for _, _, value in attributions])
+    
+    # Spread each n-gram's contribution evenly over the tokens it spans
+    first = np.searchsorted(starts, gram_start)
+    last = np.searchsorted(starts, gram_end - 1, side="right") - 1
+    width = last - first + 1
+    share = contribution / width
+    token_scores = np.zeros(len(tokens))
+    for offset in range(int(width.max())):
+        covered = width > offset
+        np.add.at(token_scores, first[covered] + offset, share[covered])
+    
+    # Contributions push towards classes[1]; flip so that positive means "towards fake"
+    if scorer.classes[1] == FAKE_LABEL:
+        fake_scores = token_scores
+    else:
+        fake_scores = -token_scores
+    strongest = fake_scores.max()
+    if strongest <= 0:
+        return []
+    flagged = fake_scores >= strongest * HIGHLIGHT_MIN_SHARE
+    
+    # Merge adjacent flagged tokens into spans, keep the heaviest
+    spans = []
+    for index in np.flatnonzero(flagged):
+        if spans and spans[-1][3] == index - 1:
+            start, _, weight, _ = spans[-1]
+            spans[-1] = (start, int(ends[index]), weight + float(fake_scores[index]), index)
+        else:
+            spans.append((int(starts[index]), int(ends[index]), float(fake_scores[index]), index))
+    spans = sorted(spans, key=lambda span: span[2], reverse=True)[:HIGHLIGHT_MAX_SPANS]
+    return sorted((start, end, weight) for start, end, weight, _ in spans)
+
+
+def _segments(text: str, spans: List[Tuple[int, int, float]]) -> List[Dict]:
+    """Cover the whole text with plain and suspicious segments (character offsets into `text`)."""
+    segments = []
+    cursor = 0
+    for start, end, weight in spans:
+        if start < cursor:  # overlapping phrase matches
+            continue
+        if start > cursor:
+            segments.append({"text": text[cursor:start], "isSuspicious": False, "start": cursor, "end": start})
+        segments.append({
+            "text": text[start:end], "isSuspicious": True, "start": start, "end": end, "weight": round(weight, 4)
+        })
+        cursor = end
+    if cursor < len(text):
+        segments.append({"text": text[cursor:], "isSuspicious": False, "start": cursor, "end": len(text)})
+    return segments
+
+
+def highlight_suspicious_text(text: str, scorer: Optional[SparseScorer] = None) -> List[Dict]:
+    """
+    Highlight suspicious phrases in text.
+    
+    Args:
+        text: Text shown to the user (the summary)
+        scorer: Sparse scorer of the loaded model; None uses the phrase matcher
+    
+    Returns:
+        Segments covering the text in order: {"text", "isSuspicious", "start", "end"},
+        plus "weight" (pull towards fake) on suspicious segments
+    """
+    if not text:
+        return []
+    
+    spans = None
+    if scorer is not None and scorer.index is not None:
+        try:
+            spans = _model_spans(text, scorer)
+        except Exception as e:
+            logger.warning(f"⚠️ Model attribution failed, using phrase matcher: {e}")
+    if spans is None:
+        spans = _phrase_spans(text)
+    return _segments(text, spans)
@@ -4,16 +4,19 @@ Handles all input types: text, URL, image, voice
 Converts everything to text for verification pipeline
 """
 
+import re
 import asyncio
-from typing import Dict, Tuple
-from modules import (
-    process_image_to_text,
-    scrape_url_to_text,
-    transcribe_voice
-)
+import logging
+import unicodedata
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+import modules  # scraper/OCR/STT submodules load on first use
+from structured_logging import STAGE
 
+logger = logging.getLogger(__name__)
 
-async def process_input(input_data: Dict) -> Tuple[str, Dict]:
+
+async def process_input(input_data: Dict, timeout: Optional[float] = None) -> Tuple[str, Dict]:
     """
     Process input and convert to text.
     
@@ -21,6 +24,7 @@ async def process_input(input_data: Dict) -> Tuple[str, Dict]:
         input_data: Dict with:
             - type: "text" | "url" | "image" | "voice"
             - data: The actual input (text string, URL, image bytes, audio bytes)
+        timeout: Max time in seconds for URL scraping / OCR / speech-to-text (default: their own)
             
     Returns:
         Tuple of (text_content, metadata)
@@ -28,20 +32,74 @@ async def process_input(input_data: Dict) -> Tuple[str, Dict]:
     input_type = input_data.get("type", "text")
     data = input_data.get("data", "")
     
-    print(f"📥 Processing input type: {input_type}")
+    logger.info(f"📥 Processing input type: {input_type}", extra=STAGE)
     
     if input_type == "text":
         return await _process_text(data)
     elif input_type == "url":
-        return await _process_url(data)
+        return await _process_url(data, timeout or 8)
     elif input_type == "image":
-        return await _process_image(data)
+        return await _process_image(data, timeout or 10)
     elif input_type == "voice":
-        return await _process_voice(data)
+        return await _process_voice(data, timeout or 10)
     else:
         raise ValueError(f"Unknown input type: {input_type}")
 
 
+_URL_PATTERN = re.compile(r'http\S+')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so trivially different copies of a claim compare equal.
+    
+    Same rules as clean_text in model/predict.py (lowercase, strip URLs,
+    collapse whitespace), plus Unicode NFKC normalization and case folding.
+    
+    Args:
+        text: Raw or extracted text
+        
+    Returns:
+        Normalized text (used for deduplication keys, never sent to services)
+    """
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    text = _URL_PATTERN.sub('', text)
+    return _WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+# Query parameters that only track where a link was shared from
+_TRACKING_PARAMS = {'fbclid', 'gclid', 'igshid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'si'}
+
+
+def canonical_url(url: str) -> str:
+    """
+    Canonical form of a URL so share links to the same article compare equal.
+    
+    Lowercases scheme and host, drops default ports, fragments, tracking
+    parameters (utm_*, fbclid, ...) and trailing slashes, and sorts the query.
+    
+    Args:
+        url: URL as submitted
+        
+    Returns:
+        Canonical URL string
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and not ((scheme == 'http' and parts.port == 80) or (scheme == 'https' and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+
 async def _process_text(text: str) -> Tuple[str, Dict]:
     """Process direct text input."""
     if not text or not text.strip():
@@ -54,7 +112,7 @@ async def _process_text(text: str) -> Tuple[str, Dict]:
     }
 
 
-async def _process_url(url: str) -> Tuple[str, Dict]:
+async def _process_url(url: str, timeout: float = 8) -> Tuple[str, Dict]:
     """Process URL input - scrape and extract text."""
     import time
     start_time = time.time()
@@ -62,11 +120,11 @@ async def _process_url(url: str) -> Tuple[str, Dict]:
     if not url or not url.startswith(('http://', 'https://')):
         raise ValueError("Invalid URL provided")
     
-    print(f"🌐 Scraping URL: {url}")
+    logger.info(f"🌐 Scraping URL: {url}", extra=STAGE)
     
     try:
         # Use the URL scraper module
-        result = await scrape_url_to_text(url, timeout=8)
+        result = await modules.scrape_url_to_text(url, timeout=timeout)
         
         if result.get('success') and result.get('text'):
             text = result['text']
@@ -85,11 +143,11 @@ async def _process_url(url: str) -> Tuple[str, Dict]:
             raise Exception(f"URL scraping failed: {error}")
             
     except Exception as e:
-        print(f"❌ URL processing error: {e}")
+        logger.error(f"❌ URL processing error: {e}")
         raise ValueError(f"Could not extract text from URL: {str(e)}")
 
 
-async def _process_image(image_data) -> Tuple[str, Dict]:
+async def _process_image(image_data, timeout: float = 10) -> Tuple[str, Dict]:
     """Process image input - OCR to extract text."""
     import time
     start_time = time.time()
@@ -97,11 +155,11 @@ async def _process_image(image_data) -> Tuple[str, Dict]:
     if not image_data:
         raise ValueError("No image data provided")
     
-    print(f"🖼️ Processing image with OCR...")
+    logger.info("🖼️ Processing image with OCR...", extra=STAGE)
     
     try:
         # Use the OCR module
-        text = await process_image_to_text(image_data)
+        text = await asyncio.wait_for(modules.process_image_to_text(image_data), timeout=timeout)
         
         if not text or len(text.strip()) < 10:
             raise Exception("Could not extract sufficient text from image")
@@ -116,12 +174,15 @@ async def _process_image(image_data) -> Tuple[str, Dict]:
             "word_count": len(text.split())
         }
         
+    except asyncio.TimeoutError:
+        logger.error(f"❌ Image processing timeout after {timeout}s")
+        raise ValueError(f"Could not extract text from image: OCR timed out after {timeout}s")
     except Exception as e:
-        print(f"❌ Image processing error: {e}")
+        logger.error(f"❌ Image processing error: {e}")
         raise ValueError(f"Could not extract text from image: {str(e)}")
 
 
-async def _process_voice(audio_data) -> Tuple[str, Dict]:
+async def _process_voice(audio_data, timeout: float = 10) -> Tuple[str, Dict]:
     """Process voice input - Speech-to-Text."""
     import time
     start_time = time.time()
@@ -129,11 +190,11 @@ async def _process_voice(audio_data) -> Tuple[str, Dict]:
     if not audio_data:
         raise ValueError("No audio data provided")
     
-    print(f"🎤 Processing voice with STT...")
+    logger.info("🎤 Processing voice with STT...", extra=STAGE)
     
     try:
         # Use the voice module for transcription
-        result = await transcribe_voice(audio_data)
+        result = await modules.transcribe_voice(audio_data, timeout=timeout)
         
         if result.get('success') and result.get('text'):
             text = result['text']
@@ -152,7 +213,7 @@ async def _process_voice(audio_data) -> Tuple[str, Dict]:
             raise Exception(f"Voice transcription failed: {error}")
             
     except Exception as e:
-        print(f"❌ Voice processing error: {e}")
+        logger.error(f"❌ Voice processing error: {e}")
         raise ValueError(f"Could not transcribe audio: {str(e)}")
 
 
@@ -0,0 +1,419 @@
+"""
+Job Queue
+Asynchronous detection jobs backed by a local SQLite queue
+An in-process worker pool runs queued jobs, records partial results and calls webhooks on completion
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import logging
+import ipaddress
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+from structured_logging import request_id_var
+from deadline import deadline_var, new_deadline
+
+# Configuration
+# Relative to this directory (not the launch directory), so every worker uses the same file
+JOB_DB_PATH = Path(__file__).parent / (os.getenv("JOB_DB_PATH") or "jobs.db")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(24 * 3600)))
+JOB_CALLBACK_TIMEOUT = int(os.getenv("JOB_CALLBACK_TIMEOUT", "10"))
+# Comma-separated webhook hosts; when set only these are called, otherwise any host resolving to public addresses
+JOB_CALLBACK_ALLOWLIST = {host.strip().lower() for host in os.getenv("JOB_CALLBACK_ALLOWLIST", "").split(",") if host.strip()}
+JOB_TIMEOUT = os.getenv("JOB_TIMEOUT", "60")  # time budget per job (s), like a request's X-Request-Timeout
+JOB_POLL_INTERVAL = 1.0  # seconds between queue checks when idle
+# A running job belongs to the process holding its lease; the owner renews it every third of this,
+# and any worker process requeues jobs whose lease expired (their process died)
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))
+
+logger = logging.getLogger(__name__)
+
+# Handler signature: (input_type, data) -> async iterator of (event, payload)
+JobHandler = Callable[[str, Any], AsyncIterator[Tuple[str, Dict]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    input_type TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    callback_url TEXT,
+    partial TEXT,
+    result TEXT,
+    error TEXT,
+    callback_status TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at);
+"""
+
+# Columns added after the first release (ALTERed into existing databases)
+_LEASE_COLUMNS = {"owner": "TEXT", "lease_until": "REAL"}
+
+
+class CallbackURLError(ValueError):
+    """Raised for a webhook URL the server refuses to call"""
+
+
+async def validate_callback_url(url: str) -> None:
+    """
+    Reject webhook URLs that could reach internal services (SSRF).
+    
+    Args:
+        url: Client-supplied callback_url
+    
+    Raises:
+        CallbackURLError: not http(s), host not in JOB_CALLBACK_ALLOWLIST, or (without an allowlist)
+                          a host resolving to a private, loopback, link-local or otherwise non-public address
+    """
+    try:
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    except ValueError:
+        raise CallbackURLError("callback_url is not a valid URL")
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise CallbackURLError("callback_url must be an http(s) URL")
+    
+    host = parsed.hostname.lower()
+    if JOB_CALLBACK_ALLOWLIST:
+        if host not in JOB_CALLBACK_ALLOWLIST:
+            raise CallbackURLError(f"callback host {host} is not in JOB_CALLBACK_ALLOWLIST")
+        return
+    
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except socket.gaierror:
+        raise CallbackURLError(f"callback host {host} does not resolve")
+    for *_, sockaddr in infos:
+        address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if address.version == 6 and address.ipv4_mapped:
+            address = address.ipv4_mapped
+        if not address.is_global:
+            raise CallbackURLError(f"callback host {host} resolves to a non-public address")
+
+
+class JobQueue:
+    """SQLite-backed job queue with an asyncio worker pool"""
+    
+    def __init__(self, db_path: Path = JOB_DB_PATH, workers: int = JOB_WORKERS):
+        """
+        Initialize the job queue
+        
+        Args:
+            db_path: SQLite database file (created if missing)
+            workers: Number of concurrent worker tasks
+        """
+        self.db_path = Path(db_path)
+        self.workers = workers
+        
+        # All SQLite access goes through one thread so the event loop never blocks on disk
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._handler: Optional[JobHandler] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.owner: Optional[str] = None  # "<host>:<pid>", set in start() (after gunicorn forks)
+    
+    # ---- SQLite (runs in the queue's executor thread) ----
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database once and create the schema."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, column_type in _LEASE_COLUMNS.items():
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+        return self._conn
+    
+    def _recover_sync(self) -> int:
+        """
+        Requeue running jobs whose lease expired (their process died) and purge expired ones.
+        Jobs still leased by a live worker - including sibling gunicorn workers - are left alone.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (now - JOB_RETENTION_SECONDS,)
+        )
+        return conn.execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, lease_until = NULL "
+            "WHERE status = 'running' AND (lease_until IS NULL OR lease_until < ?)",
+            (now,)
+        ).rowcount
+    
+    def _renew_sync(self) -> None:
+        """Extend the leases of this process's running jobs."""
+        self._connect().execute(
+            "UPDATE jobs SET lease_until = ? WHERE status = 'running' AND owner = ?",
+            (time.time() + JOB_LEASE_SECONDS, self.owner)
+        )
+    
+    def _release_sync(self) -> int:
+        """Requeue this process's running jobs right away (clean shutdown)."""
+        return self._connect().execute(
+            "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, lease_until = NULL "
+            "WHERE status = 'running' AND owner = ?",
+            (self.owner,)
+        ).rowcount
+    
+    def _insert_sync(self, job_id: str, input_type: str, payload: bytes, callback_url: Optional[str]) -> None:
+        self._connect().execute(
+            "INSERT INTO jobs (id, status, input_type, payload, callback_url, created_at) VALUES (?, 'queued', ?, ?, ?, ?)",
+            (job_id, input_type, payload, callback_url, time.time())
+        )
+    
+    def _claim_sync(self) -> Optional[sqlite3.Row]:
+        """Atomically move the oldest queued job to running."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if row is not None:
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, owner = ?, lease_until = ? WHERE id = ?",
+                    (now, self.owner, now + JOB_LEASE_SECONDS, row["id"])
+                )
+            conn.execute("COMMIT")
+            return row
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _update_sync(self, job_id: str, **fields) -> None:
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._connect().execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+    
+    def _get_sync(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        
+        position = None
+        if row["status"] == "queued":
+            position = self._connect().execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND created_at < ?", (row["created_at"],)
+            ).fetchone()[0]
+        
+        return {
+            "job_id": row["id"],
+            "status": row["status"],
+            "input_type": row["input_type"],
+            "queue_position": position,
+            "partial": json.loads(row["partial"]) if row["partial"] else {},
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "callback_url": row["callback_url"],
+            "callback_status": row["callback_status"],
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"]
+        }
+    
+    def _depth_sync(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+    
+    async def _db(self, fn, *args, **kwargs):
+        """Run a SQLite operation on the queue's executor thread."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, lambda: fn(*args, **kwargs))
+    
+    # ---- Public API ----
+    
+    async def submit(self, input_type: str, data, callback_url: Optional[str] = None) -> str:
+        """
+        Queue a detection job
+        
+        Args:
+            input_type: "text" | "url" | "image" | "voice"
+            data: Text/URL string or image/audio bytes
+            callback_url: Optional webhook POSTed with the job status when it finishes
+        
+        Returns:
+            Job id
+        
+        Raises:
+            CallbackURLError: callback_url the server refuses to call
+        """
+        if callback_url:
+            await validate_callback_url(callback_url)
+        job_id = uuid.uuid4().hex
+        payload = data if isinstance(data, (bytes, bytearray)) else str(data).encode('utf-8')
+        await self._db(self._insert_sync, job_id, input_type, bytes(payload), callback_url)
+        
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+    
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Job status, partial results and final result (None if unknown)."""
+        return await self._db(self._get_sync, job_id)
+    
+    async def depth(self) -> Dict[str, int]:
+        """Number of jobs per status."""
+        return await self._db(self._depth_sync)
+    
+    async def start(self, handler: JobHandler) -> None:
+        """
+        Start the worker pool
+        
+        Args:
+            handler: Async generator function (input_type, data) yielding (event, payload).
+                     A "verdict" event is the result, "tts" is merged into it, "error" fails the job,
+                     every other event is stored as a partial result.
+        """
+        if self._worker_tasks:
+            return
+        
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        
+        await self._recover()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index)) for index in range(self.workers)
+        ]
+        self._worker_tasks.append(asyncio.create_task(self._heartbeat()))
+        logger.info(f"✅ Job queue started ({self.workers} workers, {self.db_path.name})")
+    
+    async def stop(self) -> None:
+        """Stop the workers and requeue the jobs they were running."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        released = await self._db(self._release_sync)
+        if released:
+            logger.info(f"♻️ Requeued {released} job(s) interrupted by shutdown")
+    
+    async def _recover(self) -> None:
+        recovered = await self._db(self._recover_sync)
+        if recovered:
+            logger.info(f"♻️ Requeued {recovered} job(s) with an expired lease")
+    
+    async def _heartbeat(self) -> None:
+        """Renew this process's leases and reclaim jobs of processes that died."""
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            try:
+                await self._db(self._renew_sync)
+                await self._recover()
+            except Exception as e:
+                logger.warning(f"⚠️ Job lease heartbeat failed: {e}")
+    
+    # ---- Workers ----
+    
+    async def _worker(self, index: int) -> None:
+        """Claim and run jobs until cancelled."""
+        while True:
+            try:
+                row = await self._db(self._claim_sync)
+            except Exception as e:
+                logger.warning(f"⚠️ Job queue error: {e}")
+                row = None
+            
+            if row is None:
+                # Idle - wait for a submit (or poll, for jobs added by other processes)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self._run_job(row)
+    
+    async def _run_job(self, row: sqlite3.Row) -> None:
+        """Run one job through the handler, recording progress as it goes."""
+        job_id = row["id"]
+        input_type = row["input_type"]
+        data = row["payload"] if input_type in ("image", "voice") else row["payload"].decode('utf-8')
+        
+        # Log lines from the pipeline carry the job id as their request id
+        request_id_var.set(job_id)
+        deadline_var.set(new_deadline(JOB_TIMEOUT))
+        logger.info(f"🛠️ Job {job_id} started ({input_type})")
+        partial: Dict[str, Any] = {}
+        result: Optional[Dict] = None
+        error: Optional[str] = None
+        
+        try:
+            async for event, payload in self._handler(input_type, data):
+                if event == "verdict":
+                    result = payload
+                    await self._db(self._update_sync, job_id, result=json.dumps(result, default=str))
+                elif event == "tts" and result is not None:
+                    result = {**result, "tts_audio": payload.get("tts_audio")}
+                    result["metadata"] = {**result.get("metadata", {}), "tts_generated": payload.get("tts_generated", False)}
+                    await self._db(self._update_sync, job_id, result=json.dumps(result, default=str))
+                elif event == "error":
+                    error = payload.get("detail", "Unknown error")
+                else:
+                    partial[event] = payload
+                    await self._db(self._update_sync, job_id, partial=json.dumps(partial, default=str))
+            
+            if result is None and error is None:
+                error = "Pipeline finished without a verdict"
+        except Exception as e:
+            error = str(e)
+        
+        status = "failed" if error else "done"
+        await self._db(self._update_sync, job_id, status=status, error=error, finished_at=time.time())
+        logger.info(f"{'❌' if error else '✅'} Job {job_id} {status}")
+        
+        if row["callback_url"]:
+            callback_status = await self._send_callback(row["callback_url"], {
+                "job_id": job_id,
+                "status": status,
+                "result": result,
+                "error": error
+            })
+            await self._db(self._update_sync, job_id, callback_status=callback_status)
+    
+    async def _send_callback(self, url: str, body: Dict) -> str:
+        """POST the finished job to its webhook, returning a short status string."""
+        try:
+            # Checked again at send time: the host may resolve differently than at submit
+            await validate_callback_url(url)
+        except CallbackURLError as e:
+            logger.warning(f"⚠️ Job callback refused ({url}): {e}")
+            return f"refused: {e}"
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(
+                    url,
+                    data=json.dumps(body, default=str),
+                    headers={"Content-Type": "application/json"},
+                    timeout=aiohttp.ClientTimeout(total=JOB_CALLBACK_TIMEOUT)
+                ) as response:
+                    return f"HTTP {response.status}"
+        except Exception as e:
+            logger.warning(f"⚠️ Job callback failed ({url}): {e}")
+            return f"error: {e}"
+
+
+# Singleton instance
+job_queue = JobQueue()
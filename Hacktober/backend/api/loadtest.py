@@ -0,0 +1,247 @@
+"""
+Offline Load Test
+Drives the API at a target request rate with every external API replaced by a local stub (stub_upstreams.py)
+Reports p50/p95/p99 latency and throughput per endpoint, and can fail when p95 regresses against a saved baseline
+Usage: python loadtest.py --rps 20 --duration 30 [--mix text=6,stream=2,batch=1,voice=1] [--output run.json] [--baseline old.json]
+       python loadtest.py --url http://localhost:8000 ...  (a server started with the env printed by stub_upstreams.py)
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from stub_upstreams import load_profiles, start_stubs, stop_stubs, stub_env
+
+CLAIMS = [
+    "Scientists discover new planet in solar system orbiting beyond Neptune",
+    "Government announces free electricity for all households starting next month",
+    "Drinking hot water every hour cures viral infections, doctors confirm",
+    "Central bank raises interest rates by 50 basis points to curb inflation",
+    "Leaked video shows celebrity endorsing miracle weight loss pill"
+]
+
+# Scenario -> (method, path); the request body is built per request by _request_kwargs
+SCENARIOS = {
+    "text": ("POST", "/api/detect/text"),
+    "stream": ("POST", "/api/detect/text/stream"),
+    "batch": ("POST", "/api/detect/batch"),
+    "voice": ("POST", "/api/detect/voice")
+}
+
+DEFAULT_MIX = "text=6,stream=2,batch=1,voice=1"
+
+
+def _claim(rng: random.Random, index: int, repeat_ratio: float) -> str:
+    """A claim text - unique per request unless it is picked as a repeat (verdict cache / coalescing path)."""
+    claim = rng.choice(CLAIMS)
+    if rng.random() < repeat_ratio:
+        return claim
+    return f"{claim} (load test request {index})"
+
+
+def _request_kwargs(scenario: str, rng: random.Random, index: int, repeat_ratio: float, batch_size: int) -> Dict:
+    """httpx request arguments for one scenario request."""
+    if scenario in ("text", "stream"):
+        return {"json": {"text": _claim(rng, index, repeat_ratio), "type": "text"}}
+    if scenario == "batch":
+        items = [{"text": _claim(rng, index * batch_size + i, repeat_ratio), "type": "text"} for i in range(batch_size)]
+        return {"json": {"items": items}}
+    if scenario == "voice":
+        return {"files": {"file": ("loadtest.mp3", os.urandom(4096), "audio/mpeg")}}
+    raise ValueError(f"Unknown scenario '{scenario}'")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """'text=6,voice=1' -> {"text": 6.0, "voice": 1.0}"""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (expected one of {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+async def _fire(client: httpx.AsyncClient, scenario: str, kwargs: Dict, results: List[Tuple]) -> None:
+    """Send one request and record (scenario, status, latency, finished_at); the body is read to the end."""
+    method, path = SCENARIOS[scenario]
+    start = time.perf_counter()
+    try:
+        async with client.stream(method, path, **kwargs) as response:
+            async for _ in response.aiter_raw():
+                pass
+            status = response.status_code
+    except Exception:
+        status = 0  # connection error / client timeout
+    finished = time.perf_counter()
+    results.append((scenario, status, finished - start, finished))
+
+
+async def drive(client: httpx.AsyncClient, weights: Dict[str, float], rps: float, duration: float,
+                repeat_ratio: float = 0.0, batch_size: int = 5, seed: Optional[int] = None) -> Tuple[List[Tuple], float, float]:
+    """
+    Open-loop load: start a request every 1/rps seconds for `duration`, regardless of how many are still running.
+    
+    Returns:
+        Tuple of (results, start time, end time) - results are (scenario, status, latency, finished_at)
+    """
+    rng = random.Random(seed)
+    names = list(weights)
+    results: List[Tuple] = []
+    tasks = []
+    
+    start = time.perf_counter()
+    index = 0
+    while index / rps < duration:
+        delay = start + index / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        scenario = rng.choices(names, [weights[name] for name in names])[0]
+        kwargs = _request_kwargs(scenario, rng, index, repeat_ratio, batch_size)
+        tasks.append(asyncio.create_task(_fire(client, scenario, kwargs, results)))
+        index += 1
+    
+    await asyncio.gather(*tasks)
+    return results, start, time.perf_counter()
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (0 for an empty list)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(results: List[Tuple], start: float, end: float) -> Dict[str, Dict]:
+    """Per-scenario (and "all") request counts, status breakdown, latency percentiles (ms) and throughput."""
+    elapsed = max(end - start, 1e-9)
+    groups: Dict[str, List[Tuple]] = {}
+    for result in results:
+        groups.setdefault(result[0], []).append(result)
+    groups["all"] = results
+    
+    report = {}
+    for scenario, rows in groups.items():
+        latencies = sorted(latency for _, status, latency, _ in rows if 200 <= status < 300)
+        report[scenario] = {
+            "requests": len(rows),
+            "ok": len(latencies),
+            "rejected": sum(1 for _, status, _, _ in rows if status == 429),
+            "errors": sum(1 for _, status, _, _ in rows if status != 429 and not 200 <= status < 300),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "throughput_rps": round(len(latencies) / elapsed, 2)
+        }
+    return report
+
+
+def print_report(report: Dict[str, Dict], upstreams: Optional[Dict[str, Dict]] = None) -> None:
+    print(f"\n{'endpoint':<10} {'requests':>8} {'ok':>6} {'429':>6} {'errors':>6} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ok/s':>7}")
+    for scenario, row in report.items():
+        print(f"{scenario:<10} {row['requests']:>8} {row['ok']:>6} {row['rejected']:>6} {row['errors']:>6} "
+              f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['throughput_rps']:>7}")
+    
+    if upstreams:
+        print(f"\n{'upstream':<10} {'requests':>8} {'500s':>6} {'429s':>6}")
+        for name, stats in upstreams.items():
+            print(f"{name:<10} {stats['requests']:>8} {stats['errors']:>6} {stats['rate_limited']:>6}")
+
+
+def regressions(report: Dict[str, Dict], baseline: Dict[str, Dict], max_regression: float) -> List[str]:
+    """Endpoints whose p95 grew by more than max_regression (fraction) over the baseline run."""
+    failures = []
+    for scenario, row in report.items():
+        before = baseline.get(scenario, {}).get("p95_ms")
+        if before and row["p95_ms"] > before * (1 + max_regression):
+            failures.append(f"{scenario}: p95 {before} ms -> {row['p95_ms']} ms")
+    return failures
+
+
+async def run(args) -> Dict:
+    """Start the stubs and the app in this process (or target --url), drive the load and return the report."""
+    weights = parse_mix(args.mix)
+    stubs = {}
+    app = None
+    
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        stubs = await start_stubs(load_profiles(args.profile), seed=args.seed)
+        # Services read their base URLs and keys at import - set them before importing main
+        os.environ.update(stub_env(stubs))
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        os.environ.setdefault("JOB_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="sachai-loadtest-"), "jobs.db"))
+        if args.no_cache:
+            os.environ["VERDICT_CACHE_TTL"] = "0"
+        
+        from main import app
+        await app.router.startup()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest", timeout=args.timeout)
+    
+    print(f"🚀 {args.rps} req/s for {args.duration}s, mix {weights}" + (f" against {args.url}" if args.url else " (in-process)"))
+    try:
+        async with client:
+            results, start, end = await drive(
+                client, weights, args.rps, args.duration,
+                repeat_ratio=args.repeat_ratio, batch_size=args.batch_size, seed=args.seed
+            )
+    finally:
+        if app is not None:
+            await app.router.shutdown()
+        upstream_stats = {name: stub.stats() for name, stub in stubs.items()}
+        await stop_stubs(stubs)
+    
+    report = summarize(results, start, end)
+    print_report(report, upstream_stats)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API against local stub upstreams")
+    parser.add_argument("--rps", type=float, default=10, help="Requests started per second")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to keep starting requests")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="Share of requests reusing a fixed claim (cache/coalescing)")
+    parser.add_argument("--batch-size", type=int, default=5, help="Items per batch request")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the verdict cache (in-process only)")
+    parser.add_argument("--profile", help="JSON file with per-upstream latency/error overrides (see stub_upstreams.py)")
+    parser.add_argument("--url", help="Target a running server instead of the in-process app")
+    parser.add_argument("--timeout", type=float, default=60, help="Client timeout per request (s)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for the request mix and stub behaviour")
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--baseline", help="Report JSON from an earlier run to compare p95 against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed p95 growth over the baseline (fraction)")
+    args = parser.parse_args()
+    
+    report = asyncio.run(run(args))
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = regressions(report, json.load(f), args.max_regression)
+        if failures:
+            print("\n❌ p95 regressions:")
+            for failure in failures:
+                print(f"   {failure}")
+            sys.exit(1)
+        print("\n✅ No p95 regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,25 +5,110 @@ Handles all input types, runs parallel verification, returns verdict
 """
 
 import os
+import hmac
+import json
 import time
 import asyncio
-from fastapi import FastAPI, HTTPException, File, UploadFile, Form
+import logging
+from fastapi import FastAPI, HTTPException, File, UploadFile, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
+from starlette.routing import Match
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List, AsyncIterator, Tuple
 import uvicorn
 from dotenv import load_dotenv
 
 # Load environment variables FIRST before importing modules
 load_dotenv()
 
+# Logging goes through a queue to a background writer (configured before services log at import)
+from structured_logging import setup_logging, shutdown_logging, request_id_var, new_request_id, STAGE
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # Import our services
 from input_processor import process_input
-from gemini_service import summarize_news, aggregate_verdict
-from verification_pipeline import run_parallel_verification
-from model_wrapper import load_model
-from modules import generate_voice, create_whatsapp_share_from_result
+from gemini_service import summarize_news, aggregate_verdict, fallback_verdict
+from verification_pipeline import (
+    run_parallel_verification,
+    verification_stages,
+    build_verification_results,
+    VERIFICATION_SERVICES
+)
+from pipeline_graph import PipelineGraph, Stage
+from early_verdict import check_early_verdict, EARLY_SKIPPED
+from meta_aggregator import (
+    aggregator_var,
+    current_aggregator,
+    resolve_aggregator,
+    meta_verdict,
+    log_aggregation,
+    AGGREGATOR_HEADER
+)
+from verdict_cache import verdict_cache
+from request_coalescer import request_coalescer, coalesce_key
+from job_queue import job_queue, CallbackURLError
+from admission import (
+    OverloadedError,
+    endpoint_limiter,
+    endpoint_limiters,
+    input_limiter,
+    upstream_limiters,
+    admission_stats
+)
+from metrics import (
+    registry as metrics_registry,
+    REQUEST_LATENCY,
+    REQUESTS_IN_FLIGHT,
+    STAGE_LATENCY,
+    SERVICE_FAILURES,
+    CACHE_EVENTS,
+    CACHE_HIT_RATIO,
+    CACHE_SIZE,
+    COALESCED_REQUESTS,
+    HEDGED_CALLS,
+    HEDGE_DELAY,
+    EXECUTOR_QUEUE_DEPTH,
+    JOB_QUEUE_DEPTH,
+    record_service_result,
+    executor_queue_depth
+)
+from deadline import (
+    Deadline,
+    DeadlineExceededError,
+    deadline_var,
+    new_deadline,
+    stage_timeout,
+    has_budget,
+    DEADLINE_HEADER,
+    DEADLINE_ERROR,
+    VERIFICATION_RESERVE,
+    RESPONSE_RESERVE
+)
+import model_wrapper
+import modules
+from model_wrapper import load_model, predict_batch, get_scorer, reload_model, model_info
+import model_registry
+from model_registry import RegistryError, MODEL_WATCH_INTERVAL
+from highlighter import highlight_suspicious_text
+
+# Import service modules (and build their clients) in the background after startup
+WARM_MODULES = os.getenv("WARM_MODULES", "true").lower() == "true"
+
+# Default stage timeouts (s) - each is cut to the request's remaining budget (see deadline.py)
+INPUT_TIMEOUTS = {"url": 8, "image": 10, "voice": 10}
+SUMMARIZE_TIMEOUT = 3
+AGGREGATE_TIMEOUT = 3
+TTS_TIMEOUT = 10
+
+# Model hot reload: POST /admin/model/reload needs this token in X-Admin-Token (empty disables the endpoint)
+MODEL_ADMIN_TOKEN = os.getenv("MODEL_ADMIN_TOKEN", "")
+_model_watcher: Optional[asyncio.Task] = None
+
+# Batch detection limits
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
 
 # Initialize FastAPI
 app = FastAPI(
@@ -51,21 +136,144 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+@app.middleware("http")
+async def assign_request_id(request: Request, call_next):
+    """Tag every log line of a request with its id (client X-Request-ID or a new one)."""
+    request_id = request.headers.get("x-request-id") or new_request_id()
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+    finally:
+        request_id_var.reset(token)
+
+
+@app.middleware("http")
+async def assign_deadline(request: Request, call_next):
+    """Start the request's time budget (client X-Request-Timeout in seconds, or REQUEST_TIMEOUT)."""
+    token = deadline_var.set(new_deadline(request.headers.get(DEADLINE_HEADER)))
+    try:
+        return await call_next(request)
+    finally:
+        deadline_var.reset(token)
+
+
+@app.middleware("http")
+async def assign_aggregator(request: Request, call_next):
+    """Pick the verdict aggregation backend (client X-Aggregator: gemini | meta, or AGGREGATOR)."""
+    try:
+        aggregator = resolve_aggregator(request.headers.get(AGGREGATOR_HEADER))
+    except ValueError as e:
+        return JSONResponse(status_code=400, content={"detail": str(e)})
+    token = aggregator_var.set(aggregator)
+    try:
+        return await call_next(request)
+    finally:
+        aggregator_var.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """Record per-endpoint latency and in-flight request counts (ASGI-level, so streamed bodies are included)."""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        endpoint = _endpoint_label(scope)
+        start = time.perf_counter()
+        status = 500
+        
+        async def _send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        # The app returns once the last body chunk is sent - SSE / NDJSON responses are timed to the end
+        with REQUESTS_IN_FLIGHT.track_inprogress(endpoint=endpoint):
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                REQUEST_LATENCY.observe(time.perf_counter() - start, endpoint=endpoint, status=status)
+
+
+app.add_middleware(RequestMetricsMiddleware)
+
+
+def _endpoint_label(scope: Dict) -> str:
+    """Route template (e.g. /api/jobs/{job_id}) so label cardinality stays bounded."""
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+@app.exception_handler(OverloadedError)
+async def overloaded_handler(request: Request, exc: OverloadedError):
+    """Over capacity: fail fast so clients back off instead of piling up."""
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+@app.exception_handler(DeadlineExceededError)
+async def deadline_handler(request: Request, exc: DeadlineExceededError):
+    """No time left for a stage the verdict cannot do without."""
+    return JSONResponse(status_code=504, content={"detail": str(exc)})
+
+
 # Preload model at startup
 @app.on_event("startup")
 async def startup_event():
     """Load ML model at startup for faster predictions."""
-    print("🚀 Starting Fake News Detection API...")
-    print("=" * 60)
+    # (Re)start the log writer thread in this process - a no-op unless we were forked
+    setup_logging()
+    logger.info("🚀 Starting Fake News Detection API...")
     try:
         load_model()
-        print("✅ ML Model loaded successfully")
+        logger.info("✅ ML Model loaded successfully")
     except Exception as e:
-        print(f"⚠️ Warning: Could not preload model: {e}")
-    print("=" * 60)
-    print("🎯 API ready at http://localhost:8000")
-    print("📚 Docs at http://localhost:8000/docs")
-    print("=" * 60)
+        logger.warning(f"⚠️ Could not preload model: {e}")
+    await job_queue.start(handler=_detection_events)
+    global _model_watcher
+    if model_registry.registry_dir() is not None and MODEL_WATCH_INTERVAL > 0:
+        _model_watcher = asyncio.create_task(_watch_model_registry())
+    if WARM_MODULES:
+        # Off the event loop; requests that arrive first load what they need on demand
+        asyncio.get_running_loop().run_in_executor(None, modules.preload)
+    logger.info("🎯 API ready at http://localhost:8000 (docs at /docs)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background job workers and the model watcher, and flush logs."""
+    if _model_watcher is not None:
+        _model_watcher.cancel()
+    await job_queue.stop()
+    shutdown_logging()
+
+
+async def _watch_model_registry():
+    """Hot-reload the model whenever the registry's CURRENT pointer names another version."""
+    loop = asyncio.get_running_loop()
+    failed = None  # a version that failed to load is not retried until CURRENT changes again
+    while True:
+        await asyncio.sleep(MODEL_WATCH_INTERVAL)
+        version = model_registry.current_version()
+        if version is None or version in (model_info().get('version'), failed):
+            continue
+        try:
+            # Off the event loop: requests keep being served by the old model while the new one loads
+            await loop.run_in_executor(None, reload_model, version)
+            failed = None
+        except Exception:
+            failed = version  # logged by reload_model
 
 
 # Request Models
@@ -75,6 +283,25 @@ class TextDetectionRequest(BaseModel):
     type: str = "text"  # "text", "url"
 
 
+class JobRequest(BaseModel):
+    """Request model for asynchronous text/URL jobs."""
+    text: str
+    type: str = "text"  # "text", "url"
+    callback_url: Optional[str] = None  # Webhook POSTed when the job finishes
+
+
+class BatchDetectionRequest(BaseModel):
+    """Request model for batch detection."""
+    items: List[TextDetectionRequest]
+    stream: bool = False  # Stream results as NDJSON in completion order
+    max_concurrency: Optional[int] = None  # External API calls in flight for the whole batch
+
+
+class ModelReloadRequest(BaseModel):
+    """Request model for model hot reload."""
+    version: Optional[str] = None  # Registry version to serve (and promote to CURRENT); default: reload CURRENT
+
+
 # API Endpoints
 
 @app.get("/")
@@ -88,7 +315,16 @@ async def root():
             "detect_text": "POST /api/detect/text",
             "detect_image": "POST /api/detect/image",
             "detect_voice": "POST /api/detect/voice",
-            "health": "GET /health"
+            "detect_text_stream": "POST /api/detect/text/stream",
+            "detect_image_stream": "POST /api/detect/image/stream",
+            "detect_voice_stream": "POST /api/detect/voice/stream",
+            "detect_batch": "POST /api/detect/batch",
+            "submit_job": "POST /api/jobs",
+            "submit_file_job": "POST /api/jobs/file",
+            "job_status": "GET /api/jobs/{job_id}",
+            "health": "GET /health",
+            "metrics": "GET /metrics",
+            "model_reload": "POST /admin/model/reload"
         }
     }
 
@@ -98,11 +334,89 @@ async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
-        "model_loaded": True,
+        "model_loaded": bool(model_info()),
+        "model": model_info(),
+        "cache": verdict_cache.stats(),
+        "coalescing": request_coalescer.stats(),
+        "admission": admission_stats(),
+        "hedging": modules.hedge_stats(),
         "timestamp": time.time()
     }
 
 
+@app.post("/admin/model/reload")
+async def admin_model_reload(request: ModelReloadRequest, http_request: Request):
+    """
+    Load a model version in the background and switch to it once it passes a smoke prediction.
+    With a version, it is also promoted to the registry's CURRENT so the other workers follow.
+    """
+    if not MODEL_ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Model admin endpoint disabled (set MODEL_ADMIN_TOKEN)")
+    if not hmac.compare_digest(http_request.headers.get("x-admin-token", ""), MODEL_ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    try:
+        info = await asyncio.get_running_loop().run_in_executor(None, reload_model, request.version)
+    except RegistryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Smoke prediction failed: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+    
+    promoted = False
+    if request.version and model_registry.registry_dir() is not None:
+        model_registry.promote(request.version, model_registry.registry_dir())
+        promoted = True
+    return {"success": True, "model": info, "promoted": promoted}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics in the text exposition format."""
+    await _collect_runtime_metrics()
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
+async def _collect_runtime_metrics():
+    """Refresh metrics mirrored from state held elsewhere (cache, coalescer, executors, job queue)."""
+    cache_stats = verdict_cache.stats()
+    for result in ("hits", "misses", "stale"):
+        CACHE_EVENTS.set_total(cache_stats[result], result=result)
+    CACHE_HIT_RATIO.set(cache_stats["hit_ratio"])
+    CACHE_SIZE.set(cache_stats["entries"], unit="entries")
+    CACHE_SIZE.set(cache_stats["bytes"], unit="bytes")
+    
+    coalescer_stats = request_coalescer.stats()
+    COALESCED_REQUESTS.set_total(coalescer_stats["executions"], role="leader")
+    COALESCED_REQUESTS.set_total(coalescer_stats["coalesced"], role="follower")
+    
+    for call, stats in modules.hedge_stats().items():
+        for outcome in ("calls", "hedged", "fallbacks", "backup_wins", "abandoned"):
+            HEDGED_CALLS.set_total(stats[outcome], call=call, outcome=outcome)
+        HEDGE_DELAY.set(stats["delay"], call=call)
+    
+    # Only service clients built so far (and configured with API keys) have an executor
+    executors = {
+        "model": model_wrapper._executor,
+        "job_queue": job_queue.executor,
+        "default": getattr(asyncio.get_running_loop(), '_default_executor', None)
+    }
+    for name, service in modules.loaded_singletons().items():
+        executors[name] = getattr(service, 'executor', None)
+    for name, executor in executors.items():
+        if executor is not None:
+            EXECUTOR_QUEUE_DEPTH.set(executor_queue_depth(executor), executor=name)
+    
+    try:
+        job_depth = await job_queue.depth()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not read job queue depth: {e}")
+        job_depth = {}
+    for status in ("queued", "running", "done", "failed"):
+        JOB_QUEUE_DEPTH.set(job_depth.get(status, 0), status=status)
+
+
 @app.post("/api/detect/text")
 async def detect_text(request: TextDetectionRequest):
     """
@@ -114,96 +428,50 @@ async def detect_text(request: TextDetectionRequest):
     3. Parallel verification (model + 6 APIs)
     4. Gemini verdict aggregation
     5. Return result with confidence and references
+    
+    Steps 2-4 are skipped when the verdict cache already holds this claim.
     """
     start_time = time.time()
     
+    # Over capacity -> 429 with Retry-After (before any work is done)
+    limiter = endpoint_limiter(request.type)
+    await limiter.acquire()
+    
     try:
-        print(f"\n{'='*60}")
-        print(f"📥 NEW REQUEST: {request.type.upper()}")
-        print(f"{'='*60}")
+        logger.info(f"📥 NEW REQUEST: {request.type.upper()}", extra={"input_type": request.type})
         
-        # STEP 1: Convert input to text (1-3s)
-        print("\n[STEP 1/5] Processing input...")
-        input_data = {
-            "type": request.type,
-            "data": request.text
-        }
-        text, input_metadata = await process_input(input_data)
-        print(f"✅ Text extracted ({len(text)} chars) in {input_metadata.get('processing_time', 0)}s")
-        
-        # STEP 2: Gemini summarization (2-3s)
-        print("\n[STEP 2/5] Summarizing with Gemini...")
-        summary_result = await summarize_news(text, timeout=3)
-        gemini_summary = summary_result.get('summary', text[:500])
-        print(f"✅ Summary created ({len(gemini_summary)} chars)")
-        
-        # STEP 3: Parallel verification (5-8s)
-        print("\n[STEP 3/5] Running parallel verification...")
-        verification_results = await run_parallel_verification(text, gemini_summary)
-        model_result = verification_results.get('model', {})
-        print(f"✅ Verification complete in {verification_results.get('execution_time', 0)}s")
-        print(f"   Successful services: {verification_results.get('services_successful', 0)}/6")
-        
-        # STEP 4: Gemini verdict aggregation (2-3s)
-        print("\n[STEP 4/5] Aggregating verdict with Gemini...")
-        final_verdict = await aggregate_verdict(
-            original_text=text,
-            gemini_summary=gemini_summary,
-            model_result=model_result,
-            verification_results=verification_results,
-            timeout=3
-        )
-        print(f"✅ Final verdict: {final_verdict.get('verdict', 'Unknown')}")
+        # STEPS 1-4: Input to text, summarize, verify, aggregate
+        # (shared with identical in-flight requests, or answered by the verdict cache)
+        input_metadata, pipeline, cache_status, coalesced = await _detect(request.type, request.text)
         
         # STEP 5: Prepare response (< 1s)
-        print("\n[STEP 5/5] Preparing response...")
-        
-        # Generate WhatsApp share message with Gemini summary
-        whatsapp_share = create_whatsapp_share_from_result({
-            "text": gemini_summary,  # Use Gemini summary (3-5 lines) for sharing
-            "prediction": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', '')
-        })
+        logger.info("[STEP 5/5] Preparing response...", extra=STAGE)
         
         total_time = time.time() - start_time
         
-        response = {
-            "success": True,
-            "verdict": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', ''),
-            "key_factors": final_verdict.get('key_factors', []),
-            "references": final_verdict.get('references', []),
-            "query": gemini_summary,
-            "isFake": final_verdict.get('verdict', '') == "Fake",
-            "highlightedQuery": _highlight_suspicious_text(gemini_summary),
-            "whatsapp_share": whatsapp_share,
-            "metadata": {
-                "input_type": request.type,
-                "processing_time": round(total_time, 2),
-                "services_checked": verification_results.get('services_checked', 6),
-                "services_successful": verification_results.get('services_successful', 0),
-                "model_prediction": model_result.get('prediction', 'N/A'),
-                "model_confidence": model_result.get('confidence', {}),
-                "requires_tts": input_metadata.get('requires_tts', False)
-            }
-        }
+        response = _build_response(
+            input_type=request.type,
+            input_metadata=input_metadata,
+            total_time=total_time,
+            cache_status=cache_status,
+            **pipeline
+        )
+        response["metadata"]["coalesced"] = coalesced
         
-        print(f"\n✅ REQUEST COMPLETE in {total_time:.2f}s")
-        print(f"   Target: 15-25s | Actual: {total_time:.2f}s")
-        print(f"{'='*60}\n")
+        logger.info(f"✅ REQUEST COMPLETE in {total_time:.2f}s (target 15-25s)", extra={"total_time": round(total_time, 3)})
         
         return response
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except ValueError as e:
-        print(f"❌ Validation error: {e}")
+        logger.warning(f"❌ Validation error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Unexpected error: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+    finally:
+        limiter.release()
 
 
 @app.post("/api/detect/image")
@@ -215,76 +483,41 @@ async def detect_image(file: UploadFile = File(...)):
     """
     start_time = time.time()
     
+    limiter = endpoint_limiters["image"]
+    await limiter.acquire()
+    
     try:
-        print(f"\n{'='*60}")
-        print(f"📥 NEW REQUEST: IMAGE")
-        print(f"   Filename: {file.filename}")
-        print(f"{'='*60}")
+        logger.info("📥 NEW REQUEST: IMAGE", extra={"input_type": "image", "filename": file.filename})
         
         # Read image bytes
         image_data = await file.read()
         
-        # STEP 1: OCR to text
-        print("\n[STEP 1/5] Extracting text from image...")
-        input_data = {
-            "type": "image",
-            "data": image_data
-        }
-        text, input_metadata = await process_input(input_data)
-        print(f"✅ Text extracted ({len(text)} chars) in {input_metadata.get('processing_time', 0)}s")
-        
-        # Continue with normal flow
-        print("\n[STEP 2/5] Summarizing with Gemini...")
-        summary_result = await summarize_news(text, timeout=3)
-        gemini_summary = summary_result.get('summary', text[:500])
-        
-        print("\n[STEP 3/5] Running parallel verification...")
-        verification_results = await run_parallel_verification(text, gemini_summary)
-        model_result = verification_results.get('model', {})
-        
-        print("\n[STEP 4/5] Aggregating verdict with Gemini...")
-        final_verdict = await aggregate_verdict(text, gemini_summary, model_result, verification_results, timeout=3)
-        
-        print("\n[STEP 5/5] Preparing response...")
-        # Generate WhatsApp share message with Gemini summary (for image input)
-        whatsapp_share = create_whatsapp_share_from_result({
-            "text": gemini_summary,  # Use Gemini summary (3-5 lines) for sharing
-            "prediction": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', '')
-        })
+        # STEPS 1-4: OCR to text, then normal flow (identical uploads in flight share one run)
+        input_metadata, pipeline, cache_status, coalesced = await _detect("image", image_data)
         
+        logger.info("[STEP 5/5] Preparing response...", extra=STAGE)
         total_time = time.time() - start_time
         
-        response = {
-            "success": True,
-            "verdict": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', ''),
-            "key_factors": final_verdict.get('key_factors', []),
-            "references": final_verdict.get('references', []),
-            "query": gemini_summary,
-            "isFake": final_verdict.get('verdict', '') == "Fake",
-            "highlightedQuery": _highlight_suspicious_text(gemini_summary),
-            "whatsapp_share": whatsapp_share,
-            "metadata": {
-                "input_type": "image",
-                "processing_time": round(total_time, 2),
-                "services_checked": verification_results.get('services_checked', 6),
-                "services_successful": verification_results.get('services_successful', 0)
-            }
-        }
+        response = _build_response(
+            input_type="image",
+            input_metadata=input_metadata,
+            total_time=total_time,
+            cache_status=cache_status,
+            **pipeline
+        )
+        response["metadata"]["coalesced"] = coalesced
         
-        print(f"\n✅ REQUEST COMPLETE in {total_time:.2f}s")
-        print(f"{'='*60}\n")
+        logger.info(f"✅ REQUEST COMPLETE in {total_time:.2f}s", extra={"total_time": round(total_time, 3)})
         
         return response
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        limiter.release()
 
 
 @app.post("/api/detect/voice")
@@ -296,108 +529,757 @@ async def detect_voice(file: UploadFile = File(...)):
     """
     start_time = time.time()
     
+    limiter = endpoint_limiters["voice"]
+    await limiter.acquire()
+    
     try:
-        print(f"\n{'='*60}")
-        print(f"📥 NEW REQUEST: VOICE")
-        print(f"   Filename: {file.filename}")
-        print(f"{'='*60}")
+        logger.info("📥 NEW REQUEST: VOICE", extra={"input_type": "voice", "filename": file.filename})
         
         # Read audio bytes
         audio_data = await file.read()
         
-        # STEP 1: STT to text
-        print("\n[STEP 1/5] Transcribing audio...")
-        input_data = {
-            "type": "voice",
-            "data": audio_data
-        }
-        text, input_metadata = await process_input(input_data)
-        print(f"✅ Text transcribed ({len(text)} chars) in {input_metadata.get('processing_time', 0)}s")
-        
-        # Continue with normal flow
-        print("\n[STEP 2/5] Summarizing with Gemini...")
-        summary_result = await summarize_news(text, timeout=3)
-        gemini_summary = summary_result.get('summary', text[:500])
-        
-        print("\n[STEP 3/5] Running parallel verification...")
-        verification_results = await run_parallel_verification(text, gemini_summary)
-        model_result = verification_results.get('model', {})
-        
-        print("\n[STEP 4/5] Aggregating verdict with Gemini...")
-        final_verdict = await aggregate_verdict(text, gemini_summary, model_result, verification_results, timeout=3)
+        # STEPS 1-4: STT to text, then normal flow (identical uploads in flight share one run)
+        input_metadata, pipeline, cache_status, coalesced = await _detect("voice", audio_data)
+        final_verdict = pipeline['final_verdict']
         
-        print("\n[STEP 5/5] Preparing response (with TTS)...")
+        logger.info("[STEP 5/5] Preparing response (with TTS)...", extra=STAGE)
         
         # Generate TTS for verdict
         tts_text = f"The news has been analyzed. Verdict: {final_verdict.get('verdict', 'Uncertain')}. {final_verdict.get('description', '')}"
-        tts_result = await generate_voice(tts_text)
-        
-        # Generate WhatsApp share message with Gemini summary (for voice input)
-        whatsapp_share = create_whatsapp_share_from_result({
-            "text": gemini_summary,  # Use Gemini summary (3-5 lines) for sharing
-            "prediction": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', '')
-        })
+        tts_result = await _timed_tts(tts_text)
         
         total_time = time.time() - start_time
         
-        response = {
-            "success": True,
-            "verdict": final_verdict.get('verdict', 'Uncertain'),
-            "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
-            "description": final_verdict.get('description', ''),
-            "key_factors": final_verdict.get('key_factors', []),
-            "references": final_verdict.get('references', []),
-            "query": gemini_summary,
-            "isFake": final_verdict.get('verdict', '') == "Fake",
-            "highlightedQuery": _highlight_suspicious_text(gemini_summary),
-            "whatsapp_share": whatsapp_share,
-            "tts_audio": tts_result.get('audio_base64', None) if tts_result.get('success') else None,
-            "metadata": {
-                "input_type": "voice",
-                "processing_time": round(total_time, 2),
-                "services_checked": verification_results.get('services_checked', 6),
-                "services_successful": verification_results.get('services_successful', 0),
-                "tts_generated": tts_result.get('success', False)
-            }
-        }
+        response = _build_response(
+            input_type="voice",
+            input_metadata=input_metadata,
+            total_time=total_time,
+            cache_status=cache_status,
+            **pipeline
+        )
+        response["tts_audio"] = tts_result.get('audio_base64', None) if tts_result.get('success') else None
+        response["metadata"]["tts_generated"] = tts_result.get('success', False)
+        response["metadata"]["coalesced"] = coalesced
         
-        print(f"\n✅ REQUEST COMPLETE in {total_time:.2f}s")
-        print(f"{'='*60}\n")
+        logger.info(f"✅ REQUEST COMPLETE in {total_time:.2f}s", extra={"total_time": round(total_time, 3)})
         
         return response
         
+    except (OverloadedError, DeadlineExceededError):
+        raise
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"❌ Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        limiter.release()
+
+
+async def _detect(input_type: str, data) -> Tuple[Dict, Dict, str, bool]:
+    """
+    Run steps 1-4 for one input, coalescing concurrent identical requests.
+    
+    Text is keyed on its normalized hash, URLs on the canonical URL and
+    image/audio uploads on the byte hash.
+    
+    Returns:
+        Tuple of (input metadata, pipeline result, cache status, coalesced)
+    """
+    async def _process_and_run() -> Tuple[Dict, Dict, str]:
+        # STEP 1: Convert input to text (1-3s)
+        logger.info(f"[STEP 1/5] Processing {input_type} input...", extra=STAGE)
+        text, input_metadata = await _timed_process_input(input_type, data)
+        logger.info(f"✅ Text extracted ({len(text)} chars) in {input_metadata.get('processing_time', 0)}s", extra=STAGE)
+        
+        pipeline, cache_status = await _run_pipeline(text)
+        return input_metadata, pipeline, cache_status
+    
+    (input_metadata, pipeline, cache_status), coalesced = await request_coalescer.run(
+        coalesce_key(input_type, data, current_aggregator(), _model_version()), _process_and_run
+    )
+    if coalesced:
+        logger.info("🔗 Joined an identical request already in flight")
+    return input_metadata, pipeline, cache_status, coalesced
+
+
+async def _run_pipeline(text: str) -> Tuple[Dict, str]:
+    """
+    Run steps 2-4 (summarize, verify, aggregate) for extracted text, through the verdict cache.
+    
+    Args:
+        text: Text extracted from the input
+        
+    Returns:
+        Tuple of (pipeline result, cache status "hit" | "miss" | "stale" | "bypass").
+        The pipeline result has gemini_summary, verification_results and final_verdict
+        (plus stage_timings when it was computed rather than served from the cache).
+    """
+    cache_key = _verdict_key(text)
+    cached, cache_status = _cached_pipeline(cache_key)
+    if cached is not None:
+        logger.info("⚡ Verdict cache hit - skipping summarization, verification and aggregation")
+        return cached, cache_status
+    
+    # STEPS 2-4: Summarize, verify and aggregate as a stage graph - the model and keyword
+    # searches run on the raw text while Gemini is still summarizing
+    # (stopped early when the first results are already conclusive)
+    stage_timings = {}
+    results = {}
+    async for stage, result in _detection_stages(text, stage_timings):
+        results[stage] = result
+    
+    pipeline = _stage_pipeline(text, results)
+    _cache_pipeline(cache_key, pipeline)
+    return {**pipeline, "stage_timings": stage_timings}, cache_status
+
+
+def _model_version() -> str:
+    """Version of the serving model ("unloaded" before the first load)."""
+    return model_info().get('version', "unloaded")
+
+
+def _verdict_key(text: str) -> str:
+    """
+    Verdict cache key: the text's content address, scoped to the serving model version, so a
+    promoted or hot-reloaded model never serves verdicts (and model_version) of the previous one.
+    """
+    return f"{_model_version()}:{verdict_cache.make_key(text)}"
+
+
+def _cached_pipeline(cache_key: str) -> Tuple[Optional[Dict], str]:
+    """
+    Verdict cache lookup. Bypassed for "meta" requests: meta verdicts are never stored, so a hit
+    would always be a Gemini verdict the request did not ask for.
+    """
+    if current_aggregator() == "meta":
+        return None, "bypass"
+    return verdict_cache.get(cache_key)
+
+
+def _cache_pipeline(cache_key: str, pipeline: Dict) -> None:
+    """
+    Cache a pipeline result unless the verdict is a degraded fallback, came from the
+    meta model (cheap to recompute, and not what Gemini-backed requests asked for)
+    or verifiers were skipped for time.
+    """
+    if pipeline['final_verdict'].get('fallback') or pipeline['final_verdict'].get('aggregator'):
+        return
+    if any(
+        isinstance(result, dict) and result.get('error') == DEADLINE_ERROR
+        for result in pipeline['verification_results'].values()
+    ):
+        return
+    verdict_cache.set(cache_key, pipeline)
+
+
+# Timed pipeline stages (latency histograms + upstream failure counters)
+
+async def _timed_process_input(input_type: str, data) -> Tuple[str, Dict]:
+    """
+    STEP 1: Convert input to text.
+    
+    Scraper/OCR/STT over capacity raises OverloadedError; with no time left
+    for extraction the request fails with DeadlineExceededError.
+    """
+    upstream = input_limiter(input_type)
+    if upstream is None:
+        return await _extract_text(input_type, data)
+    async with upstream:
+        return await _extract_text(input_type, data)
+
+
+async def _extract_text(input_type: str, data) -> Tuple[str, Dict]:
+    # Sized after any upstream slot wait, so queueing counts against the budget
+    timeout = stage_timeout(INPUT_TIMEOUTS.get(input_type, 10))
+    if not has_budget(timeout):
+        raise DeadlineExceededError("input processing")
+    with STAGE_LATENCY.time(stage="input"):
+        return await process_input({"type": input_type, "data": data}, timeout=timeout)
 
 
-def _highlight_suspicious_text(text: str) -> list:
+async def _timed_summarize(text: str) -> Dict:
+    """STEP 2: Gemini summarization (skipped - raw text used - when the budget is needed for verification)."""
+    timeout = stage_timeout(SUMMARIZE_TIMEOUT, VERIFICATION_RESERVE)
+    if not has_budget(timeout):
+        summary_result = {"success": False, "summary": text[:500], "error": DEADLINE_ERROR}
+    else:
+        with STAGE_LATENCY.time(stage="summarize"):
+            summary_result = await summarize_news(text, timeout=timeout)
+    if not summary_result.get('success'):
+        record_service_result("gemini_summarize", summary_result)
+    return summary_result
+
+
+async def _timed_aggregate(
+    original_text: str,
+    gemini_summary: str,
+    model_result: Dict,
+    verification_results: Dict
+) -> Dict:
+    """
+    STEP 4: Verdict aggregation with the request's backend.
+    
+    "meta" uses the local meta model (Gemini when it has not been trained). A failed or
+    skipped (out of time) Gemini call counts as a failure and falls back to the meta model,
+    or to the model-based verdict. Successful Gemini verdicts are logged as meta model training data.
+    """
+    if current_aggregator() == "meta":
+        with STAGE_LATENCY.time(stage="aggregate_meta"):
+            final_verdict = meta_verdict(model_result, verification_results)
+        if final_verdict is not None:
+            return final_verdict
+    
+    timeout = stage_timeout(AGGREGATE_TIMEOUT, RESPONSE_RESERVE)
+    if not has_budget(timeout):
+        SERVICE_FAILURES.inc(service="gemini_aggregate", kind="deadline")
+        return meta_verdict(model_result, verification_results) or fallback_verdict(
+            model_result, verification_results, reason="Time budget spent before aggregation"
+        )
+    
+    with STAGE_LATENCY.time(stage="aggregate"):
+        final_verdict = await aggregate_verdict(
+            original_text, gemini_summary, model_result, verification_results, timeout=timeout
+        )
+    if final_verdict.get('fallback'):
+        SERVICE_FAILURES.inc(service="gemini_aggregate", kind="error")
+        return meta_verdict(model_result, verification_results) or final_verdict
+    
+    log_aggregation(model_result, verification_results, final_verdict)
+    return final_verdict
+
+
+async def _timed_tts(text: str) -> Dict:
+    """Voice response (ElevenLabs TTS) - skipped when TTS is over capacity or the request is out of time."""
+    try:
+        async with upstream_limiters["tts"]:
+            timeout = stage_timeout(TTS_TIMEOUT)  # sized after the slot wait
+            if not has_budget(timeout):
+                tts_result = {"success": False, "error": DEADLINE_ERROR}
+            else:
+                with STAGE_LATENCY.time(stage="tts"):
+                    tts_result = await modules.generate_voice(text, timeout=timeout)
+    except OverloadedError as e:
+        tts_result = {"success": False, "error": str(e)}
+    if not tts_result.get('success'):
+        record_service_result("tts", tts_result)
+    return tts_result
+
+
+# Detection stage graph (steps 2-4) - each stage starts as soon as its inputs are ready:
+#   text ─┬─ summary ─┬─ factcheck, twitter ─┐
+#         │           └─────────────────────┼─ verdict
+#         └─ model, newsapi, reddit, webscrape ─ verification ─┘
+
+async def _summary_stage(text: str) -> Dict:
+    """STEP 2: Gemini summary (the truncated text when summarization fails)."""
+    logger.info("[STEP 2/5] Summarizing with Gemini...", extra=STAGE)
+    summary_result = await _timed_summarize(text)
+    summary_result = {**summary_result, "summary": summary_result.get('summary', text[:500])}
+    logger.info(f"✅ Summary created ({len(summary_result['summary'])} chars)", extra=STAGE)
+    return summary_result
+
+
+async def _verification_stage(started_at: float, **service_results) -> Dict:
+    """STEP 3: Combine the per-service results once the last verifier is done."""
+    execution_time = time.time() - started_at
+    STAGE_LATENCY.observe(execution_time, stage="verification")
+    verification_results = build_verification_results(service_results, execution_time)
+    logger.info(
+        f"✅ Verification complete in {verification_results.get('execution_time', 0)}s "
+        f"({verification_results.get('services_successful', 0)}/6 services successful)",
+        extra=STAGE
+    )
+    return verification_results
+
+
+async def _verdict_stage(text: str, summary: Dict, verification: Dict) -> Dict:
+    """STEP 4: Gemini verdict aggregation."""
+    logger.info("[STEP 4/5] Aggregating verdict with Gemini...", extra=STAGE)
+    final_verdict = await _timed_aggregate(text, summary['summary'], verification.get('model', {}), verification)
+    logger.info(f"✅ Final verdict: {final_verdict.get('verdict', 'Unknown')}", extra=STAGE)
+    return final_verdict
+
+
+DETECTION_GRAPH = PipelineGraph(
+    [
+        Stage("summary", _summary_stage, ("text",)),
+        *verification_stages(),
+        Stage("verification", _verification_stage, ("started_at", *VERIFICATION_SERVICES)),
+        Stage("verdict", _verdict_stage, ("text", "summary", "verification"))
+    ],
+    seeds=("text", "started_at")
+)
+
+
+async def _detection_stages(text: str, stage_timings: Dict) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Run DETECTION_GRAPH for extracted text, yielding (stage, result) as each stage finishes.
+    
+    After every verifier result the early verdict rules are checked; when they fire, the
+    stages still running (verifiers, summary, aggregation) are cancelled and the skipped
+    verifiers are reported as EARLY_SKIPPED. Always ends with "verification" and "verdict".
+    """
+    started_at = time.time()
+    service_results = {}
+    early = None
+    
+    stages = DETECTION_GRAPH.run({"text": text, "started_at": started_at}, stage_timings)
+    try:
+        async for stage, result in stages:
+            yield stage, result
+            if stage in VERIFICATION_SERVICES:
+                service_results[stage] = result
+                early = check_early_verdict(service_results)
+                if early is not None:
+                    break
+    finally:
+        await stages.aclose()
+    
+    if early is not None:
+        execution_time = time.time() - started_at
+        STAGE_LATENCY.observe(execution_time, stage="verification")
+        yield "verification", build_verification_results(service_results, execution_time, missing=EARLY_SKIPPED)
+        yield "verdict", early
+
+
+def _stage_pipeline(text: str, results: Dict) -> Dict:
+    """Pipeline result from the detection stage results (raw text as the summary if it was cut short)."""
+    summary = results.get('summary', {}).get('summary', text[:500])
+    return {
+        "gemini_summary": summary,
+        "verification_results": results['verification'],
+        "final_verdict": results['verdict']
+    }
+
+
+@app.post("/api/detect/batch")
+async def detect_batch(request: BatchDetectionRequest):
+    """
+    Detect fake news for many text/URL items in one call.
+    
+    Items are normalized and deduplicated, the ML model runs as a single
+    vectorizer pass over the whole batch, and all external lookups share one
+    concurrency budget. Results come back in input order, or as NDJSON lines
+    (in completion order, each with its "index") when stream=true.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items provided")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Too many items (max {BATCH_MAX_ITEMS})")
+    
+    concurrency = max(1, min(request.max_concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY))
+    limiter = asyncio.Semaphore(concurrency)
+    
+    admission = endpoint_limiters["batch"]
+    await admission.acquire()
+    
+    if request.stream:
+        async def _ndjson():
+            async for index, result in _batch_results(request.items, limiter, concurrency):
+                yield json.dumps({"index": index, **result}, default=str) + "\n"
+        
+        return AdmittedStreamingResponse(_ndjson(), admission, media_type="application/x-ndjson")
+    
+    start_time = time.time()
+    results = [None] * len(request.items)
+    try:
+        async for index, result in _batch_results(request.items, limiter, concurrency):
+            results[index] = result
+    finally:
+        admission.release()
+    
+    return {
+        "success": True,
+        "count": len(results),
+        "results": results,
+        "metadata": {
+            "processing_time": round(time.time() - start_time, 2),
+            "unique_items": len({r["metadata"]["batch_key"] for r in results if r.get("success")}),
+            "max_concurrency": concurrency
+        }
+    }
+
+
+async def _batch_results(
+    items: List[TextDetectionRequest], limiter: asyncio.Semaphore, concurrency: int
+) -> AsyncIterator[Tuple[int, Dict]]:
     """
-    Highlight suspicious phrases in text.
-    Returns list of segments with isSuspicious flag.
+    Run the detection pipeline for a batch, yielding (index, response) as each unique item finishes.
+    
+    Duplicate items (same normalized text) share one pipeline run. Each item gets its own time
+    budget (the request's timeout), started when the item starts rather than when the batch did.
     """
-    suspicious_keywords = [
-        'shocking', 'breaking', 'miracle', 'secret', 'doctors hate',
-        'you won\'t believe', 'click here', 'amazing', 'unbelievable',
-        'exclusive', 'leaked', 'banned', 'hidden truth'
-    ]
+    start_time = time.time()
+    request_deadline = deadline_var.get()
+    item_timeout = request_deadline.timeout if request_deadline is not None else None
+    
+    def _start_item_deadline() -> None:
+        # Tasks run in a copy of the context, so this only applies to the calling item
+        if item_timeout is not None:
+            deadline_var.set(Deadline(item_timeout))
+    logger.info(f"📦 NEW BATCH REQUEST: {len(items)} items", extra={"batch_size": len(items)})
+    
+    # STEP 1: Convert inputs to text (URL scrapes count against the shared budget)
+    async def _extract(item: TextDetectionRequest):
+        async with limiter:
+            _start_item_deadline()
+            return await _timed_process_input(item.type, item.text)
     
-    # Simple implementation - split by sentences
-    segments = []
-    words = text.split()
+    extracted = await asyncio.gather(*(_extract(item) for item in items), return_exceptions=True)
     
-    for i, word in enumerate(words):
-        is_suspicious = any(keyword in word.lower() for keyword in suspicious_keywords)
-        segments.append({
-            "text": word + " ",
-            "isSuspicious": is_suspicious
-        })
+    # STEP 2: Normalize and deduplicate
+    groups: Dict[str, List[int]] = {}
+    unique: Dict[str, Tuple[str, Dict]] = {}
+    for index, outcome in enumerate(extracted):
+        if isinstance(outcome, Exception):
+            yield index, {"success": False, "error": str(outcome)}
+            continue
+        text, input_metadata = outcome
+        key = _verdict_key(text)
+        groups.setdefault(key, []).append(index)
+        unique.setdefault(key, (text, input_metadata))
     
-    return segments
+    if not unique:
+        return
+    logger.info(f"{len(unique)} unique items after deduplication", extra=STAGE)
+    
+    def _item_responses(key: str, pipeline: Dict, cache_status: str):
+        input_metadata = unique[key][1]
+        response = _build_response(
+            input_type=input_metadata.get('input_type', 'text'),
+            input_metadata=input_metadata,
+            total_time=time.time() - start_time,
+            cache_status=cache_status,
+            **pipeline
+        )
+        for index in groups[key]:
+            item_response = {**response, "metadata": {**response["metadata"]}}
+            item_response["metadata"]["batch_key"] = groups[key][0]
+            item_response["metadata"]["deduplicated"] = index != groups[key][0]
+            yield index, item_response
+    
+    # Verdict cache hits are answered straight away
+    keys = []
+    cache_statuses = {}
+    for key in unique:
+        pipeline, cache_status = _cached_pipeline(key)
+        if pipeline is not None:
+            for index, item_response in _item_responses(key, pipeline, cache_status):
+                yield index, item_response
+        else:
+            keys.append(key)
+            cache_statuses[key] = cache_status
+    
+    if not keys:
+        return
+    
+    # STEPS 3-5: per unique item, Gemini summary -> verification -> aggregation, overlapped with one
+    # model pass over the whole batch (the model scores the raw text, so it doesn't wait for summaries).
+    # At most `concurrency` items are in flight; external calls share the limiter's budget.
+    async def _model_batch() -> List[Dict]:
+        with STAGE_LATENCY.time(stage="model_batch"):
+            return await predict_batch([unique[key][0] for key in keys])
+    
+    model_task = asyncio.create_task(_model_batch())
+    items_in_flight = asyncio.Semaphore(concurrency)
+    
+    async def _verify(position: int, key: str) -> Dict:
+        text, input_metadata = unique[key]
+        async with items_in_flight:
+            _start_item_deadline()
+            async with limiter:
+                summary_result = await _timed_summarize(text)
+            gemini_summary = summary_result.get('summary', text[:500])
+            model_result = (await asyncio.shield(model_task))[position]
+            
+            with STAGE_LATENCY.time(stage="verification"):
+                verification_results = await run_parallel_verification(text, gemini_summary, model_result, limiter)
+            final_verdict = check_early_verdict(verification_results)
+            if final_verdict is None:
+                async with limiter:
+                    final_verdict = await _timed_aggregate(text, gemini_summary, model_result, verification_results)
+        pipeline = {
+            "gemini_summary": gemini_summary,
+            "verification_results": verification_results,
+            "final_verdict": final_verdict
+        }
+        _cache_pipeline(key, pipeline)
+        return pipeline
+    
+    pending = {asyncio.create_task(_verify(position, key)): key for position, key in enumerate(keys)}
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                key = pending.pop(task)
+                try:
+                    pipeline = task.result()
+                except Exception as e:
+                    logger.exception(f"❌ Batch item error: {e}")
+                    for index in groups[key]:
+                        yield index, {"success": False, "error": str(e)}
+                    continue
+                
+                for index, item_response in _item_responses(key, pipeline, cache_statuses[key]):
+                    yield index, item_response
+    finally:
+        for task in pending:
+            task.cancel()
+        model_task.cancel()
+    
+    logger.info(f"✅ BATCH COMPLETE in {time.time() - start_time:.2f}s")
+
+
+# Asynchronous Job Endpoints
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """
+    Queue a text/URL detection job and return its id immediately.
+    
+    Poll GET /api/jobs/{job_id} for status and partial results, or pass
+    callback_url to receive the finished job as a webhook POST.
+    """
+    if request.type not in ("text", "url"):
+        raise HTTPException(status_code=400, detail="type must be 'text' or 'url' (use /api/jobs/file for uploads)")
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Empty text provided")
+    
+    try:
+        job_id = await job_queue.submit(request.type, request.text, request.callback_url)
+    except CallbackURLError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+
+@app.post("/api/jobs/file", status_code=202)
+async def submit_file_job(
+    file: UploadFile = File(...),
+    type: str = Form("image"),
+    callback_url: Optional[str] = Form(None)
+):
+    """Queue an image (OCR) or voice (STT) detection job."""
+    if type not in ("image", "voice"):
+        raise HTTPException(status_code=400, detail="type must be 'image' or 'voice'")
+    
+    data = await file.read()
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty file provided")
+    
+    try:
+        job_id = await job_queue.submit(type, data, callback_url)
+    except CallbackURLError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status (queued/running/done/failed), partial results and final result."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# Streaming Endpoints (Server-Sent Events)
+
+@app.post("/api/detect/text/stream")
+async def detect_text_stream(request: TextDetectionRequest):
+    """
+    Streaming variant of /api/detect/text.
+    
+    Emits Server-Sent Events as each stage finishes instead of waiting for the slowest service:
+    input → summary/model/factcheck/newsapi/twitter/reddit/webscrape (completion order) → verdict
+    """
+    limiter = endpoint_limiter(request.type)
+    await limiter.acquire()
+    return _sse_response(_detection_events(request.type, request.text), limiter)
+
+
+@app.post("/api/detect/image/stream")
+async def detect_image_stream(file: UploadFile = File(...)):
+    """Streaming variant of /api/detect/image (OCR input)."""
+    image_data = await file.read()
+    limiter = endpoint_limiters["image"]
+    await limiter.acquire()
+    return _sse_response(_detection_events("image", image_data), limiter)
+
+
+@app.post("/api/detect/voice/stream")
+async def detect_voice_stream(file: UploadFile = File(...)):
+    """Streaming variant of /api/detect/voice (STT input, TTS audio sent as a final 'tts' event)."""
+    audio_data = await file.read()
+    limiter = endpoint_limiters["voice"]
+    await limiter.acquire()
+    return _sse_response(_detection_events("voice", audio_data), limiter)
+
+
+async def _detection_events(input_type: str, data) -> AsyncIterator[Tuple[str, Dict]]:
+    """
+    Run the detection pipeline, yielding (event, payload) pairs as each stage completes.
+    
+    Events:
+        - input: extracted text length and input metadata
+        - summary, model, factcheck, newsapi, twitter, reddit, webscrape: Gemini summary and
+          per-service results, in completion order (the model usually arrives before the summary)
+        - verdict: final response (same shape as the non-streaming endpoints)
+        - tts: voice response audio (voice input only)
+        - error: processing failed (status + detail)
+    """
+    start_time = time.time()
+    
+    try:
+        logger.info(f"📡 NEW STREAMING REQUEST: {input_type.upper()}", extra={"input_type": input_type})
+        
+        # STEP 1: Convert input to text
+        text, input_metadata = await _timed_process_input(input_type, data)
+        yield "input", {"text_length": len(text), **input_metadata}
+        
+        cache_key = _verdict_key(text)
+        pipeline, cache_status = _cached_pipeline(cache_key)
+        
+        if pipeline is not None:
+            # Verdict cache hit - replay the cached stages
+            yield "summary", {"summary": pipeline['gemini_summary'], "success": True}
+            for service in VERIFICATION_SERVICES:
+                yield service, pipeline['verification_results'].get(service, {})
+        else:
+            # STEPS 2-4: Stage graph - summary and each service streamed as it resolves
+            stage_timings = {}
+            results = {}
+            async for stage, result in _detection_stages(text, stage_timings):
+                results[stage] = result
+                if stage == "summary":
+                    yield "summary", {"summary": result['summary'], "success": result.get('success', False)}
+                elif stage in VERIFICATION_SERVICES:
+                    yield stage, result
+            
+            pipeline = _stage_pipeline(text, results)
+            _cache_pipeline(cache_key, pipeline)
+            pipeline = {**pipeline, "stage_timings": stage_timings}
+        
+        # STEP 5: Final response
+        final_verdict = pipeline['final_verdict']
+        response = _build_response(
+            input_type=input_type,
+            input_metadata=input_metadata,
+            total_time=time.time() - start_time,
+            cache_status=cache_status,
+            **pipeline
+        )
+        yield "verdict", response
+        
+        if input_type == "voice":
+            tts_text = f"The news has been analyzed. Verdict: {final_verdict.get('verdict', 'Uncertain')}. {final_verdict.get('description', '')}"
+            tts_result = await _timed_tts(tts_text)
+            yield "tts", {
+                "tts_audio": tts_result.get('audio_base64', None) if tts_result.get('success') else None,
+                "tts_generated": tts_result.get('success', False)
+            }
+        
+        logger.info(f"✅ STREAMING REQUEST COMPLETE in {time.time() - start_time:.2f}s")
+        
+    except OverloadedError as e:
+        yield "error", {"status": 429, "detail": str(e), "retry_after": e.retry_after}
+    except DeadlineExceededError as e:
+        yield "error", {"status": 504, "detail": str(e)}
+    except ValueError as e:
+        logger.warning(f"❌ Validation error: {e}")
+        yield "error", {"status": 400, "detail": str(e)}
+    except Exception as e:
+        logger.exception(f"❌ Unexpected error: {e}")
+        yield "error", {"status": 500, "detail": f"Internal server error: {str(e)}"}
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse holding an endpoint admission slot until it has been sent.
+    The slot is acquired in the handler (so overload is still a plain 429) and released when the
+    response's ASGI call ends - also when the body never starts (client gone, middleware error).
+    """
+    
+    def __init__(self, content, limiter, **kwargs):
+        super().__init__(content, **kwargs)
+        self.limiter = limiter
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.limiter.release()
+
+
+def _sse_response(events: AsyncIterator[Tuple[str, Dict]], limiter) -> StreamingResponse:
+    """Wrap an (event, payload) iterator as a text/event-stream response holding its admission slot."""
+    async def _encode():
+        async for event, payload in events:
+            yield f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n"
+    
+    return AdmittedStreamingResponse(
+        _encode(),
+        limiter,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering so events arrive immediately
+        }
+    )
+
+
+def _build_response(
+    input_type: str,
+    gemini_summary: str,
+    final_verdict: Dict,
+    verification_results: Dict,
+    input_metadata: Dict,
+    total_time: float,
+    cache_status: str = "miss",
+    stage_timings: Optional[Dict] = None
+) -> Dict:
+    """Build the detection API response from pipeline outputs."""
+    model_result = verification_results.get('model', {})
+    
+    # Generate WhatsApp share message with Gemini summary
+    whatsapp_share = modules.create_whatsapp_share_from_result({
+        "text": gemini_summary,  # Use Gemini summary (3-5 lines) for sharing
+        "prediction": final_verdict.get('verdict', 'Uncertain'),
+        "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
+        "description": final_verdict.get('description', '')
+    })
+    
+    response = {
+        "success": True,
+        "verdict": final_verdict.get('verdict', 'Uncertain'),
+        "confidence": final_verdict.get('confidence', {"fake": 50, "real": 50}),
+        "description": final_verdict.get('description', ''),
+        "key_factors": final_verdict.get('key_factors', []),
+        "references": final_verdict.get('references', []),
+        "query": gemini_summary,
+        "isFake": final_verdict.get('verdict', '') == "Fake",
+        "highlightedQuery": highlight_suspicious_text(gemini_summary, get_scorer()),
+        "whatsapp_share": whatsapp_share,
+        "metadata": {
+            "input_type": input_type,
+            "processing_time": round(total_time, 2),
+            "services_checked": verification_results.get('services_checked', 6),
+            "services_successful": verification_results.get('services_successful', 0),
+            "model_prediction": model_result.get('prediction', 'N/A'),
+            "model_confidence": model_result.get('confidence', {}),
+            "model_version": model_result.get('model_version'),
+            "requires_tts": input_metadata.get('requires_tts', False),
+            "cache": cache_status
+        }
+    }
+    if final_verdict.get('early_verdict'):
+        # Rule that answered without Gemini aggregation (see early_verdict.py)
+        response["metadata"]["early_verdict"] = final_verdict['early_verdict']
+    if final_verdict.get('aggregator'):
+        # Verdict from the local meta model instead of Gemini (see meta_aggregator.py)
+        response["metadata"]["aggregator"] = final_verdict['aggregator']
+    if stage_timings:
+        # {stage: {"start": s, "duration": s}} from the stage graph (absent on cache hits)
+        response["metadata"]["stage_timings"] = stage_timings
+    return response
 
 
 # Run server
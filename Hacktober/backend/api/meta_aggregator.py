@@ -0,0 +1,192 @@
+"""
+Meta Aggregator
+Small local stacking model that fuses verifier evidence into a verdict in milliseconds, instead of a Gemini call
+Trained by backend/model/train_meta_classifier.py on logged pipeline outputs labelled with Gemini verdicts
+"""
+
+import os
+import json
+import math
+import time
+import pickle
+import logging
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional
+
+from early_verdict import rating_side
+from gemini_service import collect_references
+from metrics import SERVICE_FAILURES
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+META_MODEL_PATH = Path(os.getenv(
+    "META_MODEL_PATH", str(Path(__file__).parent.parent / "model" / "meta_classifier.pkl")
+))
+# JSONL file that successful Gemini aggregations are appended to (training data; empty disables)
+AGGREGATION_LOG_PATH = os.getenv("AGGREGATION_LOG_PATH", "")
+
+# Aggregation backends a request can pick with the X-Aggregator header
+AGGREGATORS = ("gemini", "meta")
+DEFAULT_AGGREGATOR = os.getenv("AGGREGATOR", "gemini")
+AGGREGATOR_HEADER = "x-aggregator"
+
+# Global model cache (None until loaded; False once loading failed, so it is not retried per request)
+_meta_cache = None
+_meta_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+# Aggregation backend of the request being handled - set by the HTTP middleware
+aggregator_var: ContextVar[Optional[str]] = ContextVar("aggregator", default=None)
+
+
+def resolve_aggregator(name: Optional[str]) -> str:
+    """Backend for a request (DEFAULT_AGGREGATOR when unset; ValueError for an unknown name)."""
+    name = (name or DEFAULT_AGGREGATOR).lower()
+    if name not in AGGREGATORS:
+        raise ValueError(f"Unknown aggregator '{name}' (expected one of {', '.join(AGGREGATORS)})")
+    return name
+
+
+def current_aggregator() -> str:
+    """Backend chosen for the current request (DEFAULT_AGGREGATOR outside a request, e.g. in jobs)."""
+    return aggregator_var.get() or DEFAULT_AGGREGATOR
+
+
+def evidence_features(model_result: Dict, verification_results: Dict) -> Dict[str, float]:
+    """
+    Numeric evidence features of one pipeline run (the meta model's input).
+    
+    Args:
+        model_result: ML model prediction
+        verification_results: Dict with results from all APIs
+    
+    Returns:
+        Feature name -> value (missing or failed sources contribute zeros and a 0 "_ok" flag)
+    """
+    def _ok(result: Dict) -> float:
+        return 0.0 if not result or result.get('error') else 1.0
+    
+    newsapi = verification_results.get('newsapi', {})
+    factcheck = verification_results.get('factcheck', {})
+    twitter = verification_results.get('twitter', {})
+    reddit = verification_results.get('reddit', {})
+    
+    confidence = model_result.get('confidence') or {}
+    ratings = [rating_side(source.get('rating', '')) for source in factcheck.get('results', [])]
+    tweets = twitter.get('results', [])
+    posts = reddit.get('results', [])
+    
+    return {
+        "model_ok": _ok(model_result) if confidence else 0.0,
+        "model_fake": confidence.get('fake', 50) / 100,
+        "newsapi_ok": _ok(newsapi),
+        "newsapi_real": 1.0 if newsapi.get('label') == 1 else 0.0,
+        "newsapi_confidence": float(newsapi.get('confidence', 0) or 0),
+        "newsapi_articles": float(len(newsapi.get('relevant_links', []))),
+        "factcheck_ok": _ok(factcheck),
+        "factcheck_count": float(len(ratings)),
+        "factcheck_false": float(ratings.count("Fake")),
+        "factcheck_true": float(ratings.count("Real")),
+        "twitter_ok": _ok(twitter),
+        "twitter_count": float(len(tweets)),
+        "twitter_engagement": math.log1p(sum(post.get('likes', 0) + post.get('retweets', 0) for post in tweets)),
+        "reddit_ok": _ok(reddit),
+        "reddit_count": float(len(posts)),
+        "reddit_engagement": math.log1p(sum(max(post.get('score', 0), 0) + post.get('num_comments', 0) for post in posts))
+    }
+
+
+def log_aggregation(model_result: Dict, verification_results: Dict, verdict: Dict) -> None:
+    """Append one (features, Gemini verdict) training row to AGGREGATION_LOG_PATH, if set."""
+    if not AGGREGATION_LOG_PATH or verdict.get('verdict') not in ("Real", "Fake", "Uncertain"):
+        return
+    
+    row = {
+        "timestamp": time.time(),
+        "features": evidence_features(model_result, verification_results),
+        "verdict": verdict['verdict'],
+        "confidence": verdict.get('confidence', {})
+    }
+    try:
+        with _log_lock, open(AGGREGATION_LOG_PATH, "a") as f:
+            f.write(json.dumps(row) + "\n")
+    except OSError as e:
+        logger.warning(f"⚠️ Could not log aggregation: {e}")
+
+
+def load_meta_model() -> Optional[Dict]:
+    """The trained meta model package, or None when it has not been trained (checked once)."""
+    global _meta_cache
+    
+    if _meta_cache is None:
+        with _meta_lock:
+            if _meta_cache is None:
+                try:
+                    with open(META_MODEL_PATH, 'rb') as f:
+                        _meta_cache = pickle.load(f)
+                    logger.info(
+                        f"✅ Meta aggregator loaded from {META_MODEL_PATH}",
+                        extra={"test_accuracy": _meta_cache.get('test_accuracy', 'N/A'),
+                               "samples": _meta_cache.get('samples', 'N/A')}
+                    )
+                except FileNotFoundError:
+                    logger.warning(f"⚠️ Meta aggregator not trained ({META_MODEL_PATH} missing) - using Gemini")
+                    _meta_cache = False
+                except Exception as e:
+                    logger.error(f"❌ Error loading meta aggregator: {e}")
+                    _meta_cache = False
+    return _meta_cache or None
+
+
+def meta_verdict(model_result: Dict, verification_results: Dict) -> Optional[Dict]:
+    """
+    Verdict from the local meta model.
+    
+    Args:
+        model_result: ML model prediction
+        verification_results: Dict with results from all APIs
+    
+    Returns:
+        Verdict dict (same shape as aggregate_verdict, with "aggregator": "meta"),
+        or None when no meta model is available or it cannot score the evidence
+        (e.g. a stale pickle with another feature layout)
+    """
+    package = load_meta_model()
+    if package is None:
+        return None
+    
+    features = evidence_features(model_result, verification_results)
+    try:
+        row = [[features.get(name, 0.0) for name in package['feature_names']]]
+        probas = dict(zip(package['model'].classes_, package['model'].predict_proba(row)[0]))
+        verdict = str(max(probas, key=probas.get))
+    except Exception as e:
+        logger.error(f"❌ Meta aggregator prediction error: {e}")
+        SERVICE_FAILURES.inc(service="meta_aggregate", kind="error")
+        return None
+    
+    # Same {"fake", "real"} split as Gemini's confidence, ignoring the Uncertain class
+    fake, real = probas.get("Fake", 0.0), probas.get("Real", 0.0)
+    fake_share = fake / (fake + real) if fake + real > 0 else 0.5
+    confidence = {"fake": round(fake_share * 100, 2), "real": round((1 - fake_share) * 100, 2)}
+    
+    key_factors = [
+        f"ML Model: {model_result.get('prediction', 'N/A')}",
+        f"News API: {int(features['newsapi_articles'])} articles, {features['newsapi_confidence']:.0%} agreement",
+        f"Fact Check: {int(features['factcheck_false'])} false / {int(features['factcheck_true'])} true ratings",
+        f"Social: {int(features['twitter_count'])} posts on Twitter/X, {int(features['reddit_count'])} Reddit discussions"
+    ]
+    return {
+        "verdict": verdict,
+        "confidence": confidence,
+        "description": (
+            f"Local evidence model rates this claim {verdict.lower()} ({probas[verdict]:.0%} probability) "
+            f"from the ML model, News API, Fact Check and social media signals."
+        ),
+        "key_factors": key_factors,
+        "references": collect_references(verification_results),
+        "aggregator": "meta"
+    }
@@ -0,0 +1,277 @@
+"""
+Metrics
+Minimal Prometheus-style metrics registry (counters, gauges, histograms)
+Rendered in the Prometheus text exposition format by the /metrics endpoint
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets (seconds) - pipeline stages range from ms (cache, model) to ~25s (full request)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 10.0, 15.0, 25.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value (backslash, double quote, newline)."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render {name="value",...} (empty string when there are no labels)."""
+    pairs = list(zip(labelnames, labelvalues))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class: a named metric with a fixed set of label names"""
+    
+    type_name = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+    
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+    
+    type_name = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def set_total(self, value: float, **labels) -> None:
+        """Mirror a counter maintained elsewhere (e.g. cache hit counts)."""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down per label set"""
+    
+    type_name = "gauge"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+    
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+    
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Increment while the block runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations (plus sum and count) per label set"""
+    
+    type_name = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> ([count per bucket], sum, count)
+        self._values: Dict[Tuple[str, ...], List] = {}
+    
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+    
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock duration of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(entry[0]), entry[1], entry[2])) for key, entry in self._values.items())
+        
+        lines = []
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                le = _format_value(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, ('le', le))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics in registration order and renders them"""
+    
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+    
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton registry and the metrics the API exports
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "sachai_request_duration_seconds", "HTTP request latency by endpoint and status", ("endpoint", "status")
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "sachai_requests_in_flight", "HTTP requests currently being processed", ("endpoint",)
+))
+STAGE_LATENCY = registry.register(Histogram(
+    "sachai_stage_duration_seconds",
+    "Pipeline stage latency (input, summarize, verification, aggregate, tts)", ("stage",)
+))
+VERIFIER_LATENCY = registry.register(Histogram(
+    "sachai_verifier_duration_seconds", "Latency of each verification service", ("service",)
+))
+SERVICE_FAILURES = registry.register(Counter(
+    "sachai_service_failures_total", "Upstream service timeouts and errors", ("service", "kind")
+))
+CACHE_EVENTS = registry.register(Counter(
+    "sachai_verdict_cache_lookups_total", "Verdict cache lookups by result", ("result",)
+))
+CACHE_HIT_RATIO = registry.register(Gauge(
+    "sachai_verdict_cache_hit_ratio", "Verdict cache hits / lookups"
+))
+CACHE_SIZE = registry.register(Gauge(
+    "sachai_verdict_cache_size", "Verdict cache size", ("unit",)
+))
+COALESCED_REQUESTS = registry.register(Counter(
+    "sachai_coalesced_requests_total", "Requests by single-flight role", ("role",)
+))
+HEDGED_CALLS = registry.register(Counter(
+    "sachai_hedged_calls_total", "Hedged upstream calls by outcome (calls, hedged, fallbacks, backup_wins, abandoned)", ("call", "outcome")
+))
+HEDGE_DELAY = registry.register(Gauge(
+    "sachai_hedge_delay_seconds", "Current primary latency after which the backup call starts", ("call",)
+))
+EARLY_VERDICTS = registry.register(Counter(
+    "sachai_early_verdicts_total", "Requests answered by an early verdict rule (Gemini aggregation skipped)", ("rule",)
+))
+MODEL_BATCH_SIZE = registry.register(Histogram(
+    "sachai_model_batch_size", "Texts per ML model transform (micro-batched and batch endpoint calls)",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+))
+MODEL_INFO = registry.register(Gauge(
+    "sachai_model_info", "1 for the model version being served, 0 for versions served before", ("version",)
+))
+MODEL_PREDICTIONS = registry.register(Counter(
+    "sachai_model_predictions_total", "Texts scored by the ML model per model version", ("version",)
+))
+MODEL_RELOADS = registry.register(Counter(
+    "sachai_model_reloads_total", "Model hot reloads by outcome (success, failed)", ("outcome",)
+))
+EXECUTOR_QUEUE_DEPTH = registry.register(Gauge(
+    "sachai_executor_queue_depth", "Tasks waiting in each thread pool executor", ("executor",)
+))
+JOB_QUEUE_DEPTH = registry.register(Gauge(
+    "sachai_job_queue_depth", "Asynchronous jobs by status", ("status",)
+))
+ADMISSION_IN_FLIGHT = registry.register(Gauge(
+    "sachai_admission_in_flight", "Admitted requests/calls per endpoint or upstream limiter", ("scope", "name")
+))
+ADMISSION_QUEUE_DEPTH = registry.register(Gauge(
+    "sachai_admission_queue_depth", "Requests/calls waiting for a slot per limiter", ("scope", "name")
+))
+ADMISSION_REJECTIONS = registry.register(Counter(
+    "sachai_admission_rejections_total", "Requests/calls rejected as over capacity per limiter", ("scope", "name")
+))
+
+
+def record_service_result(service: str, result: Dict) -> None:
+    """Count a timeout/deadline skip/overload/error reported in a service result dict."""
+    error = result.get("error") if isinstance(result, dict) else None
+    if error:
+        message = str(error).lower()
+        if "timeout" in message:
+            kind = "timeout"
+        elif "deadline" in message:
+            kind = "deadline"
+        elif "over capacity" in message:
+            kind = "overloaded"
+        else:
+            kind = "error"
+        SERVICE_FAILURES.inc(service=service, kind=kind)
+
+
+def executor_queue_depth(executor) -> int:
+    """Number of tasks queued (not yet running) in a ThreadPoolExecutor."""
+    work_queue = getattr(executor, "_work_queue", None)
+    return work_queue.qsize() if work_queue is not None else 0
@@ -0,0 +1,176 @@
+"""
+Model Registry
+Versioned model artifacts with sha256 checksums, and a CURRENT pointer naming the version to serve
+Layout: <MODEL_REGISTRY_DIR>/<version>/{news_simple_model.bin, news_simple_model.pkl, manifest.json} + CURRENT
+Usage: python model_registry.py publish v2 ../model/news_simple_model.bin ../model/news_simple_model.pkl [--promote]
+       python model_registry.py promote v2 | list
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Configuration
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "")  # empty = serve backend/model/news_simple_model.* directly
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))  # seconds between CURRENT checks, 0 disables
+
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"
+ARTIFACTS = {"compact": "news_simple_model.bin", "pickle": "news_simple_model.pkl"}
+
+
+class RegistryError(Exception):
+    """Raised for a missing version, a missing artifact or a checksum mismatch"""
+
+
+def _check_name(version: str) -> None:
+    """Version names are plain directory names (they also arrive from the admin endpoint)."""
+    if not re.fullmatch(r"[\w][\w.-]*", version or ""):
+        raise RegistryError(f"Invalid model version name '{version}'")
+
+
+def registry_dir() -> Optional[Path]:
+    return Path(MODEL_REGISTRY_DIR) if MODEL_REGISTRY_DIR else None
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def current_version() -> Optional[str]:
+    """Version named by CURRENT (None without a registry or before the first promote)."""
+    root = registry_dir()
+    if root is None:
+        return None
+    try:
+        return (root / CURRENT).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_versions() -> List[Dict]:
+    """Manifests of all published versions, oldest first."""
+    root = registry_dir()
+    if root is None or not root.exists():
+        return []
+    manifests = []
+    for manifest_path in root.glob(f"*/{MANIFEST}"):
+        manifests.append(json.loads(manifest_path.read_text()))
+    return sorted(manifests, key=lambda manifest: manifest.get("created", 0))
+
+
+def artifact_path(version: str, model_format: str = "auto") -> Tuple[Path, str]:
+    """
+    Verified artifact of a version.
+    
+    Args:
+        version: Published version name
+        model_format: auto (compact when published, else pickle) | compact | pickle
+    
+    Returns:
+        (path, format) - the file's sha256 matches the manifest
+    
+    Raises:
+        RegistryError: unknown version, artifact not published, or checksum mismatch
+    """
+    root = registry_dir()
+    if root is None:
+        raise RegistryError("MODEL_REGISTRY_DIR is not set")
+    _check_name(version)
+    try:
+        manifest = json.loads((root / version / MANIFEST).read_text())
+    except FileNotFoundError:
+        raise RegistryError(f"Model version '{version}' is not in {root}")
+    
+    formats = ["compact", "pickle"] if model_format == "auto" else [model_format]
+    for candidate in formats:
+        name = ARTIFACTS[candidate]
+        if name not in manifest["files"]:
+            continue
+        path = root / version / name
+        checksum = _sha256(path)
+        if checksum != manifest["files"][name]:
+            raise RegistryError(f"Checksum mismatch for {version}/{name} ({checksum[:12]} != {manifest['files'][name][:12]})")
+        return path, candidate
+    raise RegistryError(f"Model version '{version}' has no {' or '.join(ARTIFACTS[f] for f in formats)}")
+
+
+def publish(version: str, files: List[Path], root: Path, metadata: Optional[Dict] = None) -> Dict:
+    """Copy artifacts into <root>/<version>/ with a checksum manifest (staged, then renamed into place)."""
+    _check_name(version)
+    target = root / version
+    if target.exists():
+        raise RegistryError(f"Model version '{version}' already exists")
+    staging = root / f".{version}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+    
+    manifest = {"version": version, "created": time.time(), "files": {}, **(metadata or {})}
+    for source in files:
+        if source.name not in ARTIFACTS.values():
+            raise RegistryError(f"Unexpected artifact {source.name} (expected {', '.join(ARTIFACTS.values())})")
+        shutil.copy2(source, staging / source.name)
+        manifest["files"][source.name] = _sha256(staging / source.name)
+    (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+    os.replace(staging, target)
+    return manifest
+
+
+def promote(version: str, root: Path) -> None:
+    """Point CURRENT at a published version (atomic rename - watchers never see a partial write)."""
+    _check_name(version)
+    if not (root / version / MANIFEST).exists():
+        raise RegistryError(f"Model version '{version}' is not in {root}")
+    tmp = root / f".{CURRENT}.tmp"
+    tmp.write_text(version + "\n")
+    os.replace(tmp, root / CURRENT)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the versioned model registry")
+    parser.add_argument("--dir", default=MODEL_REGISTRY_DIR or None, help="Registry directory (default: MODEL_REGISTRY_DIR)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish_parser = commands.add_parser("publish", help="Add a version from model artifacts")
+    publish_parser.add_argument("version")
+    publish_parser.add_argument("files", nargs="+", type=Path)
+    publish_parser.add_argument("--promote", action="store_true", help="Also make it CURRENT")
+    promote_parser = commands.add_parser("promote", help="Serve a published version")
+    promote_parser.add_argument("version")
+    commands.add_parser("list", help="Show published versions")
+    args = parser.parse_args()
+    
+    if not args.dir:
+        sys.exit("❌ Set MODEL_REGISTRY_DIR or pass --dir")
+    root = Path(args.dir)
+    root.mkdir(parents=True, exist_ok=True)
+    MODEL_REGISTRY_DIR = str(root)
+    
+    try:
+        if args.command == "publish":
+            manifest = publish(args.version, args.files, root)
+            print(f"✅ Published {args.version}: " + ", ".join(f"{name} ({digest[:12]})" for name, digest in manifest["files"].items()))
+            if args.promote:
+                promote(args.version, root)
+                print(f"✅ {args.version} is now CURRENT")
+        elif args.command == "promote":
+            promote(args.version, root)
+            print(f"✅ {args.version} is now CURRENT - workers switch on their next check")
+        else:
+            current = current_version()
+            for manifest in list_versions():
+                marker = "*" if manifest["version"] == current else " "
+                created = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["created"]))
+                print(f"{marker} {manifest['version']:<20} {created}  {', '.join(manifest['files'])}")
+    except RegistryError as e:
+        sys.exit(f"❌ {e}")
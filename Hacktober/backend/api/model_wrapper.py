@@ -1,64 +1,231 @@
 """
 Model Wrapper for Fake News Detection
-Loads and caches the trained model (news_simple_model.pkl)
-Provides fast async prediction interface
+Loads and caches the trained model (compact news_simple_model.bin when present, else news_simple_model.pkl),
+or the CURRENT version of the model registry - hot-swapped by reload_model() without a restart
+Provides fast async prediction interface (concurrent calls are micro-batched into one transform)
 """
 
+import os
+import math
+import time
 import pickle
 import asyncio
+import threading
+import logging
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
+import model_registry
+from metrics import MODEL_BATCH_SIZE, MODEL_INFO, MODEL_PREDICTIONS, MODEL_RELOADS
+from compact_model import load_compact_model
+from sparse_scorer import SparseScorer
+
 # Path to trained model
 MODEL_PATH = Path(__file__).parent.parent / "model" / "news_simple_model.pkl"
+# Memory-mapped export of the same model (backend/model/compact_format.py)
+COMPACT_MODEL_PATH = Path(__file__).parent.parent / "model" / "news_simple_model.bin"
+# auto = compact file when it exists, else the pickle | compact | pickle
+MODEL_FORMAT = os.getenv("MODEL_FORMAT", "auto").lower()
+# Score texts with the hand-rolled SparseScorer (same probabilities, without sklearn's per-call overhead)
+MODEL_FAST_PATH = os.getenv("MODEL_FAST_PATH", "true").lower() == "true"
+
+# Micro-batching: predict() calls arriving within the window share one transform + predict_proba
+MODEL_BATCH_WINDOW_MS = float(os.getenv("MODEL_BATCH_WINDOW_MS", "2"))  # 0 disables
+MODEL_BATCH_MAX_ITEMS = int(os.getenv("MODEL_BATCH_MAX_ITEMS", "32"))  # flush early at this size
+
+logger = logging.getLogger(__name__)
 
 # Global model cache
 _model_cache = None
+_model_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+# Must score sensibly before a new version replaces the serving one
+SMOKE_TEXTS = (
+    "The United Nations Climate Change Conference concluded today with representatives from 195 countries.",
+    "DOCTORS SHOCKED! This one weird trick melts belly fat overnight! Big Pharma doesn't want you to know!"
+)
 _executor = ThreadPoolExecutor(max_workers=2)
 
 
-def load_model() -> Dict:
-    """Load the trained model from pickle file (called once at startup)."""
-    global _model_cache
+def _model_file() -> Tuple[Path, str]:
+    """(path, format) of the model artifact to load, per MODEL_FORMAT."""
+    if MODEL_FORMAT == "compact" or (MODEL_FORMAT == "auto" and COMPACT_MODEL_PATH.exists()):
+        return COMPACT_MODEL_PATH, "compact"
+    return MODEL_PATH, "pickle"
+
+
+def _load_package(version: Optional[str]) -> Dict:
+    """
+    Load a model package (not yet serving).
+    
+    Args:
+        version: Registry version, or None for backend/model/news_simple_model.*
     
+    Returns:
+        Model package with 'format', 'version', 'loaded_at' and the sparse 'scorer' added
+    """
+    if version is not None:
+        path, model_format = model_registry.artifact_path(version, MODEL_FORMAT)
+    else:
+        path, model_format = _model_file()
+    
+    if model_format == "compact":
+        model_package = load_compact_model(path)
+    else:
+        with open(path, 'rb') as f:
+            model_package = pickle.load(f)
+        model_package['format'] = "pickle"
+    model_package['version'] = version or "unversioned"
+    model_package['loaded_at'] = time.time()
+    
+    # Also explains predictions (highlighter), so it is built even when MODEL_FAST_PATH is off
+    try:
+        model_package['scorer'] = SparseScorer.from_package(model_package)
+    except ValueError as e:
+        logger.warning(f"⚠️ Sparse scorer unavailable, using sklearn transform: {e}")
+    
+    logger.info(
+        f"✅ Model loaded successfully from {path}",
+        extra={"model_type": model_package.get('model_type', 'Unknown'),
+               "test_accuracy": model_package.get('test_accuracy', 'N/A'),
+               "format": model_format,
+               "model_version": model_package['version']}
+    )
+    return model_package
+
+
+def _serve(model_package: Dict) -> None:
+    """Make a loaded package the serving model - one reference swap, so every batch sees one version."""
+    global _model_cache
+    previous = _model_cache
+    _model_cache = model_package
+    if previous is not None and previous['version'] != model_package['version']:
+        MODEL_INFO.set(0, version=previous['version'])
+    MODEL_INFO.set(1, version=model_package['version'])
+
+
+def load_model() -> Dict:
+    """Load the trained model - registry CURRENT, compact file or pickle (once - at startup, or on first prediction)."""
     if _model_cache is not None:
         return _model_cache
     
-    try:
-        with open(MODEL_PATH, 'rb') as f:
-            model_package = pickle.load(f)
+    with _model_lock:
+        if _model_cache is not None:
+            return _model_cache
         
-        print(f"✅ Model loaded successfully from {MODEL_PATH}")
-        print(f"   Model type: {model_package.get('model_type', 'Unknown')}")
-        print(f"   Test accuracy: {model_package.get('test_accuracy', 'N/A')}")
+        try:
+            model_package = _load_package(model_registry.current_version())
+            _serve(model_package)
+            return model_package
+            
+        except FileNotFoundError as e:
+            logger.error(f"❌ Model file not found: {e.filename}")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Error loading model: {e}")
+            raise
+
+
+def reload_model(version: Optional[str] = None) -> Dict:
+    """
+    Load a model version in the calling thread and switch to it once it passes a smoke prediction.
+    Requests keep using the old model until the switch; batches already running finish on it.
+    
+    Args:
+        version: Registry version (default: the one named by CURRENT)
+    
+    Returns:
+        model_info() of the serving model
+    
+    Raises:
+        RegistryError, ValueError or load errors - the old model keeps serving
+    """
+    with _reload_lock:
+        version = version or model_registry.current_version()
+        if _model_cache is not None and version == _model_cache['version']:
+            return model_info()
         
-        _model_cache = model_package
-        return model_package
+        started = time.perf_counter()
+        try:
+            candidate = _load_package(version)
+            _smoke_test(candidate)
+        except Exception as e:
+            MODEL_RELOADS.inc(outcome="failed")
+            logger.error(f"❌ Model reload to {version} failed, keeping {model_info().get('version')}: {e}")
+            raise
         
-    except FileNotFoundError:
-        print(f"❌ Model file not found: {MODEL_PATH}")
-        raise
-    except Exception as e:
-        print(f"❌ Error loading model: {e}")
-        raise
+        with _model_lock:
+            _serve(candidate)
+        MODEL_RELOADS.inc(outcome="success")
+        logger.info(f"🔄 Now serving model {candidate['version']} (loaded in {time.perf_counter() - started:.1f}s)")
+        return model_info()
+
+
+def _smoke_test(model_package: Dict) -> None:
+    """Raise ValueError unless the package returns finite, normalised probabilities and known labels."""
+    for result in _predict_with(model_package, list(SMOKE_TEXTS)):
+        fake, real = result['confidence']['fake'], result['confidence']['real']
+        if not (math.isfinite(fake) and math.isfinite(real) and abs(fake + real - 100) < 0.1):
+            raise ValueError(f"Smoke prediction returned invalid probabilities {result['confidence']}")
+        if result['label'] not in (0, 1):
+            raise ValueError(f"Smoke prediction returned unknown label {result['label']}")
+
+
+def model_info() -> Dict:
+    """Version and provenance of the serving model ({} before it is loaded)."""
+    if _model_cache is None:
+        return {}
+    return {
+        "version": _model_cache['version'],
+        "format": _model_cache.get('format'),
+        "model_type": _model_cache.get('model_type'),
+        "test_accuracy": _model_cache.get('test_accuracy'),
+        "loaded_at": _model_cache['loaded_at']
+    }
+
+
+def get_scorer() -> Optional[SparseScorer]:
+    """Sparse scorer of the loaded model (None while the model is not loaded - never triggers a load)."""
+    return _model_cache.get('scorer') if _model_cache else None
 
 
 def _predict_sync(text: str) -> Dict:
     """Synchronous prediction (runs in thread pool)."""
-    model_package = load_model()
-    
-    vectorizer = model_package['vectorizer']
-    model = model_package['model']
-    
-    # Transform text to TF-IDF features
-    tfidf = vectorizer.transform([text])
+    return _predict_batch_sync([text])[0]
+
+
+def _predict_batch_sync(texts: List[str]) -> List[Dict]:
+    """Synchronous batch prediction - sparse scorer for a single text, one TF-IDF transform for several (runs in thread pool)."""
+    return _predict_with(load_model(), texts)
+
+
+def _predict_with(model_package: Dict, texts: List[str]) -> List[Dict]:
+    """Predict with one given package (the serving model, or a candidate being smoke-tested)."""
+    MODEL_BATCH_SIZE.observe(len(texts))
+    MODEL_PREDICTIONS.inc(len(texts), version=model_package['version'])
     
-    # Get prediction and probabilities
-    prediction = model.predict(tfidf)[0]
-    proba = model.predict_proba(tfidf)[0]
+    # Batches keep the shared transform - the scorer's gain is the per-call overhead it skips
+    scorer = model_package.get('scorer') if MODEL_FAST_PATH and len(texts) == 1 else None
+    if scorer is not None:
+        # Fast path: dot product with the coefficients, no CSR matrix or validation
+        probas = [scorer.predict_proba(text) for text in texts]
+        predictions = [scorer.classes[1] if real > fake else scorer.classes[0] for fake, real in probas]
+    else:
+        # Transform all texts to TF-IDF features at once, then one predict_proba pass -
+        # labels are the most probable class (what model.predict returns)
+        probas = model_package['model'].predict_proba(model_package['vectorizer'].transform(texts))
+        predictions = model_package['model'].classes_[probas.argmax(axis=1)]
     
-    # Format result
+    return [
+        _format_prediction(prediction, proba, model_package)
+        for prediction, proba in zip(predictions, probas)
+    ]
+
+
+def _format_prediction(prediction, proba, model_package: Dict) -> Dict:
+    """Format a single model output as the prediction result dict."""
     fake_conf = float(proba[0] * 100)
     real_conf = float(proba[1] * 100)
     
@@ -70,7 +237,8 @@ def _predict_sync(text: str) -> Dict:
             "real": round(real_conf, 2)
         },
         "source": "ML Model (Logistic Regression + TF-IDF)",
-        "model_accuracy": float(model_package.get('test_accuracy', 0.96))
+        "model_accuracy": float(model_package.get('test_accuracy') or 0.96),
+        "model_version": model_package.get('version')
     }
 
 
@@ -88,28 +256,103 @@ async def predict(text: str) -> Dict:
             - confidence: dict with fake and real percentages
             - source: Model identifier
             - model_accuracy: Model's test accuracy
+            - model_version: Model version that scored it
     """
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(_executor, _predict_sync, text)
-        return result
+        if MODEL_BATCH_WINDOW_MS <= 0:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(_executor, _predict_sync, text)
+        return await _micro_batcher.submit(text)
         
     except Exception as e:
-        print(f"⚠️ Model prediction error: {e}")
+        logger.warning(f"⚠️ Model prediction error: {e}")
         # Return neutral result on error
-        return {
-            "prediction": "Uncertain",
-            "label": -1,
-            "confidence": {"fake": 50.0, "real": 50.0},
-            "source": "ML Model (Error)",
-            "error": str(e)
-        }
-
-
-# Preload model on import (optional - for faster first prediction)
-try:
-    load_model()
-except Exception as e:
-    print(f"⚠️ Could not preload model: {e}")
-    print("   Model will be loaded on first prediction")
+        return _error_prediction(e)
+
+
+class _MicroBatcher:
+    """Collects concurrent predict() calls and runs them as one batch on the model executor"""
+    
+    def __init__(self, window: float, max_items: int):
+        self.window = window
+        self.max_items = max_items
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def submit(self, text: str) -> Dict:
+        """Queue one text; resolves with its prediction once its batch has run."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # First call on this event loop (e.g. a new asyncio.run) - nothing pending carries over
+            self._loop, self._pending, self._flush_handle = loop, [], None
+        
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush)
+        return await future
+    
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        
+        run = self._loop.run_in_executor(_executor, _predict_batch_sync, [text for text, _ in batch])
+        run.add_done_callback(lambda done: self._resolve(batch, done))
+    
+    @staticmethod
+    def _resolve(batch: List[Tuple[str, asyncio.Future]], done: asyncio.Future) -> None:
+        """Hand each caller its result (callers that gave up - timed out or cancelled - are skipped)."""
+        error = done.exception() if not done.cancelled() else asyncio.CancelledError()
+        results = done.result() if error is None else [None] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+_micro_batcher = _MicroBatcher(MODEL_BATCH_WINDOW_MS / 1000, MODEL_BATCH_MAX_ITEMS)
+
+
+async def predict_batch(texts: List[str]) -> List[Dict]:
+    """
+    Async batch prediction - a single vectorizer.transform over all texts.
+    
+    Args:
+        texts: News texts to verify
+        
+    Returns:
+        List of prediction dicts (same format as predict), in input order
+    """
+    if not texts:
+        return []
+    
+    try:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(_executor, _predict_batch_sync, texts)
+        
+    except Exception as e:
+        logger.warning(f"⚠️ Model batch prediction error: {e}")
+        return [_error_prediction(e) for _ in texts]
+
+
+def _error_prediction(error: Exception) -> Dict:
+    """Neutral result returned when prediction fails."""
+    return {
+        "prediction": "Uncertain",
+        "label": -1,
+        "confidence": {"fake": 50.0, "real": 50.0},
+        "source": "ML Model (Error)",
+        "error": str(error)
+    }
+
 
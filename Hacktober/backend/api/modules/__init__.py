@@ -1,55 +1,81 @@
 """
 Modules for Fake News Detection System
 Provides OCR, Reddit, Twitter, Fact Check, WhatsApp Share, and other verification services
+Submodules (and their third-party SDKs) are imported on first attribute access; call preload() to load them all up front
 """
 
-from .ocr_processor import process_image_to_text, ocr_processor
-from .reddit_service import search_reddit, reddit_searcher
-from .twitter_service import search_twitter, twitter_analyzer
-from .factcheck_service import search_factcheck, factcheck_searcher
-from .whatsapp_service import (
-    generate_whatsapp_share, 
-    create_whatsapp_share_from_result,
-    whatsapp_service
-)
-from .voice_service import (
-    transcribe_voice,
-    generate_voice,
-    process_voice_complete,
-    voice_processor
-)
-from .url_scraper_service import (
-    scrape_url_to_text,
-    extract_article_text,
-    url_scraper
-)
-from .newsapi_service import (
-    verify_news,
-    verify_news_sync,
-    search_news_api
-)
-
-__all__ = [
-    'process_image_to_text',
-    'ocr_processor',
-    'search_reddit',
-    'reddit_searcher',
-    'search_twitter',
-    'twitter_analyzer',
-    'search_factcheck',
-    'factcheck_searcher',
-    'generate_whatsapp_share',
-    'create_whatsapp_share_from_result',
-    'whatsapp_service',
-    'transcribe_voice',
-    'generate_voice',
-    'process_voice_complete',
-    'voice_processor',
-    'scrape_url_to_text',
-    'extract_article_text',
-    'url_scraper',
-    'verify_news',
-    'verify_news_sync',
-    'search_news_api'
-]
+import logging
+import importlib
 
+from ._lazy import loaded_singletons
+from ._hedge import hedged, hedge_stats, run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Exported name -> submodule that defines it
+_EXPORTS = {
+    'process_image_to_text': 'ocr_processor',
+    'ocr_processor': 'ocr_processor',
+    'search_reddit': 'reddit_service',
+    'reddit_searcher': 'reddit_service',
+    'search_twitter': 'twitter_service',
+    'twitter_analyzer': 'twitter_service',
+    'search_factcheck': 'factcheck_service',
+    'factcheck_searcher': 'factcheck_service',
+    'generate_whatsapp_share': 'whatsapp_service',
+    'create_whatsapp_share_from_result': 'whatsapp_service',
+    'whatsapp_service': 'whatsapp_service',
+    'transcribe_voice': 'voice_service',
+    'generate_voice': 'voice_service',
+    'process_voice_complete': 'voice_service',
+    'voice_processor': 'voice_service',
+    'scrape_url_to_text': 'url_scraper_service',
+    'extract_article_text': 'url_scraper_service',
+    'url_scraper': 'url_scraper_service',
+    'verify_news': 'newsapi_service',
+    'verify_news_sync': 'newsapi_service',
+    'search_news_api': 'newsapi_service'
+}
+
+__all__ = list(_EXPORTS) + ['preload', 'loaded_singletons', 'hedged', 'hedge_stats', 'run_blocking']
+
+
+def _load(submodule: str):
+    """Import a submodule, keeping exported names that shadow a submodule name bound to the export."""
+    module = importlib.import_module(f".{submodule}", __name__)
+    if submodule in _EXPORTS:
+        # Importing modules.ocr_processor binds the package attribute to the submodule itself
+        globals()[submodule] = getattr(module, submodule)
+    return module
+
+
+def __getattr__(name: str):
+    """Import the submodule that defines `name` on first access."""
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(_load(submodule), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
+
+def preload() -> None:
+    """
+    Import every submodule and build every service client (e.g. in a pre-fork master).
+    
+    A submodule that fails to load (e.g. a missing optional dependency) is logged and skipped,
+    so the others still load; its exports fail again, with the real error, on first use.
+    """
+    failed = set()
+    for name, submodule in _EXPORTS.items():
+        if submodule in failed:
+            continue
+        try:
+            __getattr__(name)
+        except Exception as e:
+            failed.add(submodule)
+            logger.warning(f"⚠️ Could not preload modules.{submodule} ({name}): {e!r}")
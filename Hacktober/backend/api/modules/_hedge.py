@@ -0,0 +1,176 @@
+"""
+Hedged Requests
+Races a backup call against a slow primary: the backup starts once the primary outlives its recent p90 latency
+(or straight away when the primary fails or comes back empty), and the first acceptable result wins
+"""
+
+import os
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict
+
+# Configuration
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"  # false: backup only after a failed primary
+HEDGE_QUANTILE = float(os.getenv("HEDGE_QUANTILE", "0.9"))  # primary latency quantile that triggers the backup
+HEDGE_WINDOW = int(os.getenv("HEDGE_WINDOW", "200"))  # recent primary latencies kept per call
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))  # fewer samples -> the call's default delay
+
+
+class LatencyTracker:
+    """Recent primary latencies of one hedged call, and how often its backup was used"""
+    
+    def __init__(self, default_delay: float):
+        self.default_delay = default_delay
+        self._samples = deque(maxlen=HEDGE_WINDOW)
+        self.calls = 0
+        self.hedged = 0  # backup started because the primary was slow
+        self.fallbacks = 0  # backup started because the primary failed or was empty
+        self.backup_wins = 0
+        self.abandoned = 0  # calls still in flight when the race ended (executor threads run on regardless)
+    
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+    
+    def delay(self) -> float:
+        """How long the primary gets before the backup starts (its recent p90)."""
+        if len(self._samples) < HEDGE_MIN_SAMPLES:
+            return self.default_delay
+        ordered = sorted(self._samples)
+        return ordered[min(int(HEDGE_QUANTILE * len(ordered)), len(ordered) - 1)]
+    
+    def stats(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "fallbacks": self.fallbacks,
+            "backup_wins": self.backup_wins,
+            "abandoned": self.abandoned,
+            "delay": round(self.delay(), 3)
+        }
+
+
+async def run_blocking(executor: Executor, fn: Callable, *args, slot=None) -> Any:
+    """
+    Run a blocking call on `executor`, optionally holding an upstream slot until its thread is done.
+    
+    Args:
+        executor: Thread pool to run on
+        fn: Blocking function, called with `args`
+        slot: Limiter (async acquire() / release()) taken before the call - released when the thread
+              returns, not when the caller gives up, so an abandoned hedge loser still counts against
+              the upstream's limit
+    """
+    if slot is not None:
+        await slot.acquire()
+    loop = asyncio.get_running_loop()
+    try:
+        future = executor.submit(fn, *args)
+    except BaseException:
+        if slot is not None:
+            slot.release()
+        raise
+    
+    if slot is not None:
+        def _release(_):
+            try:
+                loop.call_soon_threadsafe(slot.release)
+            except RuntimeError:  # event loop already closed (shutdown)
+                pass
+        future.add_done_callback(_release)  # also fires when a queued call is cancelled before it starts
+    return await asyncio.wrap_future(future)
+
+
+# Call name -> tracker (per process)
+_trackers: Dict[str, LatencyTracker] = {}
+
+
+def hedge_stats() -> Dict[str, Dict]:
+    """Counters and current hedge delay per hedged call."""
+    return {name: tracker.stats() for name, tracker in _trackers.items()}
+
+
+async def hedged(
+    name: str,
+    primary: Callable[[], Awaitable[Any]],
+    backup: Callable[[], Awaitable[Any]],
+    timeout: float,
+    default_delay: float,
+    accept: Callable[[Any], bool] = bool
+) -> Any:
+    """
+    Run `primary`, racing `backup` against it once it is slower than usual.
+    
+    Args:
+        name: Call name (latency history and stats are kept per name)
+        primary: Starts the preferred call (zero-argument coroutine function / future factory)
+        backup: Starts the alternative (only called when it is needed)
+        timeout: Max time in seconds for both together
+        default_delay: Hedge delay until enough primary latencies are known
+        accept: Whether a result is good enough to return (a call that raises never is)
+    
+    Returns:
+        The first accepted result; otherwise the last result returned (the last error is
+        re-raised when neither call returned). Raises asyncio.TimeoutError when nothing
+        was accepted within the timeout.
+    
+    Note:
+        The losing call's task is cancelled, which stops async I/O, but a blocking call already
+        running in an executor thread carries on to completion - counted as "abandoned". Start such
+        calls with run_blocking(slot=...) so they keep holding their upstream slot meanwhile.
+    """
+    tracker = _trackers.setdefault(name, LatencyTracker(default_delay))
+    tracker.calls += 1
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + timeout
+    hedge_at = started + tracker.delay() if HEDGE_ENABLED else deadline
+    
+    primary_task = asyncio.ensure_future(primary())
+    tasks = {primary_task: "primary"}
+    backup_task = None
+    result, error, returned = None, None, False
+    
+    try:
+        while tasks:
+            until = deadline if backup_task is not None else min(hedge_at, deadline)
+            done, _ = await asyncio.wait(
+                tasks.keys(), timeout=max(0.0, until - loop.time()), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                role = tasks.pop(task)
+                if role == "primary":
+                    tracker.observe(loop.time() - started)
+                try:
+                    outcome = task.result()
+                except Exception as e:
+                    error = e
+                    continue
+                result, returned = outcome, True
+                if accept(outcome):
+                    if role == "backup":
+                        tracker.backup_wins += 1
+                    return outcome
+            
+            if loop.time() >= deadline:
+                raise asyncio.TimeoutError()
+            if backup_task is None and (primary_task not in tasks or loop.time() >= hedge_at):
+                if primary_task in tasks:
+                    tracker.hedged += 1
+                else:
+                    tracker.fallbacks += 1
+                backup_task = asyncio.ensure_future(backup())
+                tasks[backup_task] = "backup"
+        
+        if returned or error is None:
+            return result
+        raise error
+    finally:
+        tracker.abandoned += len(tasks)
+        for task, role in tasks.items():
+            task.cancel()
+            if role == "primary":
+                # Censored sample - the primary took at least this long, which keeps the
+                # delay from drifting down just because slow primaries lose the race
+                tracker.observe(loop.time() - started)
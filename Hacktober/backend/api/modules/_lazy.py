@@ -0,0 +1,41 @@
+"""
+Lazy Singletons
+Service clients are built on first use instead of at import time
+Keeps imports cheap (fast cold start, tests that touch one module) while sharing one instance per process
+"""
+
+import threading
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Every lazy singleton, by name (for preload and metrics)
+_registry: Dict[str, "LazySingleton"] = {}
+
+
+class LazySingleton(Generic[T]):
+    """Thread-safe holder that calls its factory once, on first get()"""
+    
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+        _registry[name] = self
+    
+    def get(self) -> T:
+        """The instance, built on first call."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+    
+    @property
+    def loaded(self) -> bool:
+        return self._instance is not None
+
+
+def loaded_singletons() -> Dict[str, object]:
+    """Singletons built so far (name -> instance), without building the rest."""
+    return {name: lazy._instance for name, lazy in _registry.items() if lazy.loaded}
@@ -4,24 +4,38 @@ Searches Google Fact Check API and uses Gemini to select top 5 sources
 """
 
 import os
+import time
 import asyncio
 import json
+import logging
 from typing import Dict, List, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-    print("⚠️ Requests not installed: pip install requests")
+    logger.warning("⚠️ Requests not installed: pip install requests")
 
 try:
     import google.generativeai as genai
     GENAI_AVAILABLE = True
 except ImportError:
     GENAI_AVAILABLE = False
-    print("⚠️ Gemini not installed: pip install google-generativeai")
+    logger.warning("⚠️ Gemini not installed: pip install google-generativeai")
+
+# Base URL overrides (e.g. local stub servers for loadtest.py)
+FACTCHECK_BASE_URL = os.getenv("FACTCHECK_BASE_URL", "https://factchecktools.googleapis.com").rstrip("/")
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL")
+
+# Share of the timeout for each step (claim extraction, API search, Gemini ranking); unused time flows to later steps
+_STEP_SHARES = (0.3, 0.4, 0.3)
+_MIN_STEP_TIME = 0.5  # with less left, ranking is skipped (sources kept in API order)
 
 
 class GoogleFactCheckSearcher:
@@ -43,17 +57,21 @@ class GoogleFactCheckSearcher:
             return
         
         if not self.factcheck_api_key or not gemini_key:
-            print("⚠️ Fact Check API credentials not found")
+            logger.warning("⚠️ Fact Check API credentials not found")
             self.available = False
             return
         
         try:
-            genai.configure(api_key=gemini_key)
+            if GEMINI_BASE_URL:
+                genai.configure(api_key=gemini_key, transport="rest",
+                                client_options={"api_endpoint": GEMINI_BASE_URL})
+            else:
+                genai.configure(api_key=gemini_key)
             self.gemini_model = genai.GenerativeModel('gemini-2.0-flash-exp')
             self.executor = ThreadPoolExecutor(max_workers=2)
             self.available = True
         except Exception as e:
-            print(f"⚠️ Fact Check initialization failed: {e}")
+            logger.warning(f"⚠️ Fact Check initialization failed: {e}")
             self.available = False
     
     def _extract_claims_sync(self, text: str) -> List[str]:
@@ -82,16 +100,22 @@ Example: ["Claim 1", "Claim 2", "Claim 3"]
             return claims[:5]  # Max 5 claims
             
         except Exception as e:
-            print(f"⚠️ Claim extraction failed: {e}")
+            logger.warning(f"⚠️ Claim extraction failed: {e}")
             # Fallback: use first 200 chars as claim
             return [text[:200]]
     
-    def _search_factcheck_api_sync(self, claims: List[str]) -> List[Dict[str, Any]]:
-        """Search Google Fact Check API"""
-        base_url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+    def _search_factcheck_api_sync(self, claims: List[str], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Search Google Fact Check API (claims left when the time.monotonic() deadline passes are skipped)"""
+        base_url = f"{FACTCHECK_BASE_URL}/v1alpha1/claims:search"
         all_results = []
         
         for claim in claims:
+            request_timeout = 5
+            if deadline is not None:
+                request_timeout = min(request_timeout, deadline - time.monotonic())
+                if request_timeout <= 0:
+                    break
+            
             try:
                 params = {
                     'query': claim,
@@ -99,7 +123,7 @@ Example: ["Claim 1", "Claim 2", "Claim 3"]
                     'key': self.factcheck_api_key
                 }
                 
-                response = requests.get(base_url, params=params, timeout=5)
+                response = requests.get(base_url, params=params, timeout=request_timeout)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -121,7 +145,7 @@ Example: ["Claim 1", "Claim 2", "Claim 3"]
                                     all_results.append(result)
             
             except Exception as e:
-                print(f"⚠️ Fact Check API error: {e}")
+                logger.warning(f"⚠️ Fact Check API error: {e}")
                 continue
         
         # Remove duplicates
@@ -189,31 +213,36 @@ Return ONLY valid JSON:
             return result
             
         except Exception as e:
-            print(f"⚠️ Gemini selection failed: {e}")
-            # Fallback: return first 5
-            return {
-                "overall_explanation": "Analysis based on available fact-check sources",
-                "top_5_sources": [
-                    {
-                        "rank": i+1,
-                        "url": src['url'],
-                        "title": src['title'],
-                        "publisher": src['publisher'],
-                        "rating": src['rating'],
-                        "relevance": "medium",
-                        "explanation": f"Fact-check source from {src['publisher']}"
-                    }
-                    for i, src in enumerate(sources[:5])
-                ]
-            }
+            logger.warning(f"⚠️ Gemini selection failed: {e}")
+            return self._first_5(sources)
     
-    async def verify_with_factcheck(self, text: str, timeout: int = 8) -> Dict[str, Any]:
+    def _first_5(self, sources: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fallback selection: the first 5 sources in API order"""
+        return {
+            "overall_explanation": "Analysis based on available fact-check sources",
+            "top_5_sources": [
+                {
+                    "rank": i+1,
+                    "url": src['url'],
+                    "title": src['title'],
+                    "publisher": src['publisher'],
+                    "rating": src['rating'],
+                    "relevance": "medium",
+                    "explanation": f"Fact-check source from {src['publisher']}"
+                }
+                for i, src in enumerate(sources[:5])
+            ]
+        }
+    
+    async def verify_with_factcheck(self, text: str, timeout: float = 8) -> Dict[str, Any]:
         """
         Async fact check verification
         
+        The three steps share one deadline, so together they never take longer than timeout.
+        
         Args:
             text: News article text
-            timeout: Max time in seconds
+            timeout: Max time in seconds (all steps)
             
         Returns:
             Dict with verification results
@@ -227,11 +256,13 @@ Return ONLY valid JSON:
         
         try:
             loop = asyncio.get_event_loop()
+            deadline = time.monotonic() + timeout
+            extract_share, search_share, select_share = _STEP_SHARES
             
             # Step 1: Extract claims
             claims = await asyncio.wait_for(
                 loop.run_in_executor(self.executor, self._extract_claims_sync, text),
-                timeout=timeout/3
+                timeout=timeout * extract_share
             )
             
             if not claims:
@@ -243,10 +274,11 @@ Return ONLY valid JSON:
                     "explanation": "No verifiable claims found"
                 }
             
-            # Step 2: Search Fact Check API
+            # Step 2: Search Fact Check API (keeping the ranking step's share in reserve)
+            search_deadline = deadline - timeout * select_share
             sources = await asyncio.wait_for(
-                loop.run_in_executor(self.executor, self._search_factcheck_api_sync, claims),
-                timeout=timeout/2
+                loop.run_in_executor(self.executor, self._search_factcheck_api_sync, claims, search_deadline),
+                timeout=max(0.0, search_deadline - time.monotonic())
             )
             
             if not sources:
@@ -258,11 +290,18 @@ Return ONLY valid JSON:
                     "explanation": "No fact-check sources found"
                 }
             
-            # Step 3: Select top 5 with Gemini
-            result = await asyncio.wait_for(
-                loop.run_in_executor(self.executor, self._select_top_5_sync, sources, text),
-                timeout=timeout/3
-            )
+            # Step 3: Select top 5 with Gemini, with whatever time is left (API order if it runs out)
+            remaining = deadline - time.monotonic()
+            if remaining < _MIN_STEP_TIME:
+                result = self._first_5(sources)
+            else:
+                try:
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(self.executor, self._select_top_5_sync, sources, text),
+                        timeout=remaining
+                    )
+                except asyncio.TimeoutError:
+                    result = self._first_5(sources)
             
             return {
                 "source": "factcheck",
@@ -273,7 +312,7 @@ Return ONLY valid JSON:
             }
             
         except asyncio.TimeoutError:
-            print("⚠️ Fact Check timeout")
+            logger.warning("⚠️ Fact Check timeout")
             return {
                 "source": "factcheck",
                 "available": True,
@@ -282,7 +321,7 @@ Return ONLY valid JSON:
                 "explanation": "Verification timeout"
             }
         except Exception as e:
-            print(f"⚠️ Fact Check error: {e}")
+            logger.warning(f"⚠️ Fact Check error: {e}")
             return {
                 "source": "factcheck",
                 "available": True,
@@ -292,11 +331,23 @@ Return ONLY valid JSON:
             }
 
 
-# Singleton instance
-factcheck_searcher = GoogleFactCheckSearcher()
+# Singleton instance (client built on first use)
+_factcheck_searcher = LazySingleton("factcheck_searcher", GoogleFactCheckSearcher)
+
+
+def get_factcheck_searcher() -> GoogleFactCheckSearcher:
+    """Shared GoogleFactCheckSearcher, built on first call."""
+    return _factcheck_searcher.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `factcheck_searcher` resolves to the lazily built singleton."""
+    if attr == "factcheck_searcher":
+        return get_factcheck_searcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
-async def search_factcheck(text: str, timeout: int = 8) -> Dict[str, Any]:
+async def search_factcheck(text: str, timeout: float = 8) -> Dict[str, Any]:
     """
     Simple function to search Google Fact Check
     
@@ -307,5 +358,5 @@ async def search_factcheck(text: str, timeout: int = 8) -> Dict[str, Any]:
     Returns:
         Dict with fact-check results
     """
-    return await factcheck_searcher.verify_with_factcheck(text, timeout)
+    return await get_factcheck_searcher().verify_with_factcheck(text, timeout)
 
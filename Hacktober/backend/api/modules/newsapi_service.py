@@ -6,17 +6,23 @@ Designed for async integration with the main verification pipeline.
 
 import os
 import asyncio
+import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import aiohttp
 from dotenv import load_dotenv
 
+from ._hedge import hedged
+
 # Load environment variables
 load_dotenv()
 
 # Configuration
 NEWS_API_KEY = os.getenv("NEWS_API_KEY")
-NEWS_API_BASE_URL = "https://newsapi.org/v2/everything"
+NEWS_API_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org").rstrip("/") + "/v2/everything"
+NEWS_API_HEDGE_DELAY = 3.0  # second query form starts after this until the first one's p90 is known
+
+logger = logging.getLogger(__name__)
 
 # Trusted news sources for credibility scoring
 TRUSTED_SOURCES = [
@@ -36,10 +42,18 @@ def extract_keywords(text: str, max_keywords: int = 5) -> str:
     return ' '.join(keywords[:max_keywords])
 
 
+def extract_headline_query(text: str, max_keywords: int = 3) -> str:
+    """Broader second query form: the leading keywords as a phrase OR'ed with the rest."""
+    keywords = extract_keywords(text, max_keywords + 2).split()
+    if len(keywords) <= max_keywords:
+        return ' OR '.join(keywords)
+    return f'"{" ".join(keywords[:max_keywords])}" OR ' + ' OR '.join(keywords[max_keywords:])
+
+
 async def search_news_api(
     query: str,
     max_results: int = 10,
-    timeout: int = 8
+    timeout: float = 8
 ) -> List[Dict]:
     """
     Search News API for articles related to the query.
@@ -53,7 +67,7 @@ async def search_news_api(
         List of articles with title, url, source, and published date
     """
     if not NEWS_API_KEY:
-        print("⚠️ NEWS_API_KEY not configured")
+        logger.warning("⚠️ NEWS_API_KEY not configured")
         return []
     
     try:
@@ -75,7 +89,7 @@ async def search_news_api(
                 timeout=aiohttp.ClientTimeout(total=timeout)
             ) as response:
                 if response.status != 200:
-                    print(f"⚠️ News API error: {response.status}")
+                    logger.warning(f"⚠️ News API error: {response.status}")
                     return []
                 
                 data = await response.json()
@@ -92,14 +106,14 @@ async def search_news_api(
                         })
                     return articles
                 else:
-                    print(f"News API error: {data.get('message', 'Unknown')}")
+                    logger.warning(f"⚠️ News API error: {data.get('message', 'Unknown')}")
                     return []
                     
     except asyncio.TimeoutError:
-        print(f"⚠️ News API timeout after {timeout}s")
+        logger.warning(f"⚠️ News API timeout after {timeout}s")
         return []
     except Exception as e:
-        print(f"⚠️ News API error: {e}")
+        logger.warning(f"⚠️ News API error: {e}")
         return []
 
 
@@ -242,13 +256,23 @@ def calculate_credibility(articles: List[Dict], original_text: str) -> Dict:
     }
 
 
-async def verify_news(text: str, timeout: int = 8) -> Dict:
+async def _with_slot(slot, search):
+    """Await `search()` while holding `slot` (an async context manager limiter), if given."""
+    if slot is None:
+        return await search()
+    async with slot:
+        return await search()
+
+
+async def verify_news(text: str, timeout: float = 8, slots: Tuple = (None, None)) -> Dict:
     """
     Main verification function - async version for pipeline integration.
     
     Args:
         text: Text to verify
         timeout: Request timeout in seconds (default 8s for 15-25s total pipeline)
+        slots: (keyword search, headline search) upstream limiters - each search holds its own
+               slot, released as soon as it finishes or loses the race (aiohttp calls do stop)
     
     Returns:
         Dict with:
@@ -259,8 +283,22 @@ async def verify_news(text: str, timeout: int = 8) -> Dict:
     # Extract keywords for better search
     search_query = extract_keywords(text)
     
-    # Search News API (with timeout)
-    articles = await search_news_api(search_query, max_results=10, timeout=timeout)
+    # Search News API (with timeout), hedged with the broader query form when the
+    # keyword search is slow or finds nothing
+    try:
+        keyword_slot, headline_slot = slots
+        articles = await hedged(
+            "newsapi",
+            lambda: _with_slot(keyword_slot, lambda: search_news_api(search_query, max_results=10, timeout=timeout)),
+            lambda: _with_slot(headline_slot, lambda: search_news_api(
+                extract_headline_query(text), max_results=10, timeout=timeout
+            )),
+            timeout,
+            default_delay=NEWS_API_HEDGE_DELAY
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"⚠️ News API timeout after {timeout}s")
+        articles = []
     
     if not articles:
         return {
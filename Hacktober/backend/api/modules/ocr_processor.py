@@ -7,8 +7,13 @@ import sys
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 import asyncio
+import logging
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
 try:
     import pytesseract
     from PIL import Image, ImageEnhance, ImageFilter
@@ -25,7 +30,7 @@ try:
                 pytesseract.pytesseract.tesseract_cmd = path
                 break
 except ImportError:
-    print("⚠️ OCR dependencies not installed: pip install pytesseract Pillow")
+    logger.warning("⚠️ OCR dependencies not installed: pip install pytesseract Pillow")
 
 
 class OCRProcessor:
@@ -137,8 +142,20 @@ class OCRProcessor:
             }
 
 
-# Singleton instance for reuse
-ocr_processor = OCRProcessor()
+# Singleton instance (client built on first use)
+_ocr_processor = LazySingleton("ocr_processor", OCRProcessor)
+
+
+def get_ocr_processor() -> OCRProcessor:
+    """Shared OCRProcessor, built on first call."""
+    return _ocr_processor.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `ocr_processor` resolves to the lazily built singleton."""
+    if attr == "ocr_processor":
+        return get_ocr_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
 async def process_image_to_text(image_path_or_bytes) -> str:
@@ -152,9 +169,9 @@ async def process_image_to_text(image_path_or_bytes) -> str:
         Extracted text string (empty if failed)
     """
     if isinstance(image_path_or_bytes, bytes):
-        result = await ocr_processor.extract_text_from_bytes(image_path_or_bytes)
+        result = await get_ocr_processor().extract_text_from_bytes(image_path_or_bytes)
     else:
-        result = await ocr_processor.extract_text_from_image(Path(image_path_or_bytes))
+        result = await get_ocr_processor().extract_text_from_image(Path(image_path_or_bytes))
     
     return result.get("text", "") if result.get("success") else ""
 
@@ -5,16 +5,24 @@ Searches Reddit for relevant news articles and discussions
 
 import os
 import asyncio
+import logging
 from typing import List, Dict, Any
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
 try:
     import praw
     PRAW_AVAILABLE = True
 except ImportError:
     PRAW_AVAILABLE = False
-    print("⚠️ Reddit dependencies not installed: pip install praw")
+    logger.warning("⚠️ Reddit dependencies not installed: pip install praw")
+
+# Base URL override for both the OAuth token and API hosts (e.g. a local stub server for loadtest.py)
+REDDIT_BASE_URL = os.getenv("REDDIT_BASE_URL")
 
 
 class RedditNewsSearcher:
@@ -36,19 +44,21 @@ class RedditNewsSearcher:
         client_secret = client_secret or os.getenv('REDDIT_CLIENT_SECRET')
         
         if not client_id or not client_secret:
-            print("⚠️ Reddit API credentials not found")
+            logger.warning("⚠️ Reddit API credentials not found")
             self.reddit = None
             return
         
         try:
+            urls = {"reddit_url": REDDIT_BASE_URL, "oauth_url": REDDIT_BASE_URL} if REDDIT_BASE_URL else {}
             self.reddit = praw.Reddit(
                 client_id=client_id,
                 client_secret=client_secret,
-                user_agent="python:NewsDetectorBot:v1.0 (by /u/newsbot)"
+                user_agent="python:NewsDetectorBot:v1.0 (by /u/newsbot)",
+                **urls
             )
             self.executor = ThreadPoolExecutor(max_workers=2)
         except Exception as e:
-            print(f"⚠️ Reddit initialization failed: {e}")
+            logger.warning(f"⚠️ Reddit initialization failed: {e}")
             self.reddit = None
     
     def _extract_keywords(self, text: str) -> List[str]:
@@ -96,7 +106,7 @@ class RedditNewsSearcher:
                         'author': str(submission.author) if submission.author else '[deleted]'
                     })
             except Exception as e:
-                print(f"⚠️ Reddit subreddit error ({subreddit_name}): {e}")
+                logger.warning(f"⚠️ Reddit subreddit error ({subreddit_name}): {e}")
                 continue
         
         # Sort by engagement
@@ -104,7 +114,7 @@ class RedditNewsSearcher:
         return results[:limit]
     
     async def search_reddit_news(self, text: str, label: int = None, limit: int = 5, 
-                                 timeout: int = 8) -> List[Dict[str, Any]]:
+                                 timeout: float = 8) -> List[Dict[str, Any]]:
         """
         Async Reddit search with timeout
         
@@ -132,18 +142,30 @@ class RedditNewsSearcher:
             )
             return results
         except asyncio.TimeoutError:
-            print("⚠️ Reddit search timeout")
+            logger.warning("⚠️ Reddit search timeout")
             return []
         except Exception as e:
-            print(f"⚠️ Reddit search error: {e}")
+            logger.warning(f"⚠️ Reddit search error: {e}")
             return []
 
 
-# Singleton instance
-reddit_searcher = RedditNewsSearcher()
+# Singleton instance (client built on first use)
+_reddit_searcher = LazySingleton("reddit_searcher", RedditNewsSearcher)
+
+
+def get_reddit_searcher() -> RedditNewsSearcher:
+    """Shared RedditNewsSearcher, built on first call."""
+    return _reddit_searcher.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `reddit_searcher` resolves to the lazily built singleton."""
+    if attr == "reddit_searcher":
+        return get_reddit_searcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
-async def search_reddit(text: str, label: int = None, limit: int = 5) -> Dict[str, Any]:
+async def search_reddit(text: str, label: int = None, limit: int = 5, timeout: float = 8) -> Dict[str, Any]:
     """
     Simple function to search Reddit
     
@@ -151,11 +173,12 @@ async def search_reddit(text: str, label: int = None, limit: int = 5) -> Dict[st
         text: News text
         label: 1=real, 0=fake
         limit: Max results
+        timeout: Max time in seconds
         
     Returns:
         Dict with results and metadata
     """
-    results = await reddit_searcher.search_reddit_news(text, label, limit)
+    results = await get_reddit_searcher().search_reddit_news(text, label, limit, timeout)
     
     return {
         "source": "reddit",
@@ -5,22 +5,35 @@ Searches Twitter/X with fallback to web scraping
 
 import os
 import asyncio
-from typing import List, Dict, Any, Optional
+import logging
+from typing import List, Dict, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+from ._hedge import hedged, run_blocking
+
+logger = logging.getLogger(__name__)
+
 try:
     import tweepy
     TWEEPY_AVAILABLE = True
 except ImportError:
     TWEEPY_AVAILABLE = False
-    print("⚠️ Twitter dependencies not installed: pip install tweepy")
+    logger.warning("⚠️ Twitter dependencies not installed: pip install tweepy")
 
 try:
     from tavily import TavilyClient
     TAVILY_AVAILABLE = True
 except ImportError:
     TAVILY_AVAILABLE = False
-    print("⚠️ Tavily not installed (web scraping fallback disabled): pip install tavily-python")
+    logger.warning("⚠️ Tavily not installed (web scraping fallback disabled): pip install tavily-python")
+
+# Base URL overrides (e.g. local stub servers for loadtest.py)
+TWITTER_BASE_URL = os.getenv("TWITTER_BASE_URL")
+TAVILY_BASE_URL = os.getenv("TAVILY_BASE_URL")
+
+# Tavily starts once Twitter is slower than its recent p90 (this until enough calls are seen)
+TWITTER_HEDGE_DELAY = 3.0
 
 
 # Trusted Indian news domains
@@ -52,6 +65,18 @@ def is_valid_article_url(url: str) -> bool:
     return any(indicator in url_lower for indicator in valid)
 
 
+def _redirect_session(session, origin: str, base_url: str) -> None:
+    """Send a requests session's calls for `origin` to `base_url` (tweepy hard-codes its API host)."""
+    from requests.adapters import HTTPAdapter
+    
+    class _RedirectAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            request.url = base_url.rstrip("/") + request.url[len(origin):]
+            return super().send(request, **kwargs)
+    
+    session.mount(origin, _RedirectAdapter())
+
+
 class TwitterNewsAnalyzer:
     """Twitter/X news verification with web scraping fallback"""
     
@@ -64,6 +89,9 @@ class TwitterNewsAnalyzer:
         Args:
             Credentials from environment or parameters
         """
+        # Twitter and the Tavily fallback may run at the same time (hedged search)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        
         if not TWEEPY_AVAILABLE:
             self.client = None
             return
@@ -76,7 +104,7 @@ class TwitterNewsAnalyzer:
         access_token_secret = access_token_secret or os.getenv('TWITTER_ACCESS_TOKEN_SECRET')
         
         if not bearer_token:
-            print("⚠️ Twitter API credentials not found")
+            logger.warning("⚠️ Twitter API credentials not found")
             self.client = None
             return
         
@@ -89,9 +117,10 @@ class TwitterNewsAnalyzer:
                 access_token_secret=access_token_secret,
                 wait_on_rate_limit=False
             )
-            self.executor = ThreadPoolExecutor(max_workers=2)
+            if TWITTER_BASE_URL:
+                _redirect_session(self.client.session, "https://api.twitter.com", TWITTER_BASE_URL)
         except Exception as e:
-            print(f"⚠️ Twitter initialization failed: {e}")
+            logger.warning(f"⚠️ Twitter initialization failed: {e}")
             self.client = None
     
     def _search_tweets_sync(self, query: str, label: Optional[int] = None) -> List[Dict]:
@@ -139,7 +168,7 @@ class TwitterNewsAnalyzer:
         except tweepy.errors.TooManyRequests:
             return "RATE_LIMIT"
         except Exception as e:
-            print(f"⚠️ Twitter search error: {e}")
+            logger.warning(f"⚠️ Twitter search error: {e}")
             return []
     
     def _web_scraping_fallback(self, query: str, label: Optional[int] = None) -> List[Dict]:
@@ -153,6 +182,8 @@ class TwitterNewsAnalyzer:
         
         try:
             client = TavilyClient(api_key=tavily_api_key)
+            if TAVILY_BASE_URL:
+                client.base_url = TAVILY_BASE_URL.rstrip("/")
             
             # Build query
             if label == 1:
@@ -195,57 +226,69 @@ class TwitterNewsAnalyzer:
             return results
             
         except Exception as e:
-            print(f"⚠️ Web scraping error: {e}")
+            logger.warning(f"⚠️ Web scraping error: {e}")
             return []
     
     async def search_twitter_news(self, query: str, label: Optional[int] = None, 
-                                  timeout: int = 8) -> List[Dict[str, Any]]:
+                                  timeout: float = 8, slots: Tuple = (None, None)) -> List[Dict[str, Any]]:
         """
-        Async Twitter search with timeout and fallback
+        Async Twitter search with timeout and hedged fallback
+        
+        Tavily starts as soon as Twitter fails or finds nothing, or once Twitter
+        is slower than its recent p90 latency - whichever search returns results first wins.
         
         Args:
             query: Search query
             label: 1=real, 0=fake, None=neutral
-            timeout: Max time in seconds
+            timeout: Max time in seconds (Twitter API and fallback together)
+            slots: (Twitter, Tavily) upstream limiters; each search holds its own slot until its
+                   thread finishes, including a losing search that keeps running in the background
             
         Returns:
             List of tweets/articles
         """
+        twitter_slot, tavily_slot = slots
+        
+        def _twitter():
+            return run_blocking(self.executor, self._search_tweets_sync, query, label, slot=twitter_slot)
+        
+        def _tavily():
+            return run_blocking(self.executor, self._web_scraping_fallback, query, label, slot=tavily_slot)
+        
         try:
-            # Try Twitter API first
-            loop = asyncio.get_event_loop()
-            results = await asyncio.wait_for(
-                loop.run_in_executor(
-                    self.executor,
-                    self._search_tweets_sync,
-                    query, label
-                ),
-                timeout=timeout
+            results = await hedged(
+                "twitter", _twitter, _tavily, timeout,
+                default_delay=TWITTER_HEDGE_DELAY,
+                accept=lambda found: isinstance(found, list) and len(found) > 0
             )
-            
-            # Handle fallback cases
-            if results in ["RATE_LIMIT", "NO_RESULTS", "NO_API"]:
-                results = await loop.run_in_executor(
-                    self.executor,
-                    self._web_scraping_fallback,
-                    query, label
-                )
-            
             return results if isinstance(results, list) else []
             
         except asyncio.TimeoutError:
-            print("⚠️ Twitter search timeout")
+            logger.warning("⚠️ Twitter search timeout")
             return []
         except Exception as e:
-            print(f"⚠️ Twitter search error: {e}")
+            logger.warning(f"⚠️ Twitter search error: {e}")
             return []
 
 
-# Singleton instance
-twitter_analyzer = TwitterNewsAnalyzer()
+# Singleton instance (client built on first use)
+_twitter_analyzer = LazySingleton("twitter_analyzer", TwitterNewsAnalyzer)
+
+
+def get_twitter_analyzer() -> TwitterNewsAnalyzer:
+    """Shared TwitterNewsAnalyzer, built on first call."""
+    return _twitter_analyzer.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `twitter_analyzer` resolves to the lazily built singleton."""
+    if attr == "twitter_analyzer":
+        return get_twitter_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
-async def search_twitter(text: str, label: int = None, limit: int = 5) -> Dict[str, Any]:
+async def search_twitter(text: str, label: int = None, limit: int = 5, timeout: float = 8,
+                         slots: Tuple = (None, None)) -> Dict[str, Any]:
     """
     Simple function to search Twitter
     
@@ -253,11 +296,12 @@ async def search_twitter(text: str, label: int = None, limit: int = 5) -> Dict[s
         text: News text
         label: 1=real, 0=fake
         limit: Max results
+        timeout: Max time in seconds
         
     Returns:
         Dict with results and metadata
     """
-    results = await twitter_analyzer.search_twitter_news(text, label)
+    results = await get_twitter_analyzer().search_twitter_news(text, label, timeout=timeout, slots=slots)
     
     return {
         "source": "twitter",
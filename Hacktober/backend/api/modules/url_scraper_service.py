@@ -10,29 +10,30 @@ import logging
 from typing import Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
 try:
     import requests
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
-    print("⚠️ Requests not installed: pip install requests")
+    logger.warning("⚠️ Requests not installed: pip install requests")
 
 try:
     from bs4 import BeautifulSoup
     BS4_AVAILABLE = True
 except ImportError:
     BS4_AVAILABLE = False
-    print("⚠️ BeautifulSoup not installed: pip install beautifulsoup4")
+    logger.warning("⚠️ BeautifulSoup not installed: pip install beautifulsoup4")
 
 try:
     from boilerpy3 import extractors
     BOILERPY3_AVAILABLE = True
 except ImportError:
     BOILERPY3_AVAILABLE = False
-    print("⚠️ Boilerpy3 not installed (optional): pip install boilerpy3")
-
-
-logger = logging.getLogger(__name__)
+    logger.warning("⚠️ Boilerpy3 not installed (optional): pip install boilerpy3")
 
 
 class URLScraper:
@@ -240,8 +241,20 @@ class URLScraper:
             }
 
 
-# Singleton instance
-url_scraper = URLScraper()
+# Singleton instance (client built on first use)
+_url_scraper = LazySingleton("url_scraper", URLScraper)
+
+
+def get_url_scraper() -> URLScraper:
+    """Shared URLScraper, built on first call."""
+    return _url_scraper.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `url_scraper` resolves to the lazily built singleton."""
+    if attr == "url_scraper":
+        return get_url_scraper()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
 async def scrape_url_to_text(url: str, timeout: int = 10) -> Dict[str, Any]:
@@ -255,7 +268,7 @@ async def scrape_url_to_text(url: str, timeout: int = 10) -> Dict[str, Any]:
     Returns:
         Dict with success, text, error
     """
-    return await url_scraper.scrape_url(url, timeout)
+    return await get_url_scraper().scrape_url(url, timeout)
 
 
 async def extract_article_text(url: str) -> str:
@@ -11,22 +11,26 @@ import logging
 from typing import Dict, Any, Tuple, Optional
 from concurrent.futures import ThreadPoolExecutor
 
+from ._lazy import LazySingleton
+
+logger = logging.getLogger(__name__)
+
 try:
     from elevenlabs.client import ElevenLabs
     ELEVENLABS_AVAILABLE = True
 except ImportError:
     ELEVENLABS_AVAILABLE = False
-    print("⚠️ ElevenLabs not installed: pip install elevenlabs")
+    logger.warning("⚠️ ElevenLabs not installed: pip install elevenlabs")
 
 try:
     from langdetect import detect as lang_detect
     LANGDETECT_AVAILABLE = True
 except ImportError:
     LANGDETECT_AVAILABLE = False
-    print("⚠️ langdetect not installed (optional): pip install langdetect")
+    logger.warning("⚠️ langdetect not installed (optional): pip install langdetect")
 
-
-logger = logging.getLogger(__name__)
+# Base URL override (e.g. a local stub server for loadtest.py)
+ELEVENLABS_BASE_URL = os.getenv("ELEVENLABS_BASE_URL")
 
 
 class VoiceProcessor:
@@ -48,16 +52,19 @@ class VoiceProcessor:
         self.voice_id = voice_id or os.getenv('ELEVENLABS_TTS_VOICE_ID', 'EXAVITQu4vr4xnSDxMaL')  # Default voice
         
         if not self.api_key:
-            print("⚠️ ElevenLabs API key not found")
+            logger.warning("⚠️ ElevenLabs API key not found")
             self.available = False
             return
         
         try:
-            self.client = ElevenLabs(api_key=self.api_key)
+            if ELEVENLABS_BASE_URL:
+                self.client = ElevenLabs(api_key=self.api_key, base_url=ELEVENLABS_BASE_URL)
+            else:
+                self.client = ElevenLabs(api_key=self.api_key)
             self.executor = ThreadPoolExecutor(max_workers=2)
             self.available = True
         except Exception as e:
-            print(f"⚠️ ElevenLabs initialization failed: {e}")
+            logger.warning(f"⚠️ ElevenLabs initialization failed: {e}")
             self.available = False
     
     def _detect_language(self, text: str) -> str:
@@ -137,7 +144,7 @@ class VoiceProcessor:
             logger.error(f"TTS error: {e}")
             return b""
     
-    async def speech_to_text(self, audio_bytes: bytes, timeout: int = 10) -> Dict[str, Any]:
+    async def speech_to_text(self, audio_bytes: bytes, timeout: float = 10) -> Dict[str, Any]:
         """
         Convert speech to text (async)
         
@@ -194,7 +201,7 @@ class VoiceProcessor:
             }
     
     async def text_to_speech(self, text: str, language: str = "en", 
-                            timeout: int = 10) -> Dict[str, Any]:
+                            timeout: float = 10) -> Dict[str, Any]:
         """
         Convert text to speech (async)
         
@@ -265,35 +272,49 @@ class VoiceProcessor:
         return stt_result
 
 
-# Singleton instance
-voice_processor = VoiceProcessor()
+# Singleton instance (client built on first use)
+_voice_processor = LazySingleton("voice_processor", VoiceProcessor)
+
+
+def get_voice_processor() -> VoiceProcessor:
+    """Shared VoiceProcessor, built on first call."""
+    return _voice_processor.get()
+
+
+def __getattr__(attr: str):
+    """Module attribute `voice_processor` resolves to the lazily built singleton."""
+    if attr == "voice_processor":
+        return get_voice_processor()
+    raise AttributeError(f"module {__name__!r} has no attribute {attr!r}")
 
 
-async def transcribe_voice(audio_bytes: bytes) -> Dict[str, Any]:
+async def transcribe_voice(audio_bytes: bytes, timeout: float = 10) -> Dict[str, Any]:
     """
     Simple function to transcribe voice to text
     
     Args:
         audio_bytes: Audio file bytes
+        timeout: Max time in seconds
         
     Returns:
         Dict with text, language, success
     """
-    return await voice_processor.speech_to_text(audio_bytes)
+    return await get_voice_processor().speech_to_text(audio_bytes, timeout)
 
 
-async def generate_voice(text: str, language: str = "en") -> Dict[str, Any]:
+async def generate_voice(text: str, language: str = "en", timeout: float = 10) -> Dict[str, Any]:
     """
     Simple function to generate voice from text
     
     Args:
         text: Text to speak
         language: Language code
+        timeout: Max time in seconds
         
     Returns:
         Dict with audio_base64, success
     """
-    return await voice_processor.text_to_speech(text, language)
+    return await get_voice_processor().text_to_speech(text, language, timeout)
 
 
 async def process_voice_complete(audio_bytes: bytes, verification_result: Dict[str, Any]) -> Dict[str, Any]:
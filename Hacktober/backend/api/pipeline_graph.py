@@ -0,0 +1,120 @@
+"""
+Pipeline Graph
+Runs pipeline stages as a dependency graph: each stage starts the moment its declared inputs are ready
+Results are yielded in completion order, with per-stage start offsets and durations
+"""
+
+import time
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Stage:
+    """One pipeline step: fn(**inputs) -> result, where inputs are seeds or other stages' results"""
+    
+    def __init__(self, name: str, fn: Callable[..., Awaitable[Any]], inputs: Sequence[str] = ()):
+        """
+        Initialize the stage
+        
+        Args:
+            name: Stage name (the key its result is passed to later stages under)
+            fn: Coroutine function called with one keyword argument per input
+            inputs: Names of the seeds / stages this stage needs
+        """
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+
+
+class PipelineGraph:
+    """Set of stages validated as a DAG over a fixed set of seed values"""
+    
+    def __init__(self, stages: List[Stage], seeds: Sequence[str] = ()):
+        """
+        Initialize the graph (raises ValueError for duplicate names, unknown inputs or cycles)
+        
+        Args:
+            stages: Pipeline stages, in any order
+            seeds: Names of the values supplied to run() (e.g. "text")
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.seeds = tuple(seeds)
+        if len(self.stages) != len(stages):
+            raise ValueError("Duplicate stage names")
+        
+        # Resolve stages in dependency order; anything left over has a missing input or a cycle
+        available = set(self.seeds)
+        remaining = dict(self.stages)
+        self.order: List[str] = []
+        while remaining:
+            ready = [name for name, stage in remaining.items() if set(stage.inputs) <= available]
+            if not ready:
+                raise ValueError(f"Stages with unknown or cyclic inputs: {', '.join(sorted(remaining))}")
+            for name in ready:
+                available.add(name)
+                self.order.append(name)
+                del remaining[name]
+    
+    async def run(self, seeds: Dict[str, Any], timings: Optional[Dict[str, Dict]] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run every stage, yielding (stage name, result) as each one finishes.
+        
+        A stage that raises stops the run (remaining stages are cancelled) and the
+        exception propagates to the caller - the first failed stage's, in graph order,
+        when several finish together; stages that must not fail the request should
+        return an error result instead. Stopping iteration early cancels whatever is
+        still running. Cancelled stages are awaited before the run returns.
+        
+        Args:
+            seeds: Value for each seed name
+            timings: Optional dict filled with {stage: {"start": s, "duration": s}} (start relative to the run)
+        """
+        missing = set(self.seeds) - set(seeds)
+        if missing:
+            raise ValueError(f"Missing seeds: {', '.join(sorted(missing))}")
+        
+        values = dict(seeds)
+        waiting = [self.stages[name] for name in self.order]
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        run_start = time.perf_counter()
+        
+        def _start_ready():
+            for stage in list(waiting):
+                if all(name in values for name in stage.inputs):
+                    waiting.remove(stage)
+                    task = asyncio.create_task(stage.fn(**{name: values[name] for name in stage.inputs}))
+                    running[task] = (stage.name, time.perf_counter())
+        
+        try:
+            _start_ready()
+            while running:
+                done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+                finished = []
+                errors = {}
+                for task in done:
+                    name, started = running.pop(task)
+                    # Every finished task's outcome is retrieved, even when another one failed
+                    error = task.exception()
+                    if error is not None:
+                        errors[name] = error
+                        continue
+                    result = task.result()
+                    if timings is not None:
+                        timings[name] = {
+                            "start": round(started - run_start, 3),
+                            "duration": round(time.perf_counter() - started, 3)
+                        }
+                    values[name] = result
+                    finished.append((name, result))
+                if errors:
+                    raise errors[min(errors, key=self.order.index)]
+                
+                # Start dependants before handing results to the caller
+                _start_ready()
+                for name, result in finished:
+                    yield name, result
+        finally:
+            for task in running:
+                task.cancel()
+            # Wait for the cancelled stages, so their errors are retrieved rather than logged as never retrieved
+            await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,78 @@
+"""
+Startup Profiler
+Measures import time of the API (python -X importtime) and the cost of each deferred initialization step
+Usage: python profile_startup.py [--top N] [--module main]
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+API_DIR = Path(__file__).parent
+
+
+def import_profile(module: str):
+    """Run `import <module>` in a fresh interpreter with -X importtime; returns [(cumulative_us, self_us, name)]."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "LOG_LEVEL": "ERROR"}
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return rows
+
+
+def timed(label: str, fn):
+    """Run fn() and print its wall time."""
+    start = time.perf_counter()
+    fn()
+    print(f"   {label:<28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile API import and initialization time")
+    parser.add_argument("--module", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to show")
+    args = parser.parse_args()
+    
+    rows = import_profile(args.module)
+    if not rows:
+        print(f"❌ Could not import {args.module}")
+        sys.exit(1)
+    
+    total_ms = next(cum for cum, _, name in rows if name.strip() == args.module) / 1000
+    print(f"📦 import {args.module}: {total_ms:.1f} ms")
+    print("\nSlowest imports, top two levels (cumulative):")
+    top_level = sorted(
+        (row for row in rows if not row[2].startswith("    ")),  # depth 0-1
+        reverse=True
+    )
+    for cumulative, _, name in top_level[:args.top]:
+        print(f"   {name.strip():<40} {cumulative / 1000:8.1f} ms")
+    
+    print("\nSlowest modules (self):")
+    for cumulative, self_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+        print(f"   {name.strip():<40} {self_us / 1000:8.1f} ms")
+    
+    # Deferred work, measured in this process after the same import
+    print("\nDeferred initialization:")
+    sys.path.insert(0, str(API_DIR))
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    import model_wrapper
+    import modules
+    timed("load_model()", model_wrapper.load_model)
+    timed("modules.preload()", modules.preload)
+
+
+if __name__ == "__main__":
+    main()
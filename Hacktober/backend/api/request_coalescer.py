@@ -0,0 +1,87 @@
+"""
+Request Coalescer
+Single-flight deduplication for concurrent identical detection requests
+Callers with the same input key await one shared pipeline execution
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from input_processor import canonical_url
+from verdict_cache import verdict_cache
+
+
+def coalesce_key(input_type: str, data, aggregator: str, model_version: str) -> str:
+    """
+    Key identifying requests that would produce the same result.
+    
+    Args:
+        input_type: "text" | "url" | "image" | "voice"
+        data: Raw input (text, URL string, image/audio bytes)
+        aggregator: Verdict aggregation backend of the request ("gemini" | "meta")
+        model_version: Serving ML model version (requests after a model swap never join older runs)
+    
+    Returns:
+        Key string: aggregator and model version plus normalized text hash, canonical URL or byte hash
+    """
+    scope = f"{aggregator}:{model_version}"
+    if input_type == "url":
+        return f"{scope}:url:{canonical_url(str(data))}"
+    if isinstance(data, (bytes, bytearray)):
+        return f"{scope}:{input_type}:{hashlib.sha256(data).hexdigest()}"
+    return f"{scope}:{input_type}:{verdict_cache.make_key(str(data))}"
+
+
+class RequestCoalescer:
+    """Runs at most one execution per key at a time; concurrent callers share its result"""
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.executions = 0
+        self.coalesced = 0
+    
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() for key, or join an execution already in flight for the same key.
+        
+        The shared execution runs as its own task, so one caller disconnecting
+        does not cancel it for the others. Exceptions propagate to every caller.
+        
+        Args:
+            key: Coalescing key (see coalesce_key)
+            fn: Zero-argument coroutine function doing the work
+        
+        Returns:
+            Tuple of (result, shared) - shared is True when this caller joined another's execution
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        
+        if shared:
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        
+        return await asyncio.shield(task), shared
+    
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished execution (and mark its exception retrieved if every caller left)."""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+    
+    def stats(self) -> Dict:
+        """Execution and coalescing counters."""
+        return {
+            "in_flight": len(self._inflight),
+            "executions": self.executions,
+            "coalesced": self.coalesced
+        }
+
+
+# Singleton instance
+request_coalescer = RequestCoalescer()
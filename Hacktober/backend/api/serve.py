@@ -0,0 +1,39 @@
+"""
+Production Entry Point
+Starts the API under gunicorn with the settings in gunicorn_conf.py (preloaded app, forked uvicorn workers)
+Falls back to a single uvicorn process where gunicorn is unavailable (e.g. Windows)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).parent
+
+
+def main():
+    """Run the production server."""
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        run = None
+    
+    if os.name == "nt" or run is None:
+        # No fork() on Windows - one process, no copy-on-write sharing
+        import uvicorn
+        print("⚠️ gunicorn not available, starting a single uvicorn worker")
+        os.chdir(API_DIR)
+        uvicorn.run(
+            "main:app",
+            host=os.getenv("HOST", "0.0.0.0"),
+            port=int(os.getenv("PORT", "8000")),
+            log_level=os.getenv("LOG_LEVEL", "info").lower()
+        )
+        return
+    
+    sys.argv = ["gunicorn", "--config", str(API_DIR / "gunicorn_conf.py"), "main:app"]
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Sparse Scorer
+Per-text fast path for the TF-IDF + Logistic Regression model: tokenize, count n-gram ids and accumulate
+sigmoid(tf-idf . coef + intercept) in plain Python - no input validation, CSR matrices or ndarray dispatch
+
+Every floating-point step is done in the order sklearn does it (counts -> sublinear tf -> idf -> row norm
+-> dot product in ascending feature order -> expit), so probabilities are bit-for-bit equal to
+vectorizer.transform + model.predict_proba. test_scorer_parity.py checks that.
+"""
+
+import re
+import math
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from compact_model import CompactVectorizer
+
+# 1 + log(count) for small counts, computed with numpy's log (what TfidfTransformer uses - libm may round differently)
+_LOG_TF_SIZE = 64
+_LOG_TF = [0.0] + (np.log(np.arange(1, _LOG_TF_SIZE, dtype=np.float64)) + 1.0).tolist()
+
+
+def _log_tf(count: int) -> float:
+    if count < _LOG_TF_SIZE:
+        return _LOG_TF[count]
+    return float(np.log(np.array([count], dtype=np.float64))[0] + 1.0)
+
+
+class SparseScorer:
+    """Binary linear model over TF-IDF features, scored one text at a time"""
+    
+    def __init__(
+        self,
+        analyzer: Callable[[str], List[str]],
+        lookup: Callable[[List[str]], Iterable[int]],
+        idf: Optional[Sequence[float]],
+        coef: Sequence[float],
+        intercept: float,
+        classes: Sequence[int],
+        sublinear_tf: bool = False,
+        binary: bool = False,
+        norm: Optional[str] = "l2",
+        order: Optional[Sequence[int]] = None,
+        index: Optional[Callable[[List[str]], Sequence[int]]] = None,
+        token_pattern: str = r"(?u)\b\w\w+\b",
+        lowercase: bool = True,
+        ngram_range: Tuple[int, int] = (1, 1)
+    ):
+        """
+        Args:
+            analyzer: Text -> n-grams (the vectorizer's own analyzer)
+            lookup: N-grams -> feature position of each in-vocabulary n-gram
+            idf: Idf weight per feature position (None when the vectorizer has use_idf=False)
+            coef: Model coefficient per feature position
+            intercept: Model intercept
+            classes: The model's two class labels
+            sublinear_tf / binary / norm: Vectorizer settings
+            order: Original sklearn feature index per position, when positions are not in that
+                order (compact artifact) - accumulation follows it to match sklearn's rounding
+            index: N-grams -> feature position of each n-gram, -1 when out of vocabulary
+                (aligned with the input; needed for attributions only)
+            token_pattern / lowercase / ngram_range: Vectorizer settings, for attribution spans
+        """
+        if norm not in ("l1", "l2", None):
+            raise ValueError(f"Unsupported norm: {norm}")
+        self.analyzer = analyzer
+        self.lookup = lookup
+        self.idf = list(idf) if idf is not None else None
+        self.coef = list(coef)
+        self.intercept = float(intercept)
+        self.classes = list(classes)
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.norm = norm
+        self.order = list(order) if order is not None else None
+        self.index = index
+        self.lowercase = lowercase
+        self.min_n, self.max_n = ngram_range
+        self._token_pattern = re.compile(token_pattern)
+        self._token_group = 1 if self._token_pattern.groups else 0  # findall returns the group when there is one
+    
+    @classmethod
+    def from_package(cls, model_package: Dict) -> "SparseScorer":
+        """
+        Build the scorer for a loaded model package (pickle or compact).
+        
+        Raises:
+            ValueError: model or vectorizer the fast path does not cover (multi-class, custom analyzer)
+        """
+        vectorizer = model_package['vectorizer']
+        model = model_package['model']
+        if len(model.classes_) != 2:
+            raise ValueError("Sparse scorer supports binary models only")
+        classes = [c.item() if hasattr(c, 'item') else c for c in model.classes_]
+        
+        if isinstance(vectorizer, CompactVectorizer):
+            return cls(
+                analyzer=vectorizer.analyze,
+                lookup=lambda grams: vectorizer.term_ids(grams).tolist(),
+                idf=vectorizer.idf.tolist() if vectorizer.use_idf else None,
+                coef=model.coef.tolist(),
+                intercept=model.intercept,
+                classes=classes,
+                sublinear_tf=vectorizer.sublinear_tf,
+                binary=vectorizer.binary,
+                norm=vectorizer.norm,
+                order=vectorizer.ids.tolist() if vectorizer.ids is not None else None,
+                index=lambda grams: vectorizer.positions(grams).tolist(),
+                token_pattern=vectorizer.token_pattern,
+                lowercase=vectorizer.lowercase,
+                ngram_range=(vectorizer.min_n, vectorizer.max_n)
+            )
+        
+        if vectorizer.analyzer != 'word' or not hasattr(vectorizer, 'vocabulary_') or not hasattr(model, 'coef_'):
+            # e.g. the HashingVectorizer of train_streaming.py - served through sklearn instead
+            raise ValueError("Sparse scorer supports word-level TF-IDF + linear models only")
+        vocabulary_get = vectorizer.vocabulary_.get
+        return cls(
+            analyzer=vectorizer.build_analyzer(),
+            lookup=lambda grams: [i for i in map(vocabulary_get, grams) if i is not None],
+            idf=vectorizer.idf_.tolist() if vectorizer.use_idf else None,
+            coef=model.coef_[0].tolist(),
+            intercept=float(model.intercept_[0]),
+            classes=classes,
+            sublinear_tf=vectorizer.sublinear_tf,
+            binary=vectorizer.binary,
+            norm=vectorizer.norm,
+            index=lambda grams: [vocabulary_get(gram, -1) for gram in grams],
+            token_pattern=vectorizer.token_pattern,
+            lowercase=vectorizer.lowercase,
+            ngram_range=vectorizer.ngram_range
+        )
+    
+    def weights(self, text: str) -> Tuple[List[int], List[float], Dict[int, int]]:
+        """
+        TF-IDF row of one text.
+        
+        Returns:
+            (feature positions in sklearn's column order, their tf-idf values, occurrences per position)
+        """
+        counts: Dict[int, int] = {}
+        for position in self.lookup(self.analyzer(text)):
+            counts[position] = counts.get(position, 0) + 1
+        if not counts:
+            return [], [], counts
+        
+        # CSR rows are sorted by feature index, and every sum below runs in that order
+        positions = sorted(counts, key=self.order.__getitem__) if self.order else sorted(counts)
+        
+        idf = self.idf
+        values = []
+        for position in positions:
+            if self.binary:
+                value = 1.0
+            elif self.sublinear_tf:
+                value = _log_tf(counts[position])
+            else:
+                value = float(counts[position])
+            if idf is not None:
+                value = value * idf[position]
+            values.append(value)
+        
+        if self.norm == "l2":
+            total = 0.0
+            for value in values:
+                total += value * value
+            if total != 0.0:
+                total = math.sqrt(total)
+                values = [value / total for value in values]
+        elif self.norm == "l1":
+            total = 0.0
+            for value in values:
+                total += math.fabs(value)
+            if total != 0.0:
+                values = [value / total for value in values]
+        return positions, values, counts
+    
+    def decision(self, text: str) -> float:
+        """Decision function value (log-odds of classes[1]) for one text."""
+        positions, values, _ = self.weights(text)
+        if not positions:
+            return 0.0 + self.intercept
+        
+        coef = self.coef
+        score = 0.0
+        for position, value in zip(positions, values):
+            score += value * coef[position]
+        return score + self.intercept
+    
+    def predict_proba(self, text: str) -> Tuple[float, float]:
+        """(probability of classes[0], probability of classes[1]) for one text."""
+        try:
+            positive = 1.0 / (1.0 + math.exp(-self.decision(text)))
+        except OverflowError:  # exp(-score) beyond float range: expit is exactly 0 there
+            positive = 0.0
+        return 1.0 - positive, positive
+    
+    def predict(self, text: str):
+        """Most probable class label (ties go to classes[0], like argmax)."""
+        negative, positive = self.predict_proba(text)
+        return self.classes[1] if positive > negative else self.classes[0]
+    
+    def tokens(self, text: str) -> List[Tuple[str, int, int]]:
+        """(token, start, end) for every token of the text, with character offsets into `text`."""
+        group = self._token_group
+        return [
+            (match.group(group).lower() if self.lowercase else match.group(group), match.start(group), match.end(group))
+            for match in self._token_pattern.finditer(text)
+        ]
+    
+    def spans(self, text: str) -> List[Tuple[str, int, int]]:
+        """(n-gram, start, end) for every n-gram of the text, with character offsets into `text`."""
+        tokens = self.tokens(text)
+        grams = []
+        for n in range(self.min_n, self.max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                grams.append((" ".join(token for token, _, _ in tokens[i:i + n]), tokens[i][1], tokens[i + n - 1][2]))
+        return grams
+    
+    def attributions(self, text: str) -> List[Tuple[int, int, float]]:
+        """
+        Contribution of each in-vocabulary n-gram occurrence to the decision value.
+        
+        Args:
+            text: Text to explain
+        
+        Returns:
+            [(start, end, contribution)] - tf-idf weight x coefficient, split evenly between
+            repeated occurrences; positive pushes towards classes[1], negative towards classes[0]
+        """
+        if self.index is None:
+            raise ValueError("Scorer was built without an n-gram index")
+        positions, values, counts = self.weights(text)
+        contribution = {
+            position: value * self.coef[position] / counts[position]
+            for position, value in zip(positions, values)
+        }
+        
+        spans = self.spans(text)
+        located = self.index([gram for gram, _, _ in spans])
+        return [
+            (start, end, contribution[position])
+            for (_, start, end), position in zip(spans, located)
+            if position in contribution
+        ]
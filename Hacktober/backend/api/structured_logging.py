@@ -0,0 +1,149 @@
+"""
+Structured Logging
+Non-blocking, request-scoped logging for the API
+Records go through a queue to a background writer thread, as JSON lines tagged with the request id
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import zlib
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from typing import Optional
+
+# Configuration
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()  # "json" | "text"
+LOG_STAGE_SAMPLE_RATE = float(os.getenv("LOG_STAGE_SAMPLE_RATE", "1.0"))  # share of requests whose stage lines are kept
+
+# Request id of the request (or job) being handled - set by the HTTP middleware / job workers
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+# Pass as extra= on per-stage progress lines so they are subject to sampling
+STAGE = {"stage": True}
+
+# Standard LogRecord attributes (anything else passed via extra= is emitted as a field)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id", "stage"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_pid: Optional[int] = None
+
+
+def new_request_id() -> str:
+    """Short random request id."""
+    return uuid.uuid4().hex[:16]
+
+
+class RequestContextFilter(logging.Filter):
+    """Tags records with the current request id and samples per-stage lines"""
+    
+    def __init__(self, sample_rate: float = LOG_STAGE_SAMPLE_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        
+        if getattr(record, "stage", False) and self.sample_rate < 1.0:
+            # Sample per request (not per line) so kept requests have complete traces
+            bucket = zlib.crc32(record.request_id.encode("utf-8")) % 10000
+            return bucket < self.sample_rate * 10000
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records with the message and traceback rendered but formatting left to the listener"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local development"""
+    
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        return time.strftime("%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}"
+
+
+def setup_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """
+    Route all logging through a queue to a background writer thread.
+    
+    Safe to call more than once: it is a no-op in the process that already
+    owns a listener, and restarts the writer thread in a forked worker
+    (threads do not survive fork).
+    
+    Args:
+        level: Root log level (DEBUG, INFO, WARNING, ...)
+        fmt: "json" for machine-parseable lines, "text" for local development
+    """
+    global _listener, _listener_pid
+    
+    if _listener is not None and _listener_pid == os.getpid():
+        return
+    
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(TextFormatter() if fmt == "text" else JsonFormatter())
+    
+    # The queue handler only enqueues; formatting and the write happen on the listener thread
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+    
+    # Chatty third-party loggers
+    for name in ("httpx", "httpcore", "urllib3", "tweepy", "praw", "prawcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+    
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener, _listener_pid
+    
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+    _listener_pid = None
@@ -0,0 +1,326 @@
+"""
+Stub Upstreams
+Local stand-ins for every external API the pipeline calls (Gemini, Fact Check, News API, Twitter, Tavily, Reddit, ElevenLabs)
+Each stub answers with canned payloads after a sampled latency, and injects errors and 429 rate limits at configurable rates
+Usage: python stub_upstreams.py [--profile profile.json]  (prints the env vars that point the API at the stubs)
+"""
+
+import json
+import math
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+# Default per-upstream behaviour: latency is lognormal (median + sigma, seconds), rates are per request
+DEFAULT_PROFILES = {
+    "gemini": {"median": 0.9, "sigma": 0.35, "error_rate": 0.01, "rate_limit_rate": 0.01},
+    "factcheck": {"median": 0.25, "sigma": 0.3, "error_rate": 0.01, "rate_limit_rate": 0.0},
+    "newsapi": {"median": 0.4, "sigma": 0.4, "error_rate": 0.01, "rate_limit_rate": 0.02},
+    "twitter": {"median": 0.5, "sigma": 0.5, "error_rate": 0.02, "rate_limit_rate": 0.2},
+    "tavily": {"median": 1.2, "sigma": 0.4, "error_rate": 0.01, "rate_limit_rate": 0.0},
+    "reddit": {"median": 0.35, "sigma": 0.4, "error_rate": 0.01, "rate_limit_rate": 0.02},
+    "elevenlabs": {"median": 0.8, "sigma": 0.3, "error_rate": 0.01, "rate_limit_rate": 0.0}
+}
+
+# Env var pointing each service at its stub (see the *_BASE_URL overrides in the service modules)
+BASE_URL_ENV = {
+    "gemini": "GEMINI_BASE_URL",
+    "factcheck": "FACTCHECK_BASE_URL",
+    "newsapi": "NEWSAPI_BASE_URL",
+    "twitter": "TWITTER_BASE_URL",
+    "tavily": "TAVILY_BASE_URL",
+    "reddit": "REDDIT_BASE_URL",
+    "elevenlabs": "ELEVENLABS_BASE_URL"
+}
+
+# Placeholder credentials - the services only call out when a key is configured
+STUB_CREDENTIALS = {
+    "GEMINI_API_KEY": "stub",
+    "GOOGLE_FACTCHECK_API_KEY": "stub",
+    "NEWS_API_KEY": "stub",
+    "TWITTER_BEARER_TOKEN": "stub",
+    "TAVILY_API_KEY": "stub",
+    "REDDIT_CLIENT_ID": "stub",
+    "REDDIT_CLIENT_SECRET": "stub",
+    "ELEVENLABS_API_KEY": "stub"
+}
+
+
+class StubUpstream:
+    """One local HTTP server imitating an external API"""
+    
+    def __init__(self, name: str, routes: List, median: float = 0.5, sigma: float = 0.3,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Initialize the stub
+        
+        Args:
+            name: Upstream name (key of DEFAULT_PROFILES)
+            routes: aiohttp (method, path, handler) tuples
+            median: Median response latency in seconds
+            sigma: Lognormal shape (0 = always the median)
+            error_rate: Share of requests answered with HTTP 500
+            rate_limit_rate: Share of requests answered with HTTP 429
+            seed: Random seed (for repeatable runs)
+        """
+        self.name = name
+        self.routes = routes
+        self.median = median
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.port: Optional[int] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+    
+    def latency(self) -> float:
+        """Sample one response latency (seconds)."""
+        return self.median * math.exp(self.sigma * self.random.gauss(0, 1))
+    
+    @web.middleware
+    async def _behaviour(self, request: web.Request, handler):
+        """Delay every response, then fail or rate-limit a share of them."""
+        self.requests += 1
+        await asyncio.sleep(self.latency())
+        
+        roll = self.random.random()
+        if roll < self.rate_limit_rate:
+            self.rate_limited += 1
+            return web.json_response({"error": "rate limited"}, status=429, headers={"Retry-After": "1"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.errors += 1
+            return web.json_response({"error": "stub upstream error"}, status=500)
+        return await handler(request)
+    
+    async def start(self, port: int = 0) -> None:
+        """Listen on 127.0.0.1 (port 0 picks a free port)."""
+        app = web.Application(middlewares=[self._behaviour], client_max_size=64 * 1024 * 1024)
+        for method, path, handler in self.routes:
+            app.router.add_route(method, path, handler)
+        
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+    
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    def stats(self) -> Dict:
+        return {"requests": self.requests, "errors": self.errors, "rate_limited": self.rate_limited}
+
+
+# Canned payloads
+
+async def _gemini_generate(request: web.Request) -> web.Response:
+    """generateContent (google-genai and google-generativeai REST) - reply shaped by the prompt."""
+    body = await request.json()
+    prompt = " ".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in (content.get("parts", []) if isinstance(content, dict) else [])
+    )
+    
+    if "final verdict" in prompt:
+        text = json.dumps({
+            "verdict": "Fake",
+            "confidence": {"fake": 78, "real": 22},
+            "description": "Stub verdict: sources disagree with the claim.",
+            "key_factors": ["Stub factor 1", "Stub factor 2"]
+        })
+    elif "JSON array of claim" in prompt:
+        text = json.dumps(["Stub claim one", "Stub claim two"])
+    elif "TOP 5" in prompt:
+        text = json.dumps({
+            "overall_explanation": "Stub fact-check assessment",
+            "top_5_sources": [{
+                "rank": 1, "url": "https://factcheck.example/1", "title": "Stub fact check",
+                "publisher": "Stub Publisher", "rating": "False", "relevance": "high",
+                "explanation": "Stub explanation"
+            }]
+        })
+    else:
+        text = "Stub summary of the claim.\nIt covers the main facts in a few lines."
+    
+    return web.json_response({
+        "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP", "index": 0}],
+        "usageMetadata": {"promptTokenCount": 100, "candidatesTokenCount": 50, "totalTokenCount": 150}
+    })
+
+
+async def _factcheck_search(request: web.Request) -> web.Response:
+    query = request.query.get("query", "")
+    return web.json_response({"claims": [{
+        "text": query,
+        "claimant": "Stub claimant",
+        "claimReview": [{
+            "url": f"https://factcheck.example/{abs(hash(query)) % 10000}",
+            "title": "Stub fact check",
+            "publisher": {"name": "Stub Publisher"},
+            "textualRating": "False",
+            "reviewDate": "2024-01-01T00:00:00Z"
+        }]
+    }]})
+
+
+async def _newsapi_everything(request: web.Request) -> web.Response:
+    return web.json_response({"status": "ok", "totalResults": 5, "articles": [
+        {
+            "source": {"name": f"Stub News {i}"},
+            "title": f"Officials confirmed stub story {i}",
+            "description": "According to authorities, the stub story was confirmed.",
+            "url": f"https://www.reuters.com/stub/{i}",
+            "publishedAt": "2024-01-01T00:00:00Z"
+        }
+        for i in range(5)
+    ]})
+
+
+async def _twitter_search(request: web.Request) -> web.Response:
+    return web.json_response({
+        "data": [
+            {
+                "id": str(1000 + i), "text": f"Stub tweet {i} about the claim", "author_id": "1",
+                "created_at": "2024-01-01T00:00:00.000Z",
+                "public_metrics": {"like_count": 10 * i, "retweet_count": i, "reply_count": 0, "quote_count": 0},
+                "edit_history_tweet_ids": [str(1000 + i)]
+            }
+            for i in range(5)
+        ],
+        "includes": {"users": [{"id": "1", "name": "Stub User", "username": "stubuser", "verified": False}]},
+        "meta": {"result_count": 5}
+    })
+
+
+async def _tavily_search(request: web.Request) -> web.Response:
+    return web.json_response({"results": [
+        {
+            "url": f"https://www.thehindu.com/news/stub-article-{i}.ece",
+            "title": f"Stub article {i}",
+            "content": "Stub article content long enough to pass the minimum length filter for results.",
+            "score": 0.9
+        }
+        for i in range(5)
+    ]})
+
+
+async def _reddit_token(request: web.Request) -> web.Response:
+    return web.json_response({"access_token": "stub", "token_type": "bearer", "expires_in": 3600, "scope": "*"})
+
+
+async def _reddit_search(request: web.Request) -> web.Response:
+    subreddit = request.match_info["subreddit"]
+    return web.json_response({"kind": "Listing", "data": {"after": None, "before": None, "children": [
+        {"kind": "t3", "data": {
+            "id": f"stub{i}", "name": f"t3_stub{i}", "title": f"Stub post {i} in r/{subreddit}",
+            "selftext": "", "url": f"https://example.com/stub/{i}",
+            "permalink": f"/r/{subreddit}/comments/stub{i}/", "subreddit": subreddit,
+            "score": 100 - i, "num_comments": 10, "upvote_ratio": 0.9, "author": "stubuser"
+        }}
+        for i in range(2)
+    ]}})
+
+
+async def _elevenlabs_stt(request: web.Request) -> web.Response:
+    await request.read()
+    return web.json_response({
+        "language_code": "en", "language_probability": 0.99,
+        "text": "Scientists discover a new planet in the solar system beyond Neptune.",
+        "words": []
+    })
+
+
+async def _elevenlabs_tts(request: web.Request) -> web.Response:
+    return web.Response(body=b"\xff\xfb\x90\x00" * 2048, content_type="audio/mpeg")
+
+
+STUB_ROUTES = {
+    "gemini": [("POST", "/{version}/models/{model}:generateContent", _gemini_generate)],
+    "factcheck": [("GET", "/v1alpha1/claims:search", _factcheck_search)],
+    "newsapi": [("GET", "/v2/everything", _newsapi_everything)],
+    "twitter": [("GET", "/2/tweets/search/recent", _twitter_search)],
+    "tavily": [("POST", "/search", _tavily_search)],
+    "reddit": [
+        ("POST", "/api/v1/access_token", _reddit_token),
+        ("GET", "/r/{subreddit}/search", _reddit_search)
+    ],
+    "elevenlabs": [
+        ("POST", "/v1/speech-to-text", _elevenlabs_stt),
+        ("POST", "/v1/text-to-speech/{voice_id}", _elevenlabs_tts)
+    ]
+}
+
+
+def load_profiles(path: Optional[str] = None) -> Dict[str, Dict]:
+    """DEFAULT_PROFILES, with per-upstream overrides from a JSON file ({"twitter": {"rate_limit_rate": 0.5}, ...})."""
+    profiles = {name: dict(profile) for name, profile in DEFAULT_PROFILES.items()}
+    if path:
+        with open(path) as f:
+            for name, overrides in json.load(f).items():
+                if name not in profiles:
+                    raise ValueError(f"Unknown upstream '{name}' (expected one of {', '.join(profiles)})")
+                profiles[name].update(overrides)
+    return profiles
+
+
+async def start_stubs(profiles: Optional[Dict[str, Dict]] = None, seed: Optional[int] = None) -> Dict[str, StubUpstream]:
+    """Start one stub server per upstream on a free local port."""
+    profiles = profiles or load_profiles()
+    stubs = {}
+    for name, routes in STUB_ROUTES.items():
+        stub = StubUpstream(name, routes, seed=seed, **profiles.get(name, {}))
+        await stub.start()
+        stubs[name] = stub
+    return stubs
+
+
+async def stop_stubs(stubs: Dict[str, StubUpstream]) -> None:
+    for stub in stubs.values():
+        await stub.stop()
+
+
+def stub_env(stubs: Dict[str, StubUpstream]) -> Dict[str, str]:
+    """Env vars that point every service at its stub (set before the services are imported)."""
+    env = dict(STUB_CREDENTIALS)
+    for name, stub in stubs.items():
+        env[BASE_URL_ENV[name]] = stub.base_url
+    return env
+
+
+async def _serve(args) -> None:
+    stubs = await start_stubs(load_profiles(args.profile), seed=args.seed)
+    print("🧪 Stub upstreams running - start the API with:")
+    for key, value in stub_env(stubs).items():
+        print(f"export {key}={value}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await stop_stubs(stubs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for every external API")
+    parser.add_argument("--profile", help="JSON file with per-upstream latency/error overrides")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for latencies and failures")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Early Verdict Tests
+Fact Check textual ratings (as published in ClaimReview) mapped to a side by rating_side - the same
+mapping feeds the early fact-check rule and the meta aggregator's factcheck_* features - and the
+model + News API rule
+Usage: python -m pytest test_early_verdict.py
+"""
+
+import pytest
+
+from early_verdict import rating_side, check_early_verdict
+from modules.newsapi_service import calculate_credibility
+
+# Textual ratings seen in ClaimReview markup -> expected side
+RATINGS = [
+    ("False", "Fake"),
+    ("FALSE", "Fake"),
+    ("Mostly false", "Fake"),
+    ("Mostly False", "Fake"),
+    ("Pants on Fire!", "Fake"),
+    ("Falso", "Fake"),
+    ("Falsely attributed", "Fake"),
+    ("Fake", "Fake"),
+    ("Four Pinocchios", "Fake"),
+    ("Incorrect", "Fake"),
+    ("Inaccurate", "Fake"),
+    ("Untrue", "Fake"),
+    ("Not true", "Fake"),
+    ("Not accurate", "Fake"),
+    ("Not correct", "Fake"),
+    ("Isn't correct", "Fake"),
+    ("Misleading", "Fake"),
+    ("Fabricated", "Fake"),
+    ("Hoax", "Fake"),
+    ("Scam", "Fake"),
+    ("True", "Real"),
+    ("Mostly true", "Real"),
+    ("Correct", "Real"),
+    ("Accurate", "Real"),
+    ("Largely accurate", "Real"),
+    ("Confirmed", "Real"),
+    ("Half true", None),
+    ("Half True", None),
+    ("Partly false", None),
+    ("Mixture", None),
+    ("Unproven", None),
+    ("Not proven", None),
+    ("Unverified", None),
+    ("Not confirmed", None),
+    ("Missing context", None),
+    ("Needs context", None),
+    ("Satire", None),
+    ("Truthful hyperbole", None),
+    ("", None),
+    (None, None),
+]
+
+
+@pytest.mark.parametrize("rating,side", RATINGS)
+def test_rating_side(rating, side):
+    assert rating_side(rating) == side
+
+
+CLAIM = "Government confirms new national holiday for science week"
+
+
+def _newsapi_result(articles):
+    """verify_news output for these articles."""
+    credibility = calculate_credibility(articles, CLAIM)
+    return {
+        "label": credibility["label"],
+        "confidence": credibility["confidence"],
+        "relevant_links": [{"title": article["title"], "url": article["url"]} for article in articles]
+    }
+
+
+def _article(title, url="https://example.com/story"):
+    return {"title": title, "description": "", "url": url, "source": "Example", "publishedAt": ""}
+
+
+def _model(prediction, confidence):
+    other = 100 - confidence
+    return {"prediction": prediction, "confidence": {"fake": confidence if prediction == "Fake" else other,
+                                                     "real": confidence if prediction == "Real" else other}}
+
+
+def test_off_topic_news_does_not_end_request_as_fake():
+    # Unrelated hits: every article votes 0 on relevance alone
+    newsapi = _newsapi_result([_article(title) for title in (
+        "Local team wins regional football final",
+        "Recipe: five easy summer salads",
+        "Stock markets close slightly higher",
+        "Weather: heavy rain expected this weekend",
+        "Celebrity couple announces engagement",
+    )])
+    assert newsapi["label"] == 0 and newsapi["confidence"] >= 0.8
+    assert check_early_verdict({"model": _model("Fake", 99), "newsapi": newsapi}) is None
+
+
+def test_confirming_news_ends_request_as_real():
+    newsapi = _newsapi_result([_article(f"Officials confirmed the holiday, statement {i}") for i in range(5)])
+    verdict = check_early_verdict({"model": _model("Real", 99), "newsapi": newsapi})
+    assert verdict is not None
+    assert verdict["verdict"] == "Real" and verdict["early_verdict"] == "model_newsapi"
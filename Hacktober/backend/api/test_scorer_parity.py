@@ -0,0 +1,184 @@
+"""
+Sparse Scorer Parity Check
+SparseScorer must give bit-for-bit the probabilities of sklearn (vectorizer.transform + model.predict_proba):
+the tests fit a small model on fixture texts and check it as a pickle package and through the compact format
+Usage: python -m pytest test_scorer_parity.py
+       python test_scorer_parity.py [--csv ../model/WELFake_Dataset_cleaned.csv] [--limit 2000]
+       (optional benchmark - checks the shipped news_simple_model.pkl / .bin on a corpus and times both paths)
+"""
+
+import sys
+import json
+import time
+import pickle
+import argparse
+from pathlib import Path
+
+from compact_model import load_compact_model
+from model_wrapper import MODEL_PATH, COMPACT_MODEL_PATH
+from sparse_scorer import SparseScorer
+
+MODEL_DIR = Path(__file__).parent.parent / "model"
+
+# Labelled fixture texts (1 = real, 0 = fake) for the test model
+TRAIN_TEXTS = [
+    ("Government announces new infrastructure budget after parliamentary vote", 1),
+    ("Central bank keeps interest rates unchanged, citing stable inflation", 1),
+    ("Scientists publish peer-reviewed study on ocean temperatures", 1),
+    ("City council approves funding for public library renovation", 1),
+    ("Health ministry reports steady decline in seasonal flu cases", 1),
+    ("Election commission confirms final turnout figures for the state", 1),
+    ("University researchers receive grant for renewable energy project", 1),
+    ("Court upholds ruling on regional water sharing agreement", 1),
+    ("SHOCKING: doctors HATE this one weird trick to cure everything", 0),
+    ("Secret microchips hidden in vaccines, insider reveals", 0),
+    ("BREAKING!!! Celebrity secretly replaced by body double", 0),
+    ("5G towers spread the virus, they don't want you to know", 0),
+    ("Miracle fruit melts belly fat overnight - share before it's deleted", 0),
+    ("The moon landing was faked in a studio, leaked documents prove", 0),
+    ("Government hiding aliens in underground base, whistleblower claims", 0),
+    ("You won't believe what this politician said - the media is silent!!!", 0),
+]
+
+# Inputs that exercise the edges of tokenizing, counting and normalizing
+EDGE_CASES = [
+    "",
+    "   ",
+    "!!! ??? ...",
+    "a",
+    "the the the the the the the the the the the the the the the the the the the the",
+    "breaking " * 100,
+    "BREAKING: Government CONFIRMS new policy",
+    "Ünïcödé néws – “quoted” claims… 2024’s biggest story",
+    "covid-19 vaccine 5g microchip conspiracy",
+    "http://example.com/article?id=42 says the moon landing was faked",
+    "Scientists say " + "very " * 70 + "important discovery",
+    "\n\t".join(["line one", "line two", "line three"]),
+]
+
+
+def load_corpus(csv_path: Path, limit: int):
+    """Edge cases + input.json texts + up to `limit` dataset rows (when the dataset is present)."""
+    texts = list(EDGE_CASES)
+    
+    input_path = MODEL_DIR / "input.json"
+    if input_path.exists():
+        texts.extend(item["text"] for item in json.loads(input_path.read_text(encoding="utf-8")))
+    
+    if csv_path.exists() and limit > 0:
+        import pandas as pd
+        df = pd.read_csv(csv_path, nrows=limit).dropna(subset=["text"])
+        titles = df["title"].fillna("") + " " if "title" in df.columns else ""
+        texts.extend((titles + df["text"].astype(str)).tolist())
+        # Short claims, the common API input
+        texts.extend(df["title"].dropna().astype(str).tolist() if "title" in df.columns else [])
+    return texts
+
+
+def check(label: str, scorer: SparseScorer, reference: dict, texts) -> int:
+    """Compare scorer probabilities against sklearn's; returns the number of mismatches."""
+    expected = reference["model"].predict_proba(reference["vectorizer"].transform(texts))
+    
+    mismatches = 0
+    max_diff = 0.0
+    for text, row in zip(texts, expected):
+        got = scorer.predict_proba(text)
+        if got[0] != row[0] or got[1] != row[1]:
+            mismatches += 1
+            max_diff = max(max_diff, abs(got[1] - row[1]))
+            if mismatches <= 5:
+                print(f"   ❌ {text[:60]!r}: {got[1]!r} != {row[1]!r}")
+    
+    status = "✅" if mismatches == 0 else "❌"
+    print(f"{status} {label}: {len(texts) - mismatches}/{len(texts)} bit-equal"
+          + (f" (max |diff| {max_diff:.3e})" if mismatches else ""))
+    return mismatches
+
+
+def _fixture_package() -> dict:
+    """Model package (as pickled by the training scripts) fitted on TRAIN_TEXTS."""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    
+    texts, labels = zip(*TRAIN_TEXTS)
+    vectorizer = TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True)
+    model = LogisticRegression(max_iter=1000).fit(vectorizer.fit_transform(texts), labels)
+    return {"vectorizer": vectorizer, "model": model}
+
+
+def _corpus() -> list:
+    """Training texts, unseen texts and edge cases (out-of-vocabulary terms, repeats, empty)."""
+    return [text for text, _ in TRAIN_TEXTS] + EDGE_CASES + [
+        "Parliament confirms budget vote, doctors hate it",
+        "secret secret secret government study",
+        "Completely unrelated words with no known terms",
+    ]
+
+
+def _assert_parity(scorer: SparseScorer, reference: dict, texts) -> None:
+    expected = reference["model"].predict_proba(reference["vectorizer"].transform(texts))
+    for text, row in zip(texts, expected):
+        assert scorer.predict_proba(text) == (row[0], row[1]), text
+
+
+def test_pickle_parity():
+    package = pickle.loads(pickle.dumps(_fixture_package()))
+    _assert_parity(SparseScorer.from_package(package), package, _corpus())
+
+
+def test_compact_round_trip_parity(tmp_path):
+    if str(MODEL_DIR) not in sys.path:
+        sys.path.insert(0, str(MODEL_DIR))
+    from compact_format import export_compact
+    
+    package = _fixture_package()
+    path = tmp_path / "model.bin"
+    export_compact(package["vectorizer"], package["model"], str(path))
+    compact = load_compact_model(path)
+    
+    texts = _corpus()
+    _assert_parity(SparseScorer.from_package(compact), package, texts)
+    _assert_parity(SparseScorer.from_package(compact), compact, texts)
+
+
+def benchmark(label: str, fn, texts, repeat: int = 3):
+    """Best-of-`repeat` mean time per text, one call per text."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    print(f"   {label:<32} {best / len(texts) * 1e6:9.1f} µs/text")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check SparseScorer against sklearn, bit for bit")
+    parser.add_argument("--csv", type=Path, default=MODEL_DIR / "WELFake_Dataset_cleaned.csv")
+    parser.add_argument("--limit", type=int, default=2000, help="Dataset rows to score (0 = edge cases + input.json only)")
+    args = parser.parse_args()
+    
+    with open(MODEL_PATH, "rb") as f:
+        reference = pickle.load(f)
+    texts = load_corpus(args.csv, args.limit)
+    print(f"Corpus: {len(texts)} texts\n")
+    
+    scorer = SparseScorer.from_package(reference)
+    failures = check("pickle", scorer, reference, texts)
+    
+    if COMPACT_MODEL_PATH.exists():
+        failures += check("compact", SparseScorer.from_package(load_compact_model(COMPACT_MODEL_PATH)), reference, texts)
+    else:
+        print(f"⚠️ {COMPACT_MODEL_PATH.name} not found - compact check skipped")
+    
+    claims = [text for text in texts if 0 < len(text) <= 300] or texts
+    print(f"\nPer-call latency ({len(claims)} short texts):")
+    benchmark("SparseScorer.predict_proba", scorer.predict_proba, claims)
+    benchmark("sklearn transform + predict_proba",
+              lambda text: reference["model"].predict_proba(reference["vectorizer"].transform([text])), claims)
+    
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Verdict Cache
+Content-addressed cache in front of the detection pipeline (summary + verification + verdict)
+Keyed on a hash of the normalized text, with LRU + TTL eviction and a memory bound
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from input_processor import normalize_text
+
+# Configuration
+VERDICT_CACHE_TTL = int(os.getenv("VERDICT_CACHE_TTL", "3600"))  # seconds
+VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "10000"))
+VERDICT_CACHE_MAX_BYTES = int(os.getenv("VERDICT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+class VerdictCache:
+    """LRU + TTL cache of pipeline results, bounded by entry count and approximate size"""
+    
+    def __init__(self, ttl: int = VERDICT_CACHE_TTL, max_entries: int = VERDICT_CACHE_MAX_ENTRIES,
+                 max_bytes: int = VERDICT_CACHE_MAX_BYTES):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Seconds an entry stays fresh (0 disables the cache)
+            max_entries: Maximum number of entries
+            max_bytes: Maximum total size of cached values (JSON-encoded length)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = ttl > 0 and max_entries > 0
+        
+        # key -> (stored_at, size, value); most recently used at the end
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def make_key(text: str) -> str:
+        """Content address for a piece of text (SHA-256 of its normalized form)."""
+        return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Tuple[Optional[Dict], str]:
+        """
+        Look up a cached pipeline result
+        
+        Returns:
+            Tuple of (value or None, status) where status is:
+                - "hit": fresh entry returned
+                - "miss": no entry
+                - "stale": entry had expired and was dropped (caller recomputes)
+        """
+        if not self.enabled:
+            return None, "miss"
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, "miss"
+            
+            stored_at, size, value = entry
+            if time.time() - stored_at > self.ttl:
+                self._remove(key)
+                self.stale += 1
+                return None, "stale"
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value, "hit"
+    
+    def set(self, key: str, value: Dict) -> None:
+        """Store a pipeline result, evicting least recently used entries to stay within bounds."""
+        if not self.enabled:
+            return
+        
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            self._entries[key] = (time.time(), size, value)
+            self._bytes += size
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+    
+    def _remove(self, key: str) -> None:
+        """Drop an entry (lock must be held)."""
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict:
+        """Cache counters and current size."""
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Singleton instance
+verdict_cache = VerdictCache()
@@ -1,29 +1,39 @@
 """
 Verification Pipeline
-Runs all verification services in parallel using asyncio.gather
+Runs all verification services in parallel as pipeline graph stages
+(model and keyword searches on the raw text, the rest on the Gemini summary)
 Includes ML model + 6 external APIs with timeout protection
 """
 
 import asyncio
 import time
-from typing import Dict
+import logging
+from typing import Dict, List, Optional
 from model_wrapper import predict as model_predict
-from modules import (
-    search_factcheck,
-    search_twitter,
-    search_reddit,
-    verify_news as newsapi_verify,
-    scrape_url_to_text
-)
+from metrics import VERIFIER_LATENCY, record_service_result
+from admission import upstream_limiters, OverloadedError
+import modules  # service submodules load on first use
+from structured_logging import STAGE
+from pipeline_graph import PipelineGraph, Stage
+from deadline import stage_timeout, has_budget, AGGREGATE_RESERVE, DEADLINE_ERROR
 
+logger = logging.getLogger(__name__)
 
-async def run_parallel_verification(text: str, gemini_summary: str) -> Dict:
+
+async def run_parallel_verification(
+    text: str,
+    gemini_summary: str,
+    model_result: Optional[Dict] = None,
+    limiter: Optional[asyncio.Semaphore] = None
+) -> Dict:
     """
     Run all verification services in parallel.
     
     Args:
         text: Original news text
         gemini_summary: Gemini-generated summary (3-5 lines)
+        model_result: Precomputed ML model prediction (e.g. from a batch), skips the model call
+        limiter: Optional semaphore bounding concurrent external API calls (shared across a batch)
         
     Returns:
         Dict with results from all services:
@@ -36,52 +46,111 @@ async def run_parallel_verification(text: str, gemini_summary: str) -> Dict:
             - execution_time: Total time taken
     """
     start_time = time.time()
-    print(f"\n🔄 Starting parallel verification...")
-    print(f"   Using text length: {len(text)} chars")
-    print(f"   Using summary length: {len(gemini_summary)} chars")
     
-    # Run all services in parallel with timeouts
-    # Use return_exceptions=True so one failure doesn't break others
-    results = await asyncio.gather(
-        # 1. ML Model (our trained model)
-        _run_model(gemini_summary),
-        
-        # 2. Google Fact Check API
-        _run_factcheck(gemini_summary),
-        
-        # 3. News API (70,000+ sources)
-        _run_newsapi(gemini_summary),
-        
-        # 4. Twitter/X API (with scrape fallback)
-        _run_twitter(gemini_summary),
-        
-        # 5. Reddit API
-        _run_reddit(gemini_summary),
-        
-        # 6. Web Scraping (additional sources)
-        _run_webscrape(gemini_summary),
+    results = {} if model_result is None else {"model": model_result}
+    graph = PipelineGraph(verification_stages(limiter, skip=results), seeds=("text", "summary"))
+    async for service, result in graph.run({"text": text, "summary": {"summary": gemini_summary}}):
+        results[service] = result
+    
+    return build_verification_results(results, time.time() - start_time)
+
+
+def verification_stages(limiter: Optional[asyncio.Semaphore] = None, skip=()) -> List[Stage]:
+    """
+    Pipeline stages for the verification services.
+    
+    Services in SUMMARY_SERVICES take the "summary" stage (a summarize_news result);
+    the rest only need the raw "text", so they can run while summarization is in flight.
+    
+    Args:
+        limiter: Optional semaphore bounding concurrent external API calls
+        skip: Services to leave out (e.g. a model result computed elsewhere)
         
-        return_exceptions=True
-    )
+    Returns:
+        One Stage per service, named after it; each returns the service's result dict (never raises)
+    """
+    stages = []
+    for service, runner in VERIFICATION_SERVICES.items():
+        if service in skip:
+            continue
+        source = "summary" if service in SUMMARY_SERVICES else "text"
+        stages.append(Stage(service, _service_stage(service, runner, source, limiter), (source,)))
+    return stages
+
+
+def _service_stage(service: str, runner, source: str, limiter: Optional[asyncio.Semaphore]):
+    """Stage function running one service on its input (exceptions become an error result)."""
+    async def _stage(**inputs) -> Dict:
+        value = inputs[source]
+        text = value.get("summary", "") if isinstance(value, dict) else value
+        try:
+            return await _run_limited(service, runner, text, None if service == "model" else limiter)
+        except Exception as e:
+            return _error_result(service, e)
+    return _stage
+
+
+async def _run_limited(service: str, runner, text: str, limiter: Optional[asyncio.Semaphore]) -> Dict:
+    """Run a service (after waiting for a slot on the shared limiter, if any), recording its latency."""
+    if limiter is None:
+        return await _run_timed(service, runner, text)
+    async with limiter:
+        return await _run_timed(service, runner, text)
+
+
+async def _run_timed(service: str, runner, text: str) -> Dict:
+    """
+    Run a service within its upstream concurrency limit, recording latency and timeout/error counts.
     
-    # Unpack results
-    model_result = results[0] if not isinstance(results[0], Exception) else _error_result("model", results[0])
-    factcheck_result = results[1] if not isinstance(results[1], Exception) else _error_result("factcheck", results[1])
-    newsapi_result = results[2] if not isinstance(results[2], Exception) else _error_result("newsapi", results[2])
-    twitter_result = results[3] if not isinstance(results[3], Exception) else _error_result("twitter", results[3])
-    reddit_result = results[4] if not isinstance(results[4], Exception) else _error_result("reddit", results[4])
-    webscrape_result = results[5] if not isinstance(results[5], Exception) else _error_result("webscrape", results[5])
+    A service whose limiter is full degrades to an error result instead of queueing. Its timeout
+    is cut to the request's remaining budget (less time kept for aggregation), and it is skipped
+    when too little is left. The local model only needs to finish before the deadline itself.
+    """
+    upstream = None if service in SELF_LIMITED_SERVICES else upstream_limiters.get(service)
+    if upstream is not None:
+        try:
+            await upstream.acquire()
+        except OverloadedError as e:
+            result = _error_result(service, e)
+            record_service_result(service, result)
+            return result
     
-    execution_time = time.time() - start_time
+    try:
+        # Sized after the slot wait, so queueing for the upstream counts against the budget
+        timeout = stage_timeout(VERIFIER_TIMEOUTS[service], 0 if service == "model" else AGGREGATE_RESERVE)
+        if not has_budget(timeout):
+            result = _error_result(service, Exception(DEADLINE_ERROR))
+        else:
+            with VERIFIER_LATENCY.time(service=service):
+                result = await runner(text, timeout=timeout)
+    finally:
+        if upstream is not None:
+            upstream.release()
+    record_service_result(service, result)
+    return result
+
+
+def build_verification_results(results: Dict[str, Dict], execution_time: float, missing: str = "missing") -> Dict:
+    """Combine per-service results into the pipeline result dict (services without a result report `missing`)."""
+    model_result = results.get("model", _error_result("model", Exception(missing)))
+    factcheck_result = results.get("factcheck", _error_result("factcheck", Exception(missing)))
+    newsapi_result = results.get("newsapi", _error_result("newsapi", Exception(missing)))
+    twitter_result = results.get("twitter", _error_result("twitter", Exception(missing)))
+    reddit_result = results.get("reddit", _error_result("reddit", Exception(missing)))
+    webscrape_result = results.get("webscrape", _error_result("webscrape", Exception(missing)))
     
     # Log results
-    print(f"\n✅ Parallel verification complete in {execution_time:.2f}s")
-    print(f"   Model: {_get_status(model_result)}")
-    print(f"   Fact Check: {_get_status(factcheck_result)}")
-    print(f"   News API: {_get_status(newsapi_result)}")
-    print(f"   Twitter: {_get_status(twitter_result)}")
-    print(f"   Reddit: {_get_status(reddit_result)}")
-    print(f"   Web Scrape: {_get_status(webscrape_result)}")
+    logger.info(
+        f"✅ Parallel verification complete in {execution_time:.2f}s",
+        extra={**STAGE, "services": {
+            "model": _get_status(model_result),
+            "factcheck": _get_status(factcheck_result),
+            "newsapi": _get_status(newsapi_result),
+            "twitter": _get_status(twitter_result),
+            "reddit": _get_status(reddit_result),
+            "webscrape": _get_status(webscrape_result)
+        }}
+    )
     
     return {
         "model": model_result,
@@ -103,74 +172,78 @@ async def run_parallel_verification(text: str, gemini_summary: str) -> Dict:
     }
 
 
-async def _run_model(text: str, timeout: int = 2) -> Dict:
+async def _run_model(text: str, timeout: float = 2) -> Dict:
     """Run ML model prediction with timeout."""
     try:
         result = await asyncio.wait_for(model_predict(text), timeout=timeout)
         return result
     except asyncio.TimeoutError:
-        print(f"⏱️ Model prediction timeout after {timeout}s")
+        logger.warning(f"⏱️ Model prediction timeout after {timeout}s")
         return {"error": "timeout", "count": 0}
     except Exception as e:
-        print(f"❌ Model prediction error: {e}")
+        logger.error(f"❌ Model prediction error: {e}")
         return {"error": str(e), "count": 0}
 
 
-async def _run_factcheck(text: str, timeout: int = 8) -> Dict:
+async def _run_factcheck(text: str, timeout: float = 8) -> Dict:
     """Run Google Fact Check with timeout."""
     try:
-        result = await asyncio.wait_for(search_factcheck(text, timeout=timeout), timeout=timeout)
+        result = await asyncio.wait_for(modules.search_factcheck(text, timeout=timeout), timeout=timeout)
         return result
     except asyncio.TimeoutError:
-        print(f"⏱️ Fact Check timeout after {timeout}s")
+        logger.warning(f"⏱️ Fact Check timeout after {timeout}s")
         return {"error": "timeout", "count": 0, "claims": []}
     except Exception as e:
-        print(f"❌ Fact Check error: {e}")
+        logger.error(f"❌ Fact Check error: {e}")
         return {"error": str(e), "count": 0, "claims": []}
 
 
-async def _run_newsapi(text: str, timeout: int = 8) -> Dict:
+async def _run_newsapi(text: str, timeout: float = 8) -> Dict:
     """Run News API with timeout."""
     try:
-        result = await asyncio.wait_for(newsapi_verify(text, timeout=timeout), timeout=timeout)
+        # The keyword search and its hedged headline search each hold a "newsapi" slot (see SELF_LIMITED_SERVICES)
+        slots = (upstream_limiters["newsapi"], upstream_limiters["newsapi"])
+        result = await asyncio.wait_for(modules.verify_news(text, timeout=timeout, slots=slots), timeout=timeout)
         return result
     except asyncio.TimeoutError:
-        print(f"⏱️ News API timeout after {timeout}s")
+        logger.warning(f"⏱️ News API timeout after {timeout}s")
         return {"error": "timeout", "count": 0, "label": -1, "confidence": 0.0, "relevant_links": []}
     except Exception as e:
-        print(f"❌ News API error: {e}")
+        logger.error(f"❌ News API error: {e}")
         return {"error": str(e), "count": 0, "label": -1, "confidence": 0.0, "relevant_links": []}
 
 
-async def _run_twitter(text: str, timeout: int = 8) -> Dict:
+async def _run_twitter(text: str, timeout: float = 8) -> Dict:
     """Run Twitter API with timeout."""
     try:
         # Twitter expects label parameter (0=fake, 1=real) - we pass -1 for unknown
-        result = await asyncio.wait_for(search_twitter(text, label=-1, limit=5), timeout=timeout)
+        # Twitter and its Tavily backup each hold their own upstream slot (see SELF_LIMITED_SERVICES)
+        slots = (upstream_limiters["twitter"], upstream_limiters["tavily"])
+        result = await asyncio.wait_for(modules.search_twitter(text, label=-1, limit=5, timeout=timeout, slots=slots), timeout=timeout)
         return result
     except asyncio.TimeoutError:
-        print(f"⏱️ Twitter timeout after {timeout}s")
+        logger.warning(f"⏱️ Twitter timeout after {timeout}s")
         return {"error": "timeout", "count": 0, "results": []}
     except Exception as e:
-        print(f"❌ Twitter error: {e}")
+        logger.error(f"❌ Twitter error: {e}")
         return {"error": str(e), "count": 0, "results": []}
 
 
-async def _run_reddit(text: str, timeout: int = 8) -> Dict:
+async def _run_reddit(text: str, timeout: float = 8) -> Dict:
     """Run Reddit API with timeout."""
     try:
         # Reddit expects label parameter (0=fake, 1=real) - we pass -1 for unknown
-        result = await asyncio.wait_for(search_reddit(text, label=-1, limit=5), timeout=timeout)
+        result = await asyncio.wait_for(modules.search_reddit(text, label=-1, limit=5, timeout=timeout), timeout=timeout)
         return result
     except asyncio.TimeoutError:
-        print(f"⏱️ Reddit timeout after {timeout}s")
+        logger.warning(f"⏱️ Reddit timeout after {timeout}s")
         return {"error": "timeout", "count": 0, "results": []}
     except Exception as e:
-        print(f"❌ Reddit error: {e}")
+        logger.error(f"❌ Reddit error: {e}")
         return {"error": str(e), "count": 0, "results": []}
 
 
-async def _run_webscrape(text: str, timeout: int = 8) -> Dict:
+async def _run_webscrape(text: str, timeout: float = 8) -> Dict:
     """Run web scraping for additional verification (placeholder)."""
     try:
         # For now, just return a basic result
@@ -181,10 +254,37 @@ async def _run_webscrape(text: str, timeout: int = 8) -> Dict:
             "note": "Web scraping not fully implemented"
         }
     except Exception as e:
-        print(f"❌ Web scrape error: {e}")
+        logger.error(f"❌ Web scrape error: {e}")
         return {"error": str(e), "count": 0, "sources": []}
 
 
+# Service name -> default timeout (s), cut to the request's remaining budget at call time
+VERIFIER_TIMEOUTS = {
+    "model": 2,
+    "factcheck": 8,
+    "newsapi": 8,
+    "twitter": 8,
+    "reddit": 8,
+    "webscrape": 8
+}
+
+# Services that search with the Gemini summary; the others only need the raw text
+SUMMARY_SERVICES = ("factcheck", "twitter")
+
+# Services taking their upstream slots per call (hedged: primary and backup need one each)
+SELF_LIMITED_SERVICES = ("newsapi", "twitter")
+
+# Service name -> runner, in the order results are reported
+VERIFICATION_SERVICES = {
+    "model": _run_model,              # 1. ML Model (our trained model)
+    "factcheck": _run_factcheck,      # 2. Google Fact Check API
+    "newsapi": _run_newsapi,          # 3. News API (70,000+ sources)
+    "twitter": _run_twitter,          # 4. Twitter/X API (with scrape fallback)
+    "reddit": _run_reddit,            # 5. Reddit API
+    "webscrape": _run_webscrape       # 6. Web Scraping (additional sources)
+}
+
+
 def _error_result(service: str, error: Exception) -> Dict:
     """Create error result dict."""
     return {
@@ -0,0 +1,135 @@
+"""
+Compact Model Export
+Writes the TF-IDF + Logistic Regression model as one flat, memory-mappable file (news_simple_model.bin)
+Read by backend/api/compact_model.py - processes map it read-only instead of unpickling a vectorizer each
+Usage: python compact_format.py [news_simple_model.pkl] [news_simple_model.bin]  (convert an existing pickle)
+
+Layout (little-endian):
+    magic        8 bytes   b"SACHAIM\\0"
+    version      uint32    FORMAT_VERSION
+    header_len   uint32    length of the JSON header
+    header       JSON      model metadata, vectorizer settings, intercept, classes and
+                           {"sections": {name: {"offset", "dtype", "shape"}}}
+    sections     64-byte aligned arrays:
+                   vocab  |S<width>  n-gram terms as UTF-8, sorted (binary searchable)
+                   idf    <f8 | <f2  idf weight per term (vocab order)
+                   coef   <f8 | <f2 | |i1
+                                     model coefficient per term (vocab order); int8 values are
+                                     multiplied by header["scales"]["coef"]
+                   ids    <i4        original sklearn feature index per term (vocab order) - lets the
+                                     scorer sum features in sklearn's order, for identical rounding
+"""
+
+import sys
+import json
+import time
+import struct
+import pickle
+import numpy as np
+
+MAGIC = b"SACHAIM\0"
+FORMAT_VERSION = 2  # 2: float16 / int8 weight sections (version 1 files are still read)
+ALIGNMENT = 64
+WEIGHT_DTYPES = {'float64': '<f8', 'float16': '<f2', 'int8': '|i1'}
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def quantize(values, dtype='float64'):
+    """(stored array, scale) of float weights - int8 is symmetric, scaled so the largest magnitude maps to 127."""
+    values = np.asarray(values, dtype=np.float64)
+    if dtype == 'int8':
+        peak = float(np.abs(values).max()) if len(values) else 0.0
+        scale = peak / 127 if peak else 1.0
+        return np.round(values / scale).astype(WEIGHT_DTYPES[dtype]), scale
+    return np.ascontiguousarray(values, dtype=WEIGHT_DTYPES[dtype]), 1.0
+
+
+def dequantize(stored, scale=1.0):
+    """Float64 weights of a stored section - the same arithmetic as backend/api/compact_model.py."""
+    return stored.astype(np.float64) * scale
+
+
+def export_compact(vectorizer, model, path, test_accuracy=None, model_type='LogisticRegression',
+                   idf_dtype='float64', coef_dtype='float64'):
+    """
+    Write a fitted TfidfVectorizer + binary LogisticRegression to `path` in the compact format.
+    idf_dtype (float64 | float16) and coef_dtype (float64 | float16 | int8) trade precision for size.
+    """
+    if len(model.classes_) != 2:
+        raise ValueError("Compact format supports binary models only")
+    if (vectorizer.analyzer != 'word' or vectorizer.preprocessor is not None
+            or vectorizer.tokenizer is not None or vectorizer.stop_words is not None):
+        raise ValueError("Compact format supports the default word analyzer only")
+    
+    # Terms sorted by their UTF-8 bytes (the order numpy compares |S arrays in), weights reordered to match
+    terms = sorted(vectorizer.vocabulary_, key=lambda term: term.encode('utf-8'))
+    ids = np.array([vectorizer.vocabulary_[term] for term in terms])
+    encoded = [term.encode('utf-8') for term in terms]
+    width = max(len(term) for term in encoded)
+    
+    if idf_dtype == 'int8':
+        raise ValueError("idf weights are stored as float64 or float16")
+    idf, _ = quantize(vectorizer.idf_[ids], idf_dtype)
+    coef, coef_scale = quantize(model.coef_[0][ids], coef_dtype)
+    arrays = {
+        'vocab': np.array(encoded, dtype=f'S{width}'),
+        'idf': idf,
+        'coef': coef,
+        'ids': ids.astype('<i4')
+    }
+    
+    header = {
+        'format_version': FORMAT_VERSION,
+        'created': time.time(),
+        'model_type': model_type,
+        'test_accuracy': test_accuracy,
+        'features': len(terms),
+        'vectorizer': {
+            'lowercase': vectorizer.lowercase,
+            'strip_accents': vectorizer.strip_accents,
+            'token_pattern': vectorizer.token_pattern,
+            'ngram_range': list(vectorizer.ngram_range),
+            'sublinear_tf': vectorizer.sublinear_tf,
+            'norm': vectorizer.norm,
+            'use_idf': vectorizer.use_idf,
+            'binary': vectorizer.binary
+        },
+        'intercept': float(model.intercept_[0]),
+        'classes': [int(c) for c in model.classes_],
+        'scales': {'coef': coef_scale},
+        'sections': {}
+    }
+    
+    # Section offsets depend on the header length, which depends on the offsets - settle it in two passes
+    for _ in range(2):
+        offset = _align(16 + len(json.dumps(header).encode('utf-8')))
+        for name, array in arrays.items():
+            header['sections'][name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+            offset = _align(offset + array.nbytes)
+    header_bytes = json.dumps(header).encode('utf-8')
+    
+    with open(path, 'wb') as f:
+        f.write(MAGIC + struct.pack('<II', FORMAT_VERSION, len(header_bytes)) + header_bytes)
+        for name, array in arrays.items():
+            f.write(b'\0' * (header['sections'][name]['offset'] - f.tell()))
+            f.write(array.tobytes())
+    
+    return header
+
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else 'news_simple_model.pkl'
+    target = sys.argv[2] if len(sys.argv) > 2 else source.rsplit('.', 1)[0] + '.bin'
+    
+    with open(source, 'rb') as f:
+        model_package = pickle.load(f)
+    
+    header = export_compact(
+        model_package['vectorizer'], model_package['model'], target,
+        test_accuracy=model_package.get('test_accuracy'),
+        model_type=model_package.get('model_type', 'LogisticRegression')
+    )
+    print(f"✅ Exported {header['features']:,} features to {target}")
@@ -0,0 +1,167 @@
+"""
+Model pruning + quantization - a smaller, faster news_simple_model
+Drops the TF-IDF features whose coefficient is below a threshold, rebuilds the vocabulary, stores idf as
+float16 and coefficients as int8 (with a scale factor), and reports the accuracy delta on the held-out split
+Usage: python prune_model.py [news_simple_model.pkl] [--data WELFake_Dataset_cleaned.csv] [--min-coef 0.05] [--output-dir pruned]
+"""
+
+import os
+import sys
+import copy
+import time
+import pickle
+import argparse
+import tempfile
+import numpy as np
+from sklearn.metrics import accuracy_score
+from compact_format import export_compact, quantize, dequantize
+from train_sweep import load_cleaned, inference_latency
+import warnings
+warnings.filterwarnings('ignore')
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'api')
+
+
+def prune(vectorizer, model, min_coef):
+    """
+    Copies of the vectorizer and model without the features whose |coef| is below `min_coef`.
+    Kept terms are renumbered in their original order, so feature sums keep sklearn's order.
+    
+    Returns:
+        (vectorizer, model, kept original feature indices)
+    """
+    keep = np.flatnonzero(np.abs(model.coef_[0]) >= min_coef)
+    if not len(keep):
+        raise ValueError(f"No feature has |coef| >= {min_coef}")
+    terms = {index: term for term, index in vectorizer.vocabulary_.items()}
+    
+    pruned_vectorizer = copy.deepcopy(vectorizer)
+    vars(pruned_vectorizer).pop('stop_words_', None)  # terms cut by min_df/max_df - only bloats the pickle
+    pruned_vectorizer.vocabulary_ = {terms[index]: new for new, index in enumerate(keep)}
+    pruned_vectorizer.idf_ = vectorizer.idf_[keep]
+    pruned_vectorizer._tfidf.n_features_in_ = len(keep)  # the inner transformer validates the input width
+    
+    pruned_model = copy.deepcopy(model)
+    pruned_model.coef_ = model.coef_[:, keep]
+    pruned_model.n_features_in_ = len(keep)
+    return pruned_vectorizer, pruned_model, keep
+
+
+def apply_quantization(vectorizer, model, idf_dtype, coef_dtype):
+    """Replace the float weights with what the compact file stores (dequantized), in place."""
+    vectorizer.idf_ = dequantize(*quantize(vectorizer.idf_, idf_dtype))
+    model.coef_ = dequantize(*quantize(model.coef_[0], coef_dtype))[None, :]
+
+
+def file_size(path):
+    return os.path.getsize(path) / 1024
+
+
+def compact_size(vectorizer, model, **dtypes):
+    """Size (KB) of the compact export, written to a temporary file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.bin')
+        export_compact(vectorizer, model, path, **dtypes)
+        return file_size(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune low-weight features and quantize the TF-IDF + LogisticRegression model")
+    parser.add_argument("model", nargs="?", default="news_simple_model.pkl")
+    parser.add_argument("--data", default="WELFake_Dataset_cleaned.csv", help="Training CSV - the held-out split of train_simple_fast.py is rebuilt from it")
+    parser.add_argument("--cache-dir", default=".feature_cache", help="Cleaned-split cache shared with train_sweep.py")
+    parser.add_argument("--min-coef", type=float, default=0.05, help="Drop features with |coef| below this")
+    parser.add_argument("--idf-dtype", choices=("float64", "float16"), default="float16")
+    parser.add_argument("--coef-dtype", choices=("float64", "float16", "int8"), default="int8")
+    parser.add_argument("--latency-samples", type=int, default=200, help="Test texts timed per model")
+    parser.add_argument("--output-dir", default="pruned", help="Writes news_simple_model.pkl + .bin here (publishable with model_registry.py)")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("MODEL PRUNING + QUANTIZATION")
+    print("="*70)
+    
+    with open(args.model, 'rb') as f:
+        model_package = pickle.load(f)
+    vectorizer, model = model_package['vectorizer'], model_package['model']
+    if not hasattr(vectorizer, 'vocabulary_') or not hasattr(model, 'coef_') or len(model.classes_) != 2:
+        sys.exit("❌ Only binary TF-IDF + linear models can be pruned (hashed features have no vocabulary)")
+    
+    os.makedirs(args.cache_dir, exist_ok=True)
+    _, splits = load_cleaned(args.data, args.cache_dir)
+    X_test, y_test = splits['test']
+    
+    pruned_vectorizer, pruned_model, keep = prune(vectorizer, model, args.min_coef)
+    quantized_vectorizer, quantized_model = copy.deepcopy(pruned_vectorizer), copy.deepcopy(pruned_model)
+    apply_quantization(quantized_vectorizer, quantized_model, args.idf_dtype, args.coef_dtype)
+    
+    dtypes = {'idf_dtype': args.idf_dtype, 'coef_dtype': args.coef_dtype}
+    quantized_name = f'pruned + {args.idf_dtype}/{args.coef_dtype}'
+    candidates = {
+        'original': (vectorizer, model),
+        'pruned': (pruned_vectorizer, pruned_model),
+        quantized_name: (quantized_vectorizer, quantized_model)
+    }
+    sizes = {
+        'original': compact_size(vectorizer, model),
+        'pruned': compact_size(pruned_vectorizer, pruned_model),
+        quantized_name: compact_size(pruned_vectorizer, pruned_model, **dtypes)
+    }
+    
+    print(f"\nFeatures: {len(vectorizer.vocabulary_):,} -> {len(keep):,} (|coef| >= {args.min_coef})")
+    print(f"Test split: {len(y_test):,} texts\n")
+    print(f"{'Model':<30}{'Test acc':>10}{'Delta':>9}{'Agree':>9}{'.bin KB':>10}{'µs/text':>10}")
+    
+    baseline_pred = model.predict(vectorizer.transform(X_test))
+    baseline_acc = accuracy_score(y_test, baseline_pred)
+    sample = list(X_test[:args.latency_samples])
+    results = {}
+    for name, (candidate_vectorizer, candidate_model) in candidates.items():
+        pred = candidate_model.predict(candidate_vectorizer.transform(X_test))
+        acc = accuracy_score(y_test, pred)
+        latency = inference_latency(candidate_vectorizer, candidate_model, sample)
+        results[name] = acc
+        print(f"{name:<30}{acc*100:>9.2f}%{(acc - baseline_acc)*100:>+8.2f}%{(pred == baseline_pred).mean()*100:>8.2f}%"
+              f"{sizes[name]:>10.0f}{latency:>10.1f}")
+    
+    # Save model
+    print(f"\n{'='*70}")
+    print("SAVING MODEL")
+    print(f"{'='*70}")
+    
+    test_acc = results[quantized_name]
+    model_type = f"{model_package.get('model_type', 'LogisticRegression')} (pruned, {args.idf_dtype} idf, {args.coef_dtype} coef)"
+    os.makedirs(args.output_dir, exist_ok=True)
+    pkl_path = os.path.join(args.output_dir, 'news_simple_model.pkl')
+    bin_path = os.path.join(args.output_dir, 'news_simple_model.bin')
+    
+    # The pickle holds the dequantized weights, so it scores exactly like the compact file
+    pruned_package = {
+        'vectorizer': quantized_vectorizer,
+        'model': quantized_model,
+        'test_accuracy': test_acc,
+        'model_type': model_type,
+        'features': len(keep),
+        'pruning': {'source': os.path.abspath(args.model), 'min_coef': args.min_coef,
+                    'features_before': len(vectorizer.vocabulary_), 'created': time.time(), **dtypes}
+    }
+    with open(pkl_path, 'wb') as f:
+        pickle.dump(pruned_package, f)
+    export_compact(pruned_vectorizer, pruned_model, bin_path, test_accuracy=test_acc, model_type=model_type, **dtypes)
+    
+    # The API reads the .bin - check it predicts exactly like the pickle
+    sys.path.insert(0, API_DIR)
+    from compact_model import load_compact_model
+    compact = load_compact_model(bin_path)
+    compact_pred = compact['model'].predict(compact['vectorizer'].transform(list(X_test)))
+    mismatches = int((compact_pred != quantized_model.predict(quantized_vectorizer.transform(X_test))).sum())
+    
+    print(f"✅ Saved {pkl_path} ({file_size(pkl_path):.0f} KB, original {file_size(args.model):.0f} KB)")
+    print(f"✅ Saved {bin_path} ({file_size(bin_path):.0f} KB)")
+    print(f"{'✅' if not mismatches else '⚠️'} Compact vs pickle prediction mismatches: {mismatches}")
+    print(f"✅ Test Accuracy: {test_acc*100:.2f}% ({(test_acc - baseline_acc)*100:+.2f}% vs original)")
+    print(f"\nServe it: python ../api/model_registry.py publish <version> {bin_path} {pkl_path} --promote")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Bulk scoring - backfill large archives (JSONL or CSV) with the fake news model
+Streams the input in fixed-size chunks, scores them in worker processes that share the loaded model (forked
+pickle, or the memory-mapped news_simple_model.bin) and appends results in input order, with resumable checkpoints
+Usage: python score_bulk.py messages.jsonl scores.jsonl [--chunk-size 10000] [--workers 8] [--resume]
+       python score_bulk.py messages.csv scores_parquet --format parquet --text-column body --id-column message_id
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import pickle
+import argparse
+import itertools
+import multiprocessing
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+MODEL_DIR = Path(__file__).parent
+API_DIR = MODEL_DIR.parent / "api"
+
+# Loaded once per process - inherited by forked workers (where fork is unavailable: loaded on their first chunk)
+model_package = None
+
+
+def clean_text(text):
+    text = str(text).lower()
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def load_model(model_path):
+    """Model package from a .pkl, or a .bin in the compact format (mapped read-only, pages shared by workers)."""
+    global model_package
+    if model_package is None:
+        if str(model_path).endswith('.bin'):
+            sys.path.insert(0, str(API_DIR))
+            from compact_model import load_compact_model
+            model_package = load_compact_model(model_path)
+        else:
+            with open(model_path, 'rb') as f:
+                model_package = pickle.load(f)
+    return model_package
+
+
+def read_chunks(path, chunk_size, text_column, id_column, skip_chunks=0):
+    """(start row, ids, texts) per chunk of `chunk_size` input rows, skipping the first `skip_chunks` chunks."""
+    if str(path).endswith('.csv'):
+        import pandas as pd
+        columns = [text_column] + ([id_column] if id_column else [])
+        reader = pd.read_csv(path, usecols=columns, chunksize=chunk_size, dtype={text_column: str})
+        for index, df in enumerate(reader):
+            if index < skip_chunks:
+                continue
+            start = index * chunk_size
+            ids = df[id_column].tolist() if id_column else list(range(start, start + len(df)))
+            yield start, ids, df[text_column].fillna('').tolist()
+        return
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = iter(f)
+        for _ in itertools.islice(lines, skip_chunks * chunk_size):
+            pass
+        start = skip_chunks * chunk_size
+        while True:
+            block = list(itertools.islice(lines, chunk_size))
+            if not block:
+                return
+            ids, texts = [], []
+            for offset, line in enumerate(block):
+                item = json.loads(line) if line.strip() else ''
+                if isinstance(item, dict):
+                    texts.append(item.get(text_column) or '')
+                    ids.append(item.get(id_column, start + offset) if id_column else start + offset)
+                else:
+                    texts.append(str(item))
+                    ids.append(start + offset)
+            yield start, ids, texts
+            start += len(block)
+
+
+def score_chunk(ids, texts, model_path, include_text):
+    """Worker: score one chunk in a single transform + predict_proba pass. Returns output records."""
+    package = load_model(model_path)
+    probabilities = package['model'].predict_proba(package['vectorizer'].transform([clean_text(text) for text in texts]))
+    records = []
+    for row_id, text, prob in zip(ids, texts, probabilities):
+        flag = int(prob[1] > prob[0])
+        record = {
+            "id": row_id,
+            "flag": flag,
+            "prediction": "Real News" if flag == 1 else "Fake News",
+            "confidence": {"fake": round(float(prob[0]) * 100, 2), "real": round(float(prob[1]) * 100, 2)}
+        }
+        if include_text:
+            record["text"] = text
+        records.append(record)
+    return records
+
+
+class JsonlWriter:
+    """Appends records to one JSONL file; its committed size is the resume point."""
+    
+    def __init__(self, path, resume_bytes=None):
+        self.path = path
+        mode = 'r+b' if resume_bytes is not None and os.path.exists(path) else 'wb'
+        self.f = open(path, mode)
+        if mode == 'r+b':
+            self.f.truncate(resume_bytes)  # drop a chunk written after the last checkpoint
+            self.f.seek(resume_bytes)
+    
+    def write(self, chunk_index, records):
+        self.f.write("".join(json.dumps(record, ensure_ascii=False, default=str) + "\n" for record in records).encode('utf-8'))
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        return self.f.tell()
+    
+    def close(self):
+        self.f.close()
+
+
+class ParquetWriter:
+    """One part file per chunk in an output directory (readable as one dataset by pandas/pyarrow)."""
+    
+    def __init__(self, path, resume_bytes=None):
+        import pyarrow  # noqa: F401 - fail before scoring when the optional dependency is missing
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+    
+    def write(self, chunk_index, records):
+        import pandas as pd
+        df = pd.DataFrame({
+            "id": [record["id"] for record in records],
+            "flag": [record["flag"] for record in records],
+            "prediction": [record["prediction"] for record in records],
+            "confidence_fake": [record["confidence"]["fake"] for record in records],
+            "confidence_real": [record["confidence"]["real"] for record in records]
+        })
+        if records and "text" in records[0]:
+            df["text"] = [record["text"] for record in records]
+        part = self.path / f"part-{chunk_index:06d}.parquet"
+        df.to_parquet(str(part) + ".tmp", index=False)
+        os.replace(str(part) + ".tmp", part)  # a part file exists only once it is complete
+        return 0
+    
+    def close(self):
+        pass
+
+
+def save_checkpoint(path, state):
+    """Atomically replace the checkpoint file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream JSONL/CSV input through the fake news model in parallel")
+    parser.add_argument("input", help=".jsonl (objects with a text field, or strings) or .csv")
+    parser.add_argument("output", help="JSONL file, or directory of part files with --format parquet")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--model", default=None, help="news_simple_model.bin when present, else news_simple_model.pkl")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows per chunk (one model call each)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--text-column", default="text", help="Text field (JSONL) or column (CSV)")
+    parser.add_argument("--id-column", default=None, help="Id field/column to copy to the output (default: row number)")
+    parser.add_argument("--include-text", action="store_true", help="Copy the input text to the output")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint of an interrupted run")
+    args = parser.parse_args()
+    
+    model_path = args.model or str(MODEL_DIR / "news_simple_model.bin")
+    if not os.path.exists(model_path):
+        model_path = str(MODEL_DIR / "news_simple_model.pkl")
+    checkpoint_path = f"{str(args.output).rstrip('/')}.checkpoint.json"
+    
+    print("="*70)
+    print("BULK SCORING - FAKE NEWS MODEL")
+    print("="*70)
+    
+    state = {"input": os.path.abspath(args.input), "chunk_size": args.chunk_size, "format": args.format,
+             "chunks_done": 0, "rows_done": 0, "output_bytes": 0}
+    if args.resume and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as f:
+            saved = json.load(f)
+        if (saved["input"], saved["chunk_size"], saved["format"]) != (state["input"], state["chunk_size"], state["format"]):
+            raise SystemExit("❌ Checkpoint was written for a different input, chunk size or format")
+        state = saved
+        print(f"↻ Resuming after {state['rows_done']:,} rows ({state['chunks_done']} chunks)")
+    elif os.path.exists(checkpoint_path):
+        raise SystemExit(f"❌ {checkpoint_path} exists - pass --resume to continue that run, or delete it")
+    
+    # Load before creating the pool: forked workers inherit the model instead of each unpickling it
+    start = time.perf_counter()
+    load_model(model_path)
+    print(f"\n✅ Model loaded from {model_path} ({time.perf_counter() - start:.1f}s)")
+    print(f"Input: {args.input} | chunks of {args.chunk_size:,} rows | {args.workers} workers | output: {args.output} ({args.format})")
+    
+    writer_class = ParquetWriter if args.format == "parquet" else JsonlWriter
+    writer = writer_class(args.output, resume_bytes=state["output_bytes"] if state["chunks_done"] else None)
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    
+    rows = 0
+    started = last_report = time.perf_counter()
+    chunk_index = state["chunks_done"]
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as executor:
+            pending = deque()
+            chunks = read_chunks(args.input, args.chunk_size, args.text_column, args.id_column, skip_chunks=state["chunks_done"])
+            
+            def _commit():
+                nonlocal rows, chunk_index, last_report
+                records = pending.popleft().result()
+                state["output_bytes"] = writer.write(chunk_index, records)
+                chunk_index += 1
+                rows += len(records)
+                state["chunks_done"] = chunk_index
+                state["rows_done"] += len(records)
+                save_checkpoint(checkpoint_path, state)
+                now = time.perf_counter()
+                if now - last_report >= 5:
+                    print(f"   {state['rows_done']:,} rows | {rows / (now - started):,.0f} rows/s")
+                    last_report = now
+            
+            # Results are written in input order, with at most 2 chunks per worker in flight
+            for _, ids, texts in chunks:
+                pending.append(executor.submit(score_chunk, ids, texts, model_path, args.include_text))
+                if len(pending) >= args.workers * 2:
+                    _commit()
+            while pending:
+                _commit()
+    finally:
+        writer.close()
+    
+    elapsed = time.perf_counter() - started
+    print("\n" + "="*70)
+    print("RESULTS")
+    print("="*70)
+    print(f"✅ Scored {rows:,} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    print(f"✅ Total {state['rows_done']:,} rows in {args.output}")
+    os.remove(checkpoint_path)
+
+
+if __name__ == "__main__":
+    main()
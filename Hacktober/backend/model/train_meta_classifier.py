@@ -0,0 +1,109 @@
+"""
+Train the meta aggregator - a small stacking model over verifier evidence
+Input: JSONL of pipeline features + Gemini verdicts, logged by the API when AGGREGATION_LOG_PATH is set
+Output: meta_classifier.pkl, served in-process by backend/api/meta_aggregator.py (X-Aggregator: meta)
+Usage: python train_meta_classifier.py [aggregation_log.jsonl ...] [--output meta_classifier.pkl]
+"""
+
+import json
+import pickle
+import argparse
+import numpy as np
+from collections import Counter
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.pipeline import make_pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import classification_report, accuracy_score
+
+MIN_SAMPLES = 50
+VERDICTS = ("Fake", "Real", "Uncertain")
+
+parser = argparse.ArgumentParser(description="Train the meta aggregator from logged Gemini verdicts")
+parser.add_argument("logs", nargs="*", default=["aggregation_log.jsonl"], help="Aggregation log files (JSONL)")
+parser.add_argument("--output", default="meta_classifier.pkl", help="Where to save the model package")
+args = parser.parse_args()
+
+print("="*70)
+print("META AGGREGATOR - STACKING MODEL OVER VERIFIER EVIDENCE")
+print("="*70)
+
+# Load logged pipeline runs
+rows = []
+for path in args.logs:
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if row.get('verdict') in VERDICTS and row.get('features'):
+                rows.append(row)
+    print(f"Loaded {path}")
+
+counts = Counter(row['verdict'] for row in rows)
+print(f"\nSamples: {len(rows)} | " + " | ".join(f"{verdict}: {counts[verdict]}" for verdict in VERDICTS))
+
+if len(rows) < MIN_SAMPLES or len(counts) < 2:
+    raise SystemExit(f"❌ Need at least {MIN_SAMPLES} logged verdicts covering 2+ classes - keep AGGREGATION_LOG_PATH on longer")
+
+# Feature matrix (names from the logged rows, so new features need no code change here)
+feature_names = sorted({name for row in rows for name in row['features']})
+X = np.array([[row['features'].get(name, 0.0) for name in feature_names] for row in rows], dtype=float)
+y = np.array([row['verdict'] for row in rows])
+
+# Stratify only when every class has enough samples for both splits
+stratify = y if min(counts.values()) >= 2 else None
+X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=stratify)
+print(f"\nSplits: Train={len(X_train)}, Test={len(X_test)}")
+print(f"Features ({len(feature_names)}): {', '.join(feature_names)}")
+
+# Train
+print("\nTraining StandardScaler + Logistic Regression...")
+model = make_pipeline(
+    StandardScaler(),
+    LogisticRegression(max_iter=1000, C=1.0, class_weight='balanced', random_state=42)
+)
+model.fit(X_train, y_train)
+
+# Evaluate against the Gemini verdicts
+train_acc = accuracy_score(y_train, model.predict(X_train))
+test_pred = model.predict(X_test)
+test_acc = accuracy_score(y_test, test_pred)
+
+print(f"\n{'='*70}")
+print("RESULTS (agreement with Gemini)")
+print(f"{'='*70}")
+print(f"Train Agreement: {train_acc*100:.2f}%")
+print(f"Test Agreement:  {test_acc*100:.2f}%")
+print("\nTest Set Classification Report:")
+print(classification_report(y_test, test_pred, digits=4, zero_division=0))
+
+# Largest weights per class (on standardized features)
+coefs = model[-1].coef_
+classes = model[-1].classes_
+if len(classes) == 2:
+    coefs = np.vstack([-coefs[0], coefs[0]])
+print("Top features per verdict:")
+for verdict, weights in zip(classes, coefs):
+    top = np.argsort(weights)[::-1][:3]
+    print(f"  {verdict}: " + ", ".join(f"{feature_names[i]} ({weights[i]:+.2f})" for i in top))
+
+# Save model
+print(f"\n{'='*70}")
+print("SAVING MODEL")
+print(f"{'='*70}")
+
+model_package = {
+    'model': model,
+    'feature_names': feature_names,
+    'test_accuracy': test_acc,
+    'model_type': 'StandardScaler + LogisticRegression (meta aggregator)',
+    'samples': len(rows)
+}
+
+with open(args.output, 'wb') as f:
+    pickle.dump(model_package, f)
+
+print(f"✅ Saved as {args.output}")
+print(f"✅ Test agreement with Gemini: {test_acc*100:.2f}%")
@@ -5,6 +5,7 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import pickle
+from compact_format import export_compact
 import re
 from collections import Counter
 import warnings
@@ -120,6 +121,10 @@ with open('news_simple_model.pkl', 'wb') as f:
     pickle.dump(model_package, f)
 
 print("✅ Saved as news_simple_model.pkl")
+
+# Compact memory-mapped copy - what the API loads (see compact_format.py)
+export_compact(vectorizer, model, 'news_simple_model.bin', test_accuracy=test_acc)
+print("✅ Exported news_simple_model.bin (compact, memory-mappable)")
 print(f"\n✅ Test Accuracy: {test_acc*100:.2f}%")
 print("✅ Training completed in ~2 minutes!")
 print(f"\n{'='*70}")
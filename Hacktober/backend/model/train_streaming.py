@@ -0,0 +1,246 @@
+"""
+Streaming (out-of-core) training - for corpora that do not fit in memory
+Reads the CSV in chunks, cleans + hashes them in a process pool (HashingVectorizer is stateless) and trains
+an SGD logistic-regression model with partial_fit, so memory stays bounded by the chunk size, not the dataset
+Usage: python train_streaming.py [data.csv] [--chunk-size 5000] [--epochs 2] [--compare] [--output news_streaming_model.pkl]
+"""
+
+import os
+import re
+import sys
+import time
+import zlib
+import pickle
+import argparse
+import multiprocessing
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+import warnings
+warnings.filterwarnings('ignore')
+
+CLASSES = np.array([0, 1])  # 0 = fake, 1 = real
+TEST_PERCENT = 15           # rows whose text hashes below this go to the test set (stable across passes)
+
+# Same n-grams as train_simple_fast.py; 2^20 hashed features instead of a 10k-term vocabulary
+vectorizer = HashingVectorizer(
+    n_features=2**20,
+    ngram_range=(1, 2),
+    alternate_sign=False,
+    norm='l2'
+)
+
+
+def clean_text(text):
+    text = str(text).lower()
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def is_test(text):
+    return zlib.crc32(text.encode('utf-8')) % 100 < TEST_PERCENT
+
+
+def read_chunks(path, chunk_size):
+    """(combined texts, labels) per CSV chunk - the same filtering as train_simple_fast.py."""
+    for df in pd.read_csv(path, chunksize=chunk_size):
+        df = df.dropna(subset=['label', 'text'])
+        if 'title' in df.columns:
+            combined = df['title'].fillna('') + ' ' + df['text'].fillna('')
+        else:
+            combined = df['text'].astype(str)
+        keep = combined.str.len() > 50
+        yield combined[keep].tolist(), df['label'][keep].astype(int).to_numpy()
+
+
+def prepare_chunk(texts, labels, seed):
+    """Worker: clean, split and hash one chunk. Returns (X_train, y_train, X_test, y_test)."""
+    cleaned = [clean_text(text) for text in texts]
+    test_mask = np.array([is_test(text) for text in cleaned], dtype=bool)
+    # Shuffle the training rows - SGD is sensitive to label runs in sorted files
+    train_rows = np.random.RandomState(seed).permutation(np.flatnonzero(~test_mask))
+    test_rows = np.flatnonzero(test_mask)
+    X = vectorizer.transform(cleaned)
+    return X[train_rows], labels[train_rows], X[test_rows], labels[test_rows]
+
+
+def stream_prepared(path, chunk_size, executor, window, seed=0):
+    """Prepared chunks in file order, with at most `window` chunks in flight (bounded memory)."""
+    pending = deque()
+    for i, (texts, labels) in enumerate(read_chunks(path, chunk_size)):
+        pending.append(executor.submit(prepare_chunk, texts, labels, seed + i))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def peak_rss_mb(children=False):
+    """
+    Peak resident memory in MB (None where the resource module is unavailable): of this process, or with
+    `children` of the largest terminated child process (ru_maxrss is a lifetime maximum either way).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform != 'darwin' else peak / (1024 * 1024)
+
+
+def train_streaming(args):
+    model = SGDClassifier(
+        loss='log_loss',
+        alpha=args.alpha,
+        penalty='l2',
+        random_state=42
+    )
+    
+    rows = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for epoch in range(args.epochs):
+            epoch_rows = 0
+            for X_train, y_train, _, _ in stream_prepared(args.data, args.chunk_size, executor, args.workers * 2, seed=epoch * 100003):
+                if len(y_train):
+                    model.partial_fit(X_train, y_train, classes=CLASSES)
+                    epoch_rows += len(y_train)
+            rows += epoch_rows
+            print(f"Epoch {epoch + 1}/{args.epochs}: {epoch_rows:,} training rows")
+        train_time = time.perf_counter() - start
+        
+        # Final pass: score the held-out rows (only counts are kept)
+        correct = total = 0
+        confusion = np.zeros((2, 2), dtype=np.int64)
+        for _, _, X_test, y_test in stream_prepared(args.data, args.chunk_size, executor, args.workers * 2):
+            if not len(y_test):
+                continue
+            pred = model.predict(X_test)
+            correct += int((pred == y_test).sum())
+            total += len(y_test)
+            np.add.at(confusion, (y_test, pred), 1)
+    
+    # The pool's workers have exited here, so RUSAGE_CHILDREN covers them (and only them - run first)
+    return model, {
+        'test_accuracy': correct / total if total else 0.0,
+        'test_rows': total,
+        'train_rows': rows,
+        'train_time': train_time,
+        'rows_per_sec': rows / train_time if train_time else 0.0,
+        'confusion': confusion,
+        'peak_rss_mb': peak_rss_mb(),
+        'worker_peak_rss_mb': peak_rss_mb(children=True)
+    }
+
+
+def train_in_memory(args):
+    """
+    The train_simple_fast.py path (TF-IDF + saga LogisticRegression), on the same train/test split.
+    Run it through compare_in_memory: its peak_rss_mb is only its own in a fresh process.
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    
+    texts, labels = [], []
+    for chunk_texts, chunk_labels in read_chunks(args.data, args.chunk_size):
+        texts.extend(clean_text(text) for text in chunk_texts)
+        labels.extend(chunk_labels.tolist())
+    test_mask = np.array([is_test(text) for text in texts], dtype=bool)
+    texts, labels = np.array(texts, dtype=object), np.array(labels)
+    
+    start = time.perf_counter()
+    tfidf = TfidfVectorizer(max_features=10000, min_df=5, max_df=0.7, ngram_range=(1, 2), sublinear_tf=True)
+    X_train = tfidf.fit_transform(texts[~test_mask])
+    model = LogisticRegression(max_iter=1000, C=1.0, class_weight='balanced', random_state=42, solver='saga', n_jobs=-1)
+    model.fit(X_train, labels[~test_mask])
+    train_time = time.perf_counter() - start
+    
+    test_acc = accuracy_score(labels[test_mask], model.predict(tfidf.transform(texts[test_mask])))
+    return {
+        'test_accuracy': test_acc,
+        'train_rows': int((~test_mask).sum()),
+        'train_time': train_time,
+        'rows_per_sec': (~test_mask).sum() / train_time if train_time else 0.0,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def compare_in_memory(args):
+    """train_in_memory in a spawned child process, so neither peak RSS includes the other run."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(train_in_memory, args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Out-of-core training: chunked CSV -> hashing features -> SGD")
+    parser.add_argument("data", nargs="?", default="WELFake_Dataset_cleaned.csv", help="CSV with text, label (and optional title) columns")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per chunk")
+    parser.add_argument("--epochs", type=int, default=2, help="Passes over the training rows")
+    parser.add_argument("--alpha", type=float, default=1e-6, help="SGD L2 regularization")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Cleaning/hashing processes")
+    parser.add_argument("--compare", action="store_true", help="Also run the in-memory TF-IDF + LogisticRegression path on the same split")
+    parser.add_argument("--output", default="news_streaming_model.pkl", help="Where to save the model package")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("STREAMING MODEL - OUT-OF-CORE TRAINING (HASHING + SGD)")
+    print("="*70)
+    print(f"\nData: {args.data} | chunks of {args.chunk_size:,} rows | {args.workers} workers | {args.epochs} epochs")
+    
+    model, stats = train_streaming(args)
+    
+    print(f"\n{'='*70}")
+    print("RESULTS")
+    print(f"{'='*70}")
+    print(f"Test Accuracy:  {stats['test_accuracy']*100:.2f}% ({stats['test_rows']:,} held-out rows)")
+    print(f"Throughput:     {stats['rows_per_sec']:,.0f} rows/s ({stats['train_rows']:,} rows in {stats['train_time']:.1f}s)")
+    if stats['peak_rss_mb']:
+        print(f"Peak RSS:       {stats['peak_rss_mb']:.0f} MB trainer process, "
+              f"{stats['worker_peak_rss_mb']:.0f} MB largest of {args.workers} workers")
+    cm = stats['confusion']
+    print("\nConfusion Matrix:")
+    print(cm)
+    if cm[0].sum() and cm[1].sum():
+        print(f"Fake Recall: {cm[0][0]/cm[0].sum()*100:.1f}%")
+        print(f"Real Recall: {cm[1][1]/cm[1].sum()*100:.1f}%")
+    
+    if args.compare:
+        print(f"\n{'='*70}")
+        print("COMPARISON - IN-MEMORY PATH (train_simple_fast.py settings, same split)")
+        print(f"{'='*70}")
+        baseline = compare_in_memory(args)
+        print(f"{'':<16}{'Streaming':>14}{'In-memory':>14}")
+        print(f"{'Test Accuracy':<16}{stats['test_accuracy']*100:>13.2f}%{baseline['test_accuracy']*100:>13.2f}%")
+        print(f"{'Rows/s':<16}{stats['rows_per_sec']:>14,.0f}{baseline['rows_per_sec']:>14,.0f}")
+        print(f"{'Train time (s)':<16}{stats['train_time']:>14.1f}{baseline['train_time']:>14.1f}")
+        if baseline['peak_rss_mb']:
+            print(f"{'Peak RSS (MB)':<16}{stats['peak_rss_mb']:>14.0f}{baseline['peak_rss_mb']:>14.0f}")
+            print(f"{'  per worker':<16}{stats['worker_peak_rss_mb']:>14.0f}{'-':>14}")
+    
+    # Save model
+    print(f"\n{'='*70}")
+    print("SAVING MODEL")
+    print(f"{'='*70}")
+    
+    model_package = {
+        'vectorizer': vectorizer,
+        'model': model,
+        'test_accuracy': stats['test_accuracy'],
+        'model_type': 'SGDClassifier (log loss) + HashingVectorizer (streaming)',
+        'features': vectorizer.n_features
+    }
+    
+    with open(args.output, 'wb') as f:
+        pickle.dump(model_package, f)
+    
+    print(f"✅ Saved as {args.output}")
+    print(f"✅ Test Accuracy: {stats['test_accuracy']*100:.2f}%")
+
+
+if __name__ == "__main__":
+    main()
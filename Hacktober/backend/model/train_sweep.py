@@ -0,0 +1,272 @@
+"""
+Hyperparameter sweep - TF-IDF + Logistic Regression, ranked by accuracy AND inference latency
+Cleaned text and fitted TF-IDF matrices are cached on disk (sparse .npz, keyed by vectorizer params), so
+re-runs only fit models; configurations sharing features run in one worker, warm-starting along C
+Usage: python train_sweep.py [data.csv] [--C 0.5,1,2] [--max-features 5000,10000] [--ngrams 1-1,1-2] [--search grid|random]
+"""
+
+import os
+import re
+import json
+import time
+import random
+import pickle
+import hashlib
+import argparse
+import itertools
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sklearn.model_selection import train_test_split
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+import warnings
+warnings.filterwarnings('ignore')
+
+# Fixed vectorizer settings (train_simple_fast.py); max_features and ngram_range are swept
+BASE_VECTORIZER = {'min_df': 5, 'max_df': 0.7, 'sublinear_tf': True}
+SPLITS = ('train', 'val', 'test')
+
+
+def clean_text(text):
+    text = str(text).lower()
+    text = re.sub(r'http\S+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def _key(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def load_cleaned(data_path, cache_dir):
+    """
+    Cleaned + split dataset, cached by the CSV's path, size and mtime.
+    
+    Returns:
+        (data_key, {"train" | "val" | "test": (texts, labels)})
+    """
+    stat = os.stat(data_path)
+    data_key = _key({'path': os.path.abspath(data_path), 'size': stat.st_size, 'mtime': stat.st_mtime})
+    cache_path = os.path.join(cache_dir, f"cleaned_{data_key}.pkl")
+    
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return data_key, pickle.load(f)
+    
+    # Same loading, filtering and split as train_simple_fast.py
+    df = pd.read_csv(data_path)
+    df = df.dropna(subset=['label', 'text'])
+    df['label'] = df['label'].astype(int)
+    if 'title' in df.columns:
+        df['combined_text'] = df['title'].fillna('') + ' ' + df['text'].fillna('')
+    else:
+        df['combined_text'] = df['text']
+    df = df[df['combined_text'].str.len() > 50]
+    
+    X = df['combined_text'].apply(clean_text).values
+    y = df['label'].values
+    X_train, X_temp, y_train, y_temp = train_test_split(X, y, test_size=0.3, random_state=42, stratify=y)
+    X_val, X_test, y_val, y_test = train_test_split(X_temp, y_temp, test_size=0.5, random_state=42, stratify=y_temp)
+    splits = {'train': (X_train, y_train), 'val': (X_val, y_val), 'test': (X_test, y_test)}
+    
+    with open(cache_path, 'wb') as f:
+        pickle.dump(splits, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return data_key, splits
+
+
+def feature_paths(cache_dir, feature_key):
+    paths = {split: os.path.join(cache_dir, f"features_{feature_key}_{split}.npz") for split in SPLITS}
+    paths['vectorizer'] = os.path.join(cache_dir, f"vectorizer_{feature_key}.pkl")
+    return paths
+
+
+def load_features(cache_dir, data_key, splits, vectorizer_params):
+    """TF-IDF matrices per split + the fitted vectorizer, from the .npz cache or fitted (and cached) now."""
+    feature_key = _key({'data': data_key, **vectorizer_params})
+    paths = feature_paths(cache_dir, feature_key)
+    
+    if all(os.path.exists(path) for path in paths.values()):
+        with open(paths['vectorizer'], 'rb') as f:
+            vectorizer = pickle.load(f)
+        return vectorizer, {split: sp.load_npz(paths[split]) for split in SPLITS}, True
+    
+    vectorizer = TfidfVectorizer(**vectorizer_params)
+    matrices = {'train': vectorizer.fit_transform(splits['train'][0])}
+    for split in ('val', 'test'):
+        matrices[split] = vectorizer.transform(splits[split][0])
+    
+    for split in SPLITS:
+        sp.save_npz(paths[split], matrices[split].tocsr())
+    with open(paths['vectorizer'], 'wb') as f:
+        pickle.dump(vectorizer, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return vectorizer, matrices, False
+
+
+def fit_group(cache_dir, data_key, vectorizer_params, C_values):
+    """
+    Worker: all C values of one vectorizer configuration, warm-starting each fit from the previous one.
+    
+    Returns:
+        List of result dicts (params, accuracies, fit time, fitted model)
+    """
+    with open(os.path.join(cache_dir, f"cleaned_{data_key}.pkl"), 'rb') as f:
+        splits = pickle.load(f)
+    start = time.perf_counter()
+    vectorizer, matrices, cached = load_features(cache_dir, data_key, splits, vectorizer_params)
+    feature_time = time.perf_counter() - start
+    
+    results = []
+    model = LogisticRegression(
+        max_iter=1000,
+        class_weight='balanced',
+        random_state=42,
+        solver='saga',
+        warm_start=True
+    )
+    # Strongest regularization first: each solution is a good starting point for the next, weaker one
+    for C in sorted(C_values):
+        model.set_params(C=C)
+        start = time.perf_counter()
+        model.fit(matrices['train'], splits['train'][1])
+        fit_time = time.perf_counter() - start
+        
+        results.append({
+            'C': C,
+            'max_features': vectorizer_params['max_features'],
+            'ngram_range': list(vectorizer_params['ngram_range']),
+            'features': matrices['train'].shape[1],
+            'val_accuracy': accuracy_score(splits['val'][1], model.predict(matrices['val'])),
+            'test_accuracy': accuracy_score(splits['test'][1], model.predict(matrices['test'])),
+            'fit_time': fit_time,
+            'feature_time': feature_time,
+            'features_cached': cached,
+            'model': pickle.dumps(model),
+            'vectorizer_params': vectorizer_params
+        })
+    return results
+
+
+def inference_latency(vectorizer, model, texts, repeat=3):
+    """Median per-text latency (µs) of vectorizer.transform + predict_proba, one text per call."""
+    timings = []
+    for _ in range(repeat):
+        for text in texts:
+            start = time.perf_counter()
+            model.predict_proba(vectorizer.transform([text]))
+            timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1e6)
+
+
+def parse_list(value, cast):
+    return [cast(item) for item in value.split(',') if item]
+
+
+def parse_ngram(value):
+    low, high = value.split('-')
+    return (int(low), int(high))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep TF-IDF + LogisticRegression settings with cached features")
+    parser.add_argument("data", nargs="?", default="WELFake_Dataset_cleaned.csv")
+    parser.add_argument("--C", default="0.25,0.5,1,2,4", help="Comma-separated C values")
+    parser.add_argument("--max-features", default="5000,10000,20000", help="Comma-separated max_features values")
+    parser.add_argument("--ngrams", default="1-1,1-2", help="Comma-separated ngram ranges (low-high)")
+    parser.add_argument("--search", choices=("grid", "random"), default="grid")
+    parser.add_argument("--n-iter", type=int, default=8, help="Configurations sampled by --search random")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--cache-dir", default=".feature_cache")
+    parser.add_argument("--latency-samples", type=int, default=200, help="Validation texts timed per candidate")
+    parser.add_argument("--output", default="sweep_leaderboard.json")
+    parser.add_argument("--save-best", metavar="PATH", help="Save the best candidate as a model package (e.g. news_simple_model.pkl)")
+    parser.add_argument("--max-latency-us", type=float, help="Only candidates at most this slow qualify for --save-best")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("HYPERPARAMETER SWEEP - TF-IDF + LOGISTIC REGRESSION")
+    print("="*70)
+    
+    os.makedirs(args.cache_dir, exist_ok=True)
+    start = time.perf_counter()
+    data_key, splits = load_cleaned(args.data, args.cache_dir)
+    print(f"\nDataset: {sum(len(splits[s][1]) for s in SPLITS)} samples ({time.perf_counter() - start:.1f}s, cache key {data_key})")
+    
+    grid = list(itertools.product(
+        parse_list(args.C, float),
+        parse_list(args.max_features, int),
+        [parse_ngram(value) for value in args.ngrams.split(',') if value]
+    ))
+    if args.search == "random" and args.n_iter < len(grid):
+        grid = random.Random(42).sample(grid, args.n_iter)
+    
+    # One task per vectorizer configuration: its features are built (or loaded) once, its C values warm-start
+    groups = {}
+    for C, max_features, ngram_range in grid:
+        params = {**BASE_VECTORIZER, 'max_features': max_features, 'ngram_range': ngram_range}
+        groups.setdefault((max_features, ngram_range), (params, []))[1].append(C)
+    print(f"Candidates: {len(grid)} in {len(groups)} feature configurations | {args.workers} workers\n")
+    
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(fit_group, args.cache_dir, data_key, params, C_values) for params, C_values in groups.values()]
+        for future in as_completed(futures):
+            for result in future.result():
+                source = "cached" if result['features_cached'] else f"built in {result['feature_time']:.1f}s"
+                print(f"  C={result['C']:<6g} features={result['max_features']:<6} ngrams={tuple(result['ngram_range'])} "
+                      f"val={result['val_accuracy']*100:.2f}% fit={result['fit_time']:.1f}s (features {source})")
+                results.append(result)
+    
+    # Latency measured serially in this process, so candidates do not compete for CPU
+    sample = list(splits['val'][0][:args.latency_samples])
+    vectorizers = {}
+    for result in results:
+        feature_key = _key({'data': data_key, **result['vectorizer_params']})
+        if feature_key not in vectorizers:
+            with open(feature_paths(args.cache_dir, feature_key)['vectorizer'], 'rb') as f:
+                vectorizers[feature_key] = pickle.load(f)
+        result['vectorizer'] = vectorizers[feature_key]
+        result['model'] = pickle.loads(result['model'])
+        result['latency_us'] = inference_latency(result['vectorizer'], result['model'], sample)
+        result['nonzero_coef'] = int(np.count_nonzero(result['model'].coef_))
+    
+    results.sort(key=lambda r: (-r['val_accuracy'], r['latency_us']))
+    
+    print(f"\n{'='*70}")
+    print("LEADERBOARD (by validation accuracy)")
+    print(f"{'='*70}")
+    print(f"{'#':>3} {'C':>6} {'Features':>9} {'Ngrams':>7} {'Val':>8} {'Test':>8} {'Fit s':>7} {'µs/text':>9}")
+    for rank, result in enumerate(results, 1):
+        print(f"{rank:>3} {result['C']:>6g} {result['features']:>9} {'%d-%d' % tuple(result['ngram_range']):>7} "
+              f"{result['val_accuracy']*100:>7.2f}% {result['test_accuracy']*100:>7.2f}% "
+              f"{result['fit_time']:>7.1f} {result['latency_us']:>9.0f}")
+    
+    fields = ('C', 'max_features', 'ngram_range', 'features', 'val_accuracy', 'test_accuracy',
+              'fit_time', 'latency_us', 'nonzero_coef')
+    with open(args.output, 'w') as f:
+        json.dump([{field: result[field] for field in fields} for result in results], f, indent=2)
+    print(f"\n✅ Leaderboard saved as {args.output}")
+    
+    if args.save_best:
+        eligible = [r for r in results if args.max_latency_us is None or r['latency_us'] <= args.max_latency_us]
+        if not eligible:
+            raise SystemExit(f"❌ No candidate within {args.max_latency_us:g} µs/text")
+        best = eligible[0]
+        model_package = {
+            'vectorizer': best['vectorizer'],
+            'model': best['model'],
+            'test_accuracy': best['test_accuracy'],
+            'model_type': 'LogisticRegression',
+            'features': best['features']
+        }
+        with open(args.save_best, 'wb') as f:
+            pickle.dump(model_package, f)
+        print(f"✅ Saved best (C={best['C']:g}, {best['features']} features, ngrams {tuple(best['ngram_range'])}, "
+              f"{best['latency_us']:.0f} µs/text) as {args.save_best}")
+        print(f"   Run `python compact_format.py {args.save_best}` to refresh the compact file for the API")
+
+
+if __name__ == "__main__":
+    main()